@@ -0,0 +1,247 @@
+"""Punto de venta desde la línea de comandos (sin Tk).
+
+Usa el mismo servicio que las vistas (src/services/punto_de_venta.py) con
+el almacenamiento de config.json, o con un directorio de datos aparte
+(--datos) para pruebas y reproducciones que no deben tocar src/data.
+
+Uso:
+  python3 -m src.cli buscar coca
+  python3 -m src.cli cobrar 7501055300075:2 7501000111206 --cajero caja1 --metodo Tarjeta
+  python3 -m src.cli devolver 20250301-0004                (todo lo pendiente)
+  python3 -m src.cli devolver 20250301-0004 7501055300075:1
+  python3 -m src.cli reporte --periodo semana
+  python3 -m src.cli reporte --desde 2025-03-01 --hasta 2025-03-31
+  python3 -m src.cli --datos /tmp/pruebas reproducir tickets.csv
+
+reproducir: CSV con encabezado ticket,codigo_barras,cantidad y, opcionales,
+cajero,metodo_pago,fecha (ISO). Los renglones con el mismo ticket forman
+una venta; cajero, método y fecha se toman del primer renglón. Cada ticket
+se cobra entero o se rechaza entero (sin stock, código inexistente...).
+
+Sale con 0 si todo se cobró/devolvió y 1 si hubo algún error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional
+
+from src.controllers.producto_controller import ProductoController
+from src.controllers.venta_controller import VentaController
+from src.models.venta import Venta
+from src.services.punto_de_venta import METODOS_PAGO, PERIODOS, PuntoDeVenta, Renglon, rango_periodo
+from src.storage import EscritorSegundoPlano, JsonBackend, crear_backend
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cargar_configuracion() -> dict:
+    try:
+        with open(os.path.join(RAIZ, 'config.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error al cargar configuración: {e}", file=sys.stderr)
+        return {}
+
+
+def _renglon(texto: str) -> Renglon:
+    """'CODIGO' o 'CODIGO:CANT'"""
+    codigo, _, cantidad = texto.partition(':')
+    try:
+        return codigo.strip(), int(cantidad) if cantidad else 1
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"cantidad inválida en {texto!r}")
+
+
+def _imprimir_ticket(venta: Venta):
+    titulo = f"Devolución de {venta.referencia}" if venta.es_devolucion else "Venta"
+    print(f"{titulo} {venta.folio}  {venta.fecha[:16]}  {venta.cajero}  {venta.metodo_pago}")
+    for item in venta.items:
+        print(f"  {item.cantidad:>5} x {item.nombre[:40]:<40} {item.precio_unitario:>10.2f} "
+              f"{item.subtotal:>11.2f}")
+    print(f"  {'subtotal':>58} {venta.subtotal:>11.2f}")
+    print(f"  {'IVA':>58} {venta.iva:>11.2f}")
+    print(f"  {'TOTAL':>58} {venta.total:>11.2f}")
+
+
+def _buscar(pdv: PuntoDeVenta, args) -> int:
+    resultados, son_sugerencias = pdv.buscar(' '.join(args.termino))
+    if not resultados:
+        print("Sin resultados")
+        return 1
+    if son_sugerencias:
+        print("¿Quisiste decir...?")
+    for producto in resultados[:args.limite]:
+        print(f"{producto.codigo_barras:<16} {producto.nombre[:40]:<40} "
+              f"{producto.precio:>10.2f} {producto.stock:>7}")
+    return 0
+
+
+def _cobrar(pdv: PuntoDeVenta, args) -> int:
+    venta, error = pdv.cobrar_renglones(args.renglones, args.cajero, args.metodo)
+    if error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    _imprimir_ticket(venta)
+    return 0
+
+
+def _devolver(pdv: PuntoDeVenta, args) -> int:
+    devolucion, error = pdv.devolver(args.folio, args.cajero, args.renglones or None)
+    if error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    _imprimir_ticket(devolucion)
+    return 0
+
+
+def _reporte(pdv: PuntoDeVenta, args) -> int:
+    if args.desde:
+        fecha_inicio, fecha_fin = args.desde, args.hasta or args.desde
+    else:
+        fecha_inicio, fecha_fin = rango_periodo(args.periodo)
+    reporte = pdv.reporte(fecha_inicio, fecha_fin)
+    print(f"Período: {reporte['periodo']}")
+    print(f"  tickets      {reporte['total_ventas']:>12}")
+    print(f"  devoluciones {reporte['total_devoluciones']:>12}")
+    print(f"  devuelto     {reporte['total_devuelto']:>12,.2f}")
+    print(f"  vendido      {reporte['total_dinero']:>12,.2f}")
+    print(f"  promedio     {reporte['promedio_venta']:>12,.2f}")
+    print(f"  artículos    {reporte['total_items']:>12}")
+    print(f"  art. devueltos {reporte['total_items_devueltos']:>10}")
+    for titulo, campo in (("por cajero", 'ventas_por_cajero'), ("por método", 'ventas_por_metodo')):
+        print(f"  {titulo}:")
+        for nombre, total in sorted(reporte[campo].items()):
+            print(f"    {nombre:<20} {total:>12,.2f}")
+    return 0
+
+
+def _leer_tickets(path: str, cajero: str, metodo: str) -> List[dict]:
+    """Tickets del CSV en orden de primera aparición"""
+    tickets: Dict[str, dict] = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for fila in csv.DictReader(f):
+            clave = fila['ticket']
+            ticket = tickets.get(clave)
+            if ticket is None:
+                ticket = tickets[clave] = {
+                    'ticket': clave,
+                    'cajero': fila.get('cajero') or cajero,
+                    'metodo_pago': fila.get('metodo_pago') or metodo,
+                    'fecha': fila.get('fecha') or None,
+                    'renglones': [],
+                    'error': None,
+                }
+            try:
+                ticket['renglones'].append((fila['codigo_barras'].strip(), int(fila['cantidad'])))
+            except (TypeError, ValueError):
+                ticket['error'] = f"cantidad inválida: {fila.get('cantidad')!r}"
+    return list(tickets.values())
+
+
+def _reproducir(pdv: PuntoDeVenta, args) -> int:
+    try:
+        tickets = _leer_tickets(args.csv, args.cajero, args.metodo)
+    except (OSError, KeyError) as e:
+        print(f"Error al leer {args.csv}: {e}", file=sys.stderr)
+        return 1
+
+    cobrados, rechazados, total = 0, [], 0.0
+    inicio = time.perf_counter()
+    for ticket in tickets:
+        error = ticket['error']
+        if error is None:
+            venta, error = pdv.cobrar_renglones(ticket['renglones'], ticket['cajero'],
+                                                ticket['metodo_pago'], ticket['fecha'])
+        if error:
+            rechazados.append((ticket['ticket'], error))
+            continue
+        cobrados += 1
+        total += venta.total
+        if args.detalle:
+            print(f"{ticket['ticket']:<12} {venta.folio}  {venta.total:>11.2f}")
+    ms = (time.perf_counter() - inicio) * 1000
+
+    for clave, error in rechazados:
+        print(f"rechazado {clave}: {error}")
+    print(f"{len(tickets)} tickets: {cobrados} cobrados, {len(rechazados)} rechazados, "
+          f"total {total:,.2f}")
+    por_segundo = len(tickets) / (ms / 1000) if ms else 0.0
+    print(f"{ms:.0f} ms ({por_segundo:,.0f} tickets/s)")
+    return 1 if rechazados else 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python3 -m src.cli",
+                                     description="Punto de venta sin interfaz gráfica")
+    parser.add_argument('--datos', metavar='DIR',
+                        help="directorio con productos.json/ventas (JSON) en lugar de config.json")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    buscar = sub.add_parser('buscar', help="buscar productos por código o nombre")
+    buscar.add_argument('termino', nargs='+')
+    buscar.add_argument('--limite', type=int, default=20)
+    buscar.set_defaults(funcion=_buscar)
+
+    def caja(p):
+        p.add_argument('--cajero', default='cli')
+        p.add_argument('--metodo', choices=METODOS_PAGO, default='Efectivo')
+
+    cobrar = sub.add_parser('cobrar', help="cobrar un ticket: CODIGO[:CANT] ...")
+    cobrar.add_argument('renglones', nargs='+', type=_renglon, metavar='CODIGO[:CANT]')
+    caja(cobrar)
+    cobrar.set_defaults(funcion=_cobrar)
+
+    devolver = sub.add_parser('devolver', help="devolver una venta (todo o CODIGO[:CANT] ...)")
+    devolver.add_argument('folio')
+    devolver.add_argument('renglones', nargs='*', type=_renglon, metavar='CODIGO[:CANT]')
+    devolver.add_argument('--cajero', default='cli')
+    devolver.set_defaults(funcion=_devolver)
+
+    reporte = sub.add_parser('reporte', help="totales de ventas de un período")
+    reporte.add_argument('--periodo', choices=PERIODOS, default='hoy')
+    reporte.add_argument('--desde', metavar='AAAA-MM-DD')
+    reporte.add_argument('--hasta', metavar='AAAA-MM-DD')
+    reporte.set_defaults(funcion=_reporte)
+
+    reproducir = sub.add_parser('reproducir', help="cobrar los tickets de un CSV")
+    reproducir.add_argument('csv')
+    reproducir.add_argument('--detalle', action='store_true', help="imprimir cada ticket cobrado")
+    caja(reproducir)
+    reproducir.set_defaults(funcion=_reproducir)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    config = _cargar_configuracion()
+    storage = config.get('storage', {})
+
+    # Los JSON se escriben juntos en segundo plano: un lote de tickets no
+    # reescribe el catálogo en cada venta
+    escritor = EscritorSegundoPlano(storage.get('intervalo_guardado_ms', 1000) / 1000)
+    if args.datos:
+        backend = JsonBackend(os.path.join(args.datos, 'productos.json'),
+                              os.path.join(args.datos, 'ventas.jsonl'),
+                              os.path.join(args.datos, 'usuarios.json'),
+                              escritor=escritor)
+    else:
+        backend = crear_backend(config, escritor)
+    try:
+        pdv = PuntoDeVenta(ProductoController(backend=backend),
+                           VentaController(backend=backend,
+                                           memoria_mb=storage.get('memoria_ventas_mb', 64)),
+                           config.get('tax_rate', 0.16))
+        return args.funcion(pdv, args)
+    finally:
+        escritor.cerrar()
+        backend.cerrar()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,23 @@
 """
 Paquete de controladores
+Se importan al pedirlos (PEP 562): el login sólo necesita AuthController y
+los demás se cargan en el hilo de arranque.
 """
-from .auth_controller import AuthController
-from .producto_controller import ProductoController
-from .venta_controller import VentaController
+import importlib
 
-__all__ = ['AuthController', 'ProductoController', 'VentaController']
+_MODULOS = {
+    'AuthController': '.auth_controller',
+    'ProductoController': '.producto_controller',
+    'VentaController': '.venta_controller',
+}
+
+__all__ = list(_MODULOS)
+
+
+def __getattr__(nombre):
+    modulo = _MODULOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor
+    return valor
@@ -2,38 +2,32 @@
 Controlador de Autenticación
 Maneja login, logout y gestión de usuarios
 """
-import json
-import os
-from typing import Optional, List
+from typing import Optional, List, Iterable
 from src.models.usuario import Usuario, RolUsuario
+from src.storage.base import StorageBackend
+from src.storage.json_backend import JsonBackend
 
 class AuthController:
-    def __init__(self, data_path: str = "src/data/usuarios.json"):
+    def __init__(self, data_path: str = "src/data/usuarios.json",
+                 backend: Optional[StorageBackend] = None):
         self.data_path = data_path
+        self.backend = backend or JsonBackend(usuarios_path=data_path)
         self.usuarios: List[Usuario] = []
         self.usuario_actual: Optional[Usuario] = None
         self.cargar_usuarios()
     
     def cargar_usuarios(self):
-        """Carga los usuarios desde el archivo JSON"""
-        if os.path.exists(self.data_path):
-            try:
-                with open(self.data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.usuarios = [Usuario.from_dict(u) for u in data]
-            except Exception as e:
-                print(f"Error al cargar usuarios: {e}")
-                self.usuarios = []
-        else:
+        """Carga los usuarios desde el backend de almacenamiento"""
+        try:
+            self.usuarios = self.backend.cargar_usuarios()
+        except Exception as e:
+            print(f"Error al cargar usuarios: {e}")
             self.usuarios = []
     
-    def guardar_usuarios(self):
-        """Guarda los usuarios en el archivo JSON"""
+    def guardar_usuarios(self, cambiados: Optional[Iterable[Usuario]] = None):
+        """Guarda los usuarios (sólo los cambiados si el backend lo permite)"""
         try:
-            os.makedirs(os.path.dirname(self.data_path), exist_ok=True)
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                data = [u.to_dict() for u in self.usuarios]
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.backend.guardar_usuarios(self.usuarios, cambiados)
         except Exception as e:
             print(f"Error al guardar usuarios: {e}")
     
@@ -49,7 +43,7 @@ class AuthController:
                 if usuario.verificar_password(password):
                     self.usuario_actual = usuario
                     usuario.actualizar_acceso()
-                    self.guardar_usuarios()
+                    self.guardar_usuarios([usuario])
                     return True
                 return False
 
@@ -73,7 +67,7 @@ class AuthController:
         
         nuevo_usuario = Usuario(username, password, rol, nombre_completo)
         self.usuarios.append(nuevo_usuario)
-        self.guardar_usuarios()
+        self.guardar_usuarios([nuevo_usuario])
         return True
     
     def actualizar_usuario(self, username: str, **kwargs) -> bool:
@@ -86,7 +80,7 @@ class AuthController:
                     usuario.activo = kwargs['activo']
                 if 'password' in kwargs:
                     usuario.password_hash = usuario._hash_password(kwargs['password'])
-                self.guardar_usuarios()
+                self.guardar_usuarios([usuario])
                 return True
         return False
     
@@ -95,7 +89,7 @@ class AuthController:
         for usuario in self.usuarios:
             if usuario.username == username:
                 usuario.activo = False
-                self.guardar_usuarios()
+                self.guardar_usuarios([usuario])
                 return True
         return False
     
@@ -2,101 +2,305 @@
 Controlador de Productos
 Maneja toda la lógica relacionada con productos
 """
-import json
-import os
-from typing import List, Optional
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
 from src.models.producto import Producto
+from src.models.venta import Venta, ItemVenta
+from src.services.indice_trigramas import IndiceTrigramas
+from src.storage.base import StorageBackend
+from src.storage.json_backend import JsonBackend
+
+# Tipos de cambio del registro, de menor a mayor alcance
+CAMBIO_STOCK = 'stock'
+CAMBIO_DATOS = 'datos'
+CAMBIO_ALTA = 'alta'
+CAMBIO_BAJA = 'baja'
+_ALCANCE = {CAMBIO_STOCK: 0, CAMBIO_DATOS: 1, CAMBIO_ALTA: 2, CAMBIO_BAJA: 2}
 
 class ProductoController:
-    def __init__(self, data_path: str = "src/data/productos.json"):
+    # Cambios recientes que se conservan para las vistas ocultas
+    MAX_CAMBIOS = 1000
+    
+    def __init__(self, data_path: str = "src/data/productos.json",
+                 backend: Optional[StorageBackend] = None):
         self.data_path = data_path
+        self.backend = backend or JsonBackend(productos_path=data_path)
         self.productos: List[Producto] = []
+        # Índice por código de barras (también traduce resultados del backend)
+        self._por_codigo: Dict[str, Producto] = {}
+        # Posición de cada código en self.productos: reemplazar y eliminar
+        # sin recorrer la lista
+        self._posicion: Dict[str, int] = {}
+        # Índices de trigramas para búsqueda por subcadena (sin acentos);
+        # se construyen en la primera búsqueda, no al arrancar
+        self._indice_nombres: Optional[IndiceTrigramas] = None
+        self._indice_codigos: Optional[IndiceTrigramas] = None
+        # Los índices pueden prepararse en el hilo de arranque: construirlos
+        # y tocar el catálogo junto con ellos va bajo este candado
+        self._lock_indices = threading.Lock()
+        # Versión del catálogo: sube con cada cambio. Las vistas guardan la
+        # que mostraron y piden sólo los cambios posteriores
+        self.version = 0
+        self._cambios: List[Tuple[int, str, str]] = []  # (versión, código, tipo)
+        self._version_base = 0  # antes de ésta ya no hay registro
         self.cargar_productos()
     
+    def _registrar_cambio(self, codigos: Iterable[str], tipo: str):
+        """Sube la versión y anota qué productos cambiaron"""
+        self.version += 1
+        self._cambios.extend((self.version, codigo, tipo) for codigo in codigos)
+        if len(self._cambios) > self.MAX_CAMBIOS:
+            recortar = len(self._cambios) - self.MAX_CAMBIOS // 2
+            self._version_base = self._cambios[recortar - 1][0]
+            del self._cambios[:recortar]
+    
+    def cambios_desde(self, version: int) -> Optional[Dict[str, str]]:
+        """Productos que cambiaron después de `version` (código -> tipo).
+
+        Si un código cambió varias veces se queda el tipo de mayor alcance.
+        Regresa None si ya no hay registro de esos cambios (recarga del
+        catálogo o demasiados cambios): hay que volver a leer todo.
+        """
+        if version >= self.version:
+            return {}
+        if version < self._version_base:
+            return None
+        cambios: Dict[str, str] = {}
+        for v, codigo, tipo in reversed(self._cambios):
+            if v <= version:
+                break
+            previo = cambios.get(codigo)
+            if previo is None or _ALCANCE[tipo] > _ALCANCE[previo]:
+                cambios[codigo] = tipo
+        return cambios
+    
     def cargar_productos(self):
-        """Carga los productos desde el archivo JSON"""
-        if os.path.exists(self.data_path):
-            try:
-                with open(self.data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.productos = [Producto.from_dict(p) for p in data]
-            except Exception as e:
-                print(f"Error al cargar productos: {e}")
-                self.productos = []
-        else:
-            self.productos = []
+        """Carga los productos desde el backend de almacenamiento"""
+        try:
+            productos = self.backend.cargar_productos()
+        except Exception as e:
+            print(f"Error al cargar productos: {e}")
+            productos = []
+        with self._lock_indices:
+            self.productos = productos
+            self._por_codigo = {p.codigo_barras: p for p in self.productos}
+            self._posicion = {p.codigo_barras: i for i, p in enumerate(self.productos)}
+            self._indice_nombres = None
+            self._indice_codigos = None
+        # Catálogo nuevo: los cambios anotados ya no sirven
+        self.version += 1
+        self._cambios = []
+        self._version_base = self.version
+    
+    def preparar_indices(self):
+        """Construye los índices de búsqueda si aún no existen (también
+        desde el hilo de arranque, para que la primera búsqueda no espere)"""
+        if self._indice_nombres is not None:
+            return
+        with self._lock_indices:
+            if self._indice_nombres is None:
+                self._indice_codigos = IndiceTrigramas(
+                    (p.codigo_barras, p.codigo_barras) for p in self.productos)
+                # Al final: los demás métodos revisan éste para usar ambos
+                self._indice_nombres = IndiceTrigramas(
+                    (p.codigo_barras, p.nombre) for p in self.productos)
     
-    def guardar_productos(self):
-        """Guarda los productos en el archivo JSON"""
+    def guardar_productos(self, cambiados: Optional[Iterable[Producto]] = None,
+                          eliminados: Iterable[str] = (), esperar: bool = False) -> bool:
+        """Guarda los productos.
+
+        cambiados/eliminados permiten al backend escribir sólo esas filas;
+        sin ellos se guarda el catálogo completo. esperar=True no regresa
+        hasta que el catálogo quede en disco (el backend puede diferir la
+        escritura): un error del escritor también regresa False.
+        """
         try:
-            os.makedirs(os.path.dirname(self.data_path), exist_ok=True)
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                data = [p.to_dict() for p in self.productos]
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self.backend.guardar_productos(self.productos, cambiados, eliminados, esperar)
+            return True
         except Exception as e:
             print(f"Error al guardar productos: {e}")
+            return False
+    
+    def _resolver(self, codigos: List[str]) -> List[Producto]:
+        """Convierte códigos regresados por el backend en productos en memoria"""
+        return [self._por_codigo[c] for c in codigos if c in self._por_codigo]
     
     def buscar_por_codigo(self, codigo_barras: str) -> Optional[Producto]:
         """Busca un producto por código de barras"""
-        for producto in self.productos:
-            if producto.codigo_barras == codigo_barras:
-                return producto
-        return None
+        return self._por_codigo.get(codigo_barras)
     
     def buscar_por_nombre(self, termino: str) -> List[Producto]:
-        """Busca productos por nombre (búsqueda parcial)"""
-        termino = termino.lower()
-        resultados = []
-        for producto in self.productos:
-            if termino in producto.nombre.lower():
-                resultados.append(producto)
-        return resultados
+        """Busca productos por nombre (búsqueda parcial, sin acentos)"""
+        self.preparar_indices()
+        return self._resolver(self._indice_nombres.buscar(termino))
+    
+    def buscar_por_texto(self, termino: str,
+                         dentro_de: Optional[List[Producto]] = None) -> List[Producto]:
+        """Busca productos cuyo nombre o código de barras contenga el término.
+
+        Primero las coincidencias por nombre y después las de sólo código.
+        dentro_de: resultado de un término que éste extiende (p. ej. "coc"
+        antes de "coca"); sólo se filtran esos productos en vez de consultar
+        todo el índice.
+        """
+        self.preparar_indices()
+        if dentro_de is None:
+            codigos = self._indice_nombres.buscar(termino)
+            vistos = set(codigos)
+            codigos += [c for c in self._indice_codigos.buscar(termino) if c not in vistos]
+        else:
+            candidatos = [p.codigo_barras for p in dentro_de]
+            codigos = self._indice_nombres.refinar(candidatos, termino)
+            vistos = set(codigos)
+            codigos += [c for c in self._indice_codigos.refinar(candidatos, termino)
+                        if c not in vistos]
+        return self._resolver(codigos)
+    
+    def buscar_similares(self, termino: str, limite: int = 10) -> List[Tuple[Producto, float]]:
+        """Búsqueda tolerante a errores de captura, ordenada por parecido.
+
+        Regresa hasta `limite` pares (producto, puntaje 0..1).
+        """
+        self.preparar_indices()
+        return [(self._por_codigo[c], puntaje)
+                for c, puntaje in self._indice_nombres.similares(termino, limite)]
     
     def buscar_por_categoria(self, categoria: str) -> List[Producto]:
         """Busca productos por categoría"""
+        if self.backend.indexado:
+            return self._resolver(self.backend.consultar_productos_por_categoria(categoria))
         return [p for p in self.productos if p.categoria == categoria]
     
     def agregar_producto(self, producto: Producto) -> bool:
         """Agrega un nuevo producto"""
-        if self.buscar_por_codigo(producto.codigo_barras):
-            return False  # Ya existe
-        self.productos.append(producto)
-        self.guardar_productos()
+        with self._lock_indices:
+            if producto.codigo_barras in self._por_codigo:
+                return False  # Ya existe
+            self._posicion[producto.codigo_barras] = len(self.productos)
+            self.productos.append(producto)
+            self._por_codigo[producto.codigo_barras] = producto
+            if self._indice_nombres is not None:
+                self._indice_nombres.agregar(producto.codigo_barras, producto.nombre)
+                self._indice_codigos.agregar(producto.codigo_barras, producto.codigo_barras)
+        self._registrar_cambio([producto.codigo_barras], CAMBIO_ALTA)
+        self.guardar_productos([producto])
         return True
     
     def actualizar_producto(self, producto: Producto) -> bool:
         """Actualiza un producto existente"""
-        for i, p in enumerate(self.productos):
-            if p.codigo_barras == producto.codigo_barras:
-                self.productos[i] = producto
-                self.guardar_productos()
-                return True
-        return False
+        with self._lock_indices:
+            actual = self._por_codigo.get(producto.codigo_barras)
+            if actual is None:
+                return False
+            if actual is not producto:
+                # Sólo se reemplaza en la lista si llega un objeto distinto
+                self.productos[self._posicion[producto.codigo_barras]] = producto
+                self._por_codigo[producto.codigo_barras] = producto
+            # El nombre pudo cambiar en el objeto: reindexar sólo sus trigramas
+            if self._indice_nombres is not None:
+                self._indice_nombres.actualizar(producto.codigo_barras, producto.nombre)
+        self._registrar_cambio([producto.codigo_barras], CAMBIO_DATOS)
+        self.guardar_productos([producto])
+        return True
     
     def eliminar_producto(self, codigo_barras: str) -> bool:
         """Elimina un producto"""
-        for i, p in enumerate(self.productos):
-            if p.codigo_barras == codigo_barras:
-                del self.productos[i]
-                self.guardar_productos()
-                return True
-        return False
+        with self._lock_indices:
+            producto = self._por_codigo.pop(codigo_barras, None)
+            if producto is None:
+                return False
+            # Se quita en su lugar para conservar el orden del catálogo (la
+            # tabla y productos.json lo muestran); sólo se renumera lo que sigue
+            posicion = self._posicion.pop(codigo_barras)
+            del self.productos[posicion]
+            for i in range(posicion, len(self.productos)):
+                self._posicion[self.productos[i].codigo_barras] = i
+            if self._indice_nombres is not None:
+                self._indice_nombres.eliminar(codigo_barras)
+                self._indice_codigos.eliminar(codigo_barras)
+        self._registrar_cambio([codigo_barras], CAMBIO_BAJA)
+        self.guardar_productos([], [codigo_barras])
+        return True
     
     def actualizar_stock(self, codigo_barras: str, cantidad: int) -> bool:
         """Actualiza el stock de un producto"""
         producto = self.buscar_por_codigo(codigo_barras)
         if producto:
             producto.actualizar_stock(cantidad)
-            self.guardar_productos()
+            self._registrar_cambio([codigo_barras], CAMBIO_STOCK)
+            self.guardar_productos([producto])
             return True
         return False
     
+    def validar_stock(self, items: List[ItemVenta]) -> Optional[str]:
+        """Valida el stock de todo el carrito.
+
+        Regresa un mensaje de error para el primer producto que no alcance,
+        o None si todos los items pueden surtirse.
+        """
+        # Un mismo código puede venir en varias líneas: se valida el total
+        requeridos = {}
+        for item in items:
+            requeridos[item.codigo_barras] = requeridos.get(item.codigo_barras, 0) + item.cantidad
+
+        for codigo, cantidad in requeridos.items():
+            producto = self.buscar_por_codigo(codigo)
+            if not producto:
+                return f"Producto no encontrado: {codigo}"
+            if producto.stock < cantidad:
+                return f"Stock insuficiente para {producto.nombre}"
+        return None
+
+    def confirmar_venta(self, venta: Venta, venta_controller) -> bool:
+        """Cobra una venta como una sola transacción.
+
+        Valida el stock de todos los items, descuenta el inventario en memoria,
+        guarda el catálogo una sola vez (esperando a que quede en disco) y
+        registra la venta. Si cualquiera de los pasos falla se revierte el
+        stock y se regresa False.
+        """
+        if self.validar_stock(venta.items):
+            return False
+
+        # Aplicar descuentos en memoria guardando el estado previo
+        respaldo = []
+        for item in venta.items:
+            producto = self.buscar_por_codigo(item.codigo_barras)
+            respaldo.append((producto, producto.stock, producto.fecha_actualizacion))
+            producto.actualizar_stock(-item.cantidad)
+
+        cambiados = [producto for producto, _, _ in respaldo]
+        # La venta sólo se registra con el stock descontado ya en disco
+        if not self.guardar_productos(cambiados, esperar=True):
+            self._revertir_stock(respaldo)
+            return False
+
+        if not venta_controller.registrar_venta(venta):
+            self._revertir_stock(respaldo)
+            self.guardar_productos(cambiados)
+            return False
+
+        self._registrar_cambio([p.codigo_barras for p in cambiados], CAMBIO_STOCK)
+        # Punto de confirmación: el stock descontado no espera el intervalo
+        self.backend.confirmar()
+        return True
+
+    def _revertir_stock(self, respaldo: list):
+        """Restaura el stock previo a una transacción fallida"""
+        for producto, stock, fecha in reversed(respaldo):
+            producto.stock = stock
+            producto.fecha_actualizacion = fecha
+
     def obtener_productos_bajo_stock(self, umbral: int = 10) -> List[Producto]:
         """Obtiene productos con stock bajo"""
+        if self.backend.indexado:
+            return self._resolver(self.backend.consultar_productos_bajo_stock(umbral))
         return [p for p in self.productos if p.stock <= umbral]
     
     def obtener_todas_categorias(self) -> List[str]:
         """Obtiene todas las categorías únicas"""
+        if self.backend.indexado:
+            return self.backend.consultar_categorias()
         categorias = set(p.categoria for p in self.productos)
         return sorted(list(categorias))
     
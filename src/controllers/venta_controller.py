@@ -1,147 +1,405 @@
 """
 Controlador de Ventas
 Maneja toda la lógica relacionada con ventas
+
+El historial está particionado por mes (ver StorageBackend.particiones_ventas).
+Al arrancar sólo se carga el mes actual; los meses anteriores se cargan
+cuando una consulta pide su rango y se quedan en una caché LRU con un
+presupuesto de memoria (el mes actual nunca se desaloja).
 """
-import json
-import os
-from datetime import datetime
-from typing import List, Optional
-from src.models.venta import Venta, ItemVenta
-from src.models.producto import Producto
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import heapq
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.models.venta import Venta
+from src.services.resumen_ventas import ResumenVentas, VendidosPorDia
+from src.storage.base import StorageBackend, particion_de
+from src.storage.json_backend import JsonBackend
+
+# Memoria estimada de una venta cargada y de cada renglón (medida con
+# src/tools/benchmark_particiones_ventas.py)
+BYTES_POR_VENTA = 300
+BYTES_POR_ITEM = 180
+
+# (ventas de una partición, inicio, fin)
+Tramo = Tuple[List[Venta], int, int]
+
+
+class RangoVentas(Sequence):
+    """Vista perezosa de tramos de las listas de ventas (una por mes), en
+    orden de fecha.
+
+    No copia las ventas: sólo guarda los límites de cada tramo. Es válida
+    hasta que se registre otra venta anterior al final del rango.
+    """
+    
+    def __init__(self, tramos: List[Tramo]):
+        self._tramos = [t for t in tramos if t[2] > t[1]]
+        # Posición de cada tramo dentro del rango
+        self._desde: List[int] = []
+        total = 0
+        for _, inicio, fin in self._tramos:
+            self._desde.append(total)
+            total += fin - inicio
+        self._total = total
+    
+    def __len__(self) -> int:
+        return self._total
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fuera del rango de ventas")
+        tramo = bisect_right(self._desde, indice) - 1
+        ventas, inicio, _ = self._tramos[tramo]
+        return ventas[inicio + indice - self._desde[tramo]]
+    
+    def __iter__(self) -> Iterator[Venta]:
+        for ventas, inicio, fin in self._tramos:
+            for i in range(inicio, fin):
+                yield ventas[i]
+    
+    def __reversed__(self) -> Iterator[Venta]:
+        for ventas, inicio, fin in reversed(self._tramos):
+            for i in range(fin - 1, inicio - 1, -1):
+                yield ventas[i]
+
+
+class ParticionVentas:
+    """Ventas de un mes en memoria, ordenadas por fecha"""
+    
+    def __init__(self, clave: str, ventas: List[Venta]):
+        self.clave = clave
+        # Datos importados pueden venir desordenados: ordenar una sola vez
+        self.fechas = [v.fecha for v in ventas]
+        if any(a > b for a, b in zip(self.fechas, self.fechas[1:])):
+            ventas.sort(key=lambda v: v.fecha)
+            self.fechas.sort()
+        self.ventas = ventas
+        self.por_folio: Dict[str, Venta] = {v.folio: v for v in ventas}
+        self.memoria = sum(BYTES_POR_VENTA + BYTES_POR_ITEM * v.num_items for v in ventas)
+    
+    def insertar(self, venta: Venta):
+        """Inserta conservando el orden por fecha (casi siempre es un append)"""
+        if not self.fechas or venta.fecha >= self.fechas[-1]:
+            self.ventas.append(venta)
+            self.fechas.append(venta.fecha)
+        else:
+            posicion = bisect_right(self.fechas, venta.fecha)
+            self.ventas.insert(posicion, venta)
+            self.fechas.insert(posicion, venta.fecha)
+        self.por_folio[venta.folio] = venta
+        self.memoria += BYTES_POR_VENTA + BYTES_POR_ITEM * venta.num_items
+    
+    def tramo(self, fecha_inicio: str, fecha_fin: str) -> Tramo:
+        """Límites de las ventas en [fecha_inicio, fecha_fin] (AAAA-MM-DD)"""
+        # fecha es ISO (AAAA-MM-DDTHH:MM:SS): '~' ordena después de cualquier hora del día
+        inicio = bisect_left(self.fechas, fecha_inicio)
+        fin = bisect_left(self.fechas, fecha_fin + "~")
+        return self.ventas, inicio, max(inicio, fin)
+
 
 class VentaController:
-    def __init__(self, data_path: str = "src/data/ventas.json"):
+    def __init__(self, data_path: str = "src/data/ventas.jsonl",
+                 backend: Optional[StorageBackend] = None,
+                 memoria_mb: float = 64):
+        """memoria_mb: presupuesto para los meses anteriores cargados"""
         self.data_path = data_path
-        self.ventas: List[Venta] = []
+        self.backend = backend or JsonBackend(ventas_path=data_path)
+        self.presupuesto_memoria = memoria_mb * 2**20
+        # Meses cargados, del menos al más recientemente usado
+        self._particiones: "OrderedDict[str, ParticionVentas]" = OrderedDict()
+        self.desalojadas = 0
+        # Último consecutivo de folio por día (AAAAMMDD -> número)
+        self._consecutivos: Dict[str, int] = {}
+        # Acumulados por producto de todo el historial y por día (persistidos;
+        # los días se leen por mes, cuando un reporte o una venta los pide)
+        self.vendidos = VendidosPorDia()
+        # Acumulados por día × cajero × método de pago (persistidos)
+        self.resumen = ResumenVentas()
+        # Sube con cada venta registrada o recarga (las vistas la comparan)
+        self.version = 0
         self.cargar_ventas()
     
     def cargar_ventas(self):
-        """Carga las ventas desde el archivo JSON"""
-        if os.path.exists(self.data_path):
+        """Lee el manifiesto y carga sólo el mes actual"""
+        self._particiones = OrderedDict()
+        self._consecutivos = {}
+        try:
+            self._particion(self._clave_actual())
+        except Exception as e:
+            print(f"Error al cargar ventas: {e}")
+            self._particiones = OrderedDict()
+        self._cargar_resumen()
+        self._cargar_vendidos()
+        self.version += 1
+    
+    @staticmethod
+    def _clave_actual() -> str:
+        return datetime.now().strftime("%Y-%m")
+    
+    def _manifiesto(self) -> Dict[str, dict]:
+        return self.backend.particiones_ventas()
+    
+    def total_ventas(self) -> int:
+        """Ventas en todo el historial (sin cargarlo)"""
+        return sum(e['ventas'] for e in self._manifiesto().values())
+    
+    def _particion(self, clave: str) -> ParticionVentas:
+        """Mes cargado (lo lee del backend si hace falta)"""
+        particion = self._particiones.get(clave)
+        if particion is not None:
+            self._particiones.move_to_end(clave)
+            return particion
+        ventas = []
+        if clave in self._manifiesto():
+            ventas = list(self.backend.cargar_ventas_particion(clave))
+        particion = ParticionVentas(clave, ventas)
+        for venta in particion.ventas:
+            self._indexar_folio(venta)
+        self._particiones[clave] = particion
+        self._desalojar(clave)
+        return particion
+    
+    def _desalojar(self, protegida: str):
+        """Descarta los meses menos usados mientras se pase del presupuesto
+        (nunca el mes actual ni el que se acaba de pedir)"""
+        fijas = {protegida, self._clave_actual()}
+        while sum(p.memoria for p in self._particiones.values()) > self.presupuesto_memoria:
+            clave = next((c for c in self._particiones if c not in fijas), None)
+            if clave is None:
+                return
+            del self._particiones[clave]
+            self.desalojadas += 1
+    
+    def particiones_cargadas(self) -> List[str]:
+        """Meses en memoria, del menos al más recientemente usado"""
+        return list(self._particiones)
+    
+    def memoria_cargada(self) -> int:
+        """Memoria estimada (bytes) de los meses en memoria"""
+        return sum(p.memoria for p in self._particiones.values())
+    
+    def _cargar_resumen(self):
+        """Lee los acumulados guardados; si no cuadran con el historial
+        (primer arranque, corte entre escrituras) se reconstruyen"""
+        try:
+            self.resumen = ResumenVentas(self.backend.cargar_resumenes())
+        except Exception as e:
+            print(f"Error al cargar acumulados de ventas: {e}")
+            self.resumen = ResumenVentas()
+        try:
+            total = self.total_ventas()
+        except Exception as e:
+            print(f"Error al leer el manifiesto de ventas: {e}")
+            return
+        if len(self.resumen) != total or self.resumen.formato_anterior:
+            # Se recorre el historial como flujo, sin dejarlo en memoria
+            self.resumen = ResumenVentas.desde_ventas(self.backend.cargar_ventas())
             try:
-                with open(self.data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.ventas = [Venta.from_dict(v) for v in data]
+                self.backend.guardar_resumenes(list(self.resumen.filas()))
             except Exception as e:
-                print(f"Error al cargar ventas: {e}")
-                self.ventas = []
-        else:
-            self.ventas = []
+                print(f"Error al guardar acumulados de ventas: {e}")
+    
+    def _cargar_vendidos(self):
+        """Lee los totales de productos vendidos; si no cuadran con los
+        renglones del manifiesto se reconstruyen (totales y todos los meses)
+        recorriendo el historial una vez"""
+        try:
+            self.vendidos = VendidosPorDia(self.backend.cargar_vendidos_totales())
+        except Exception as e:
+            print(f"Error al cargar productos vendidos: {e}")
+            self.vendidos = VendidosPorDia()
+        try:
+            renglones = sum(e['items'] for e in self._manifiesto().values())
+        except Exception as e:
+            print(f"Error al leer el manifiesto de ventas: {e}")
+            return
+        if self.vendidos.renglones != renglones:
+            self.vendidos = VendidosPorDia.desde_ventas(self.backend.cargar_ventas())
+            try:
+                self.backend.guardar_vendidos_totales(self.vendidos.filas_totales())
+                for clave in self.vendidos.meses():
+                    self.backend.guardar_vendidos_mes(clave, self.vendidos.filas_mes(clave))
+            except Exception as e:
+                print(f"Error al guardar productos vendidos: {e}")
     
-    def guardar_ventas(self):
-        """Guarda las ventas en el archivo JSON"""
+    def _vendidos_mes(self, clave: str):
+        """Carga los acumulados por día de un mes (si no cuadran con su
+        partición, se rehacen sólo desde ese mes)"""
+        if self.vendidos.tiene_mes(clave):
+            return
+        entrada = self._manifiesto().get(clave)
+        if entrada is None:
+            self.vendidos.poner_mes(clave, [])
+            return
         try:
-            os.makedirs(os.path.dirname(self.data_path), exist_ok=True)
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                data = [v.to_dict() for v in self.ventas]
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            filas = self.backend.cargar_vendidos_mes(clave)
+        except Exception as e:
+            print(f"Error al cargar productos vendidos de {clave}: {e}")
+            filas = []
+        if VendidosPorDia.renglones_de(filas) == entrada['items']:
+            self.vendidos.poner_mes(clave, filas)
+            return
+        del_mes = VendidosPorDia.desde_ventas(self.backend.cargar_ventas_particion(clave))
+        self.vendidos.poner_mes(clave, del_mes.filas_mes(clave))
+        try:
+            self.backend.guardar_vendidos_mes(clave, self.vendidos.filas_mes(clave))
+        except Exception as e:
+            print(f"Error al guardar productos vendidos de {clave}: {e}")
+    
+    def guardar_ventas(self) -> bool:
+        """Reescribe el historial completo (compactación)"""
+        try:
+            self.backend.reescribir_ventas(list(self.obtener_todas_ventas()))
+            return True
         except Exception as e:
             print(f"Error al guardar ventas: {e}")
+            return False
+    
+    def _resolver(self, folios: List[str]) -> List[Venta]:
+        """Convierte folios regresados por el backend en ventas en memoria"""
+        ventas = (self.buscar_venta(f) for f in folios)
+        return [v for v in ventas if v is not None]
     
-    def generar_folio(self) -> str:
-        """Genera un nuevo folio para la venta"""
-        fecha = datetime.now().strftime("%Y%m%d")
-        numero = len([v for v in self.ventas if v.folio.startswith(fecha)]) + 1
-        return f"{fecha}-{numero:04d}"
+    def _indexar_folio(self, venta: Venta):
+        """Lleva el consecutivo de folio del día de la venta"""
+        dia, _, numero = venta.folio.partition("-")
+        if numero.isdigit():
+            self._consecutivos[dia] = max(self._consecutivos.get(dia, 0), int(numero))
+    
+    def generar_folio(self, fecha: Optional[str] = None) -> str:
+        """Genera un nuevo folio para la venta (del día de `fecha` ISO; por
+        omisión hoy)"""
+        if fecha is None:
+            dia = datetime.now().strftime("%Y%m%d")
+        else:
+            # Los consecutivos de ese día se conocen al cargar su mes
+            self._particion(particion_de(fecha))
+            dia = fecha[:10].replace("-", "")
+        numero = self._consecutivos.get(dia, 0) + 1
+        return f"{dia}-{numero:04d}"
     
     def registrar_venta(self, venta: Venta) -> bool:
         """Registra una nueva venta"""
         try:
-            self.ventas.append(venta)
-            self.guardar_ventas()
-            return True
+            # El mes se carga antes de escribir: si no, leería ya esta venta
+            clave = particion_de(venta.fecha)
+            particion = self._particion(clave)
+            self._vendidos_mes(clave)
+            self.backend.agregar_venta(venta)
+            particion.insertar(venta)
+            self._indexar_folio(venta)
         except Exception as e:
             print(f"Error al registrar venta: {e}")
             return False
+        # La venta ya quedó en la bitácora: si falla esto, el siguiente
+        # arranque detecta el descuadre y reconstruye los acumulados
+        fila = self.resumen.acumular(venta)
+        totales, del_dia = self.vendidos.acumular(venta)
+        self.version += 1
+        try:
+            self.backend.guardar_resumenes(list(self.resumen.filas()), cambiados=[fila])
+            self.backend.guardar_vendidos_totales(self.vendidos.filas_totales(), cambiados=totales)
+            self.backend.guardar_vendidos_mes(clave, self.vendidos.filas_mes(clave),
+                                              cambiados=del_dia)
+        except Exception as e:
+            print(f"Error al guardar acumulados de ventas: {e}")
+        return True
     
     def buscar_venta(self, folio: str) -> Optional[Venta]:
-        """Busca una venta por folio"""
-        for venta in self.ventas:
-            if venta.folio == folio:
+        """Busca una venta por folio (AAAAMMDD-NNNN: carga su mes si hace falta)"""
+        clave = f"{folio[:4]}-{folio[4:6]}"
+        if clave in self._particiones or clave in self._manifiesto():
+            venta = self._particion(clave).por_folio.get(folio)
+            if venta is not None:
+                return venta
+        # Folios con otro formato (datos importados): sólo los meses en memoria
+        for particion in self._particiones.values():
+            venta = particion.por_folio.get(folio)
+            if venta is not None:
                 return venta
         return None
 
-    def obtener_todas_ventas(self) -> List[Venta]:
-        """Obtiene todas las ventas cargadas."""
-        return self.ventas
-    
-    def obtener_ventas_por_fecha(self, fecha_inicio: str, fecha_fin: str) -> List[Venta]:
-        """Obtiene ventas en un rango de fechas"""
-        resultado = []
-        for venta in self.ventas:
-            fecha_venta = venta.fecha[:10]  # Solo la fecha, sin hora
-            if fecha_inicio <= fecha_venta <= fecha_fin:
-                resultado.append(venta)
-        return resultado
+    def obtener_todas_ventas(self) -> Sequence[Venta]:
+        """Obtiene todo el historial (carga todos los meses)"""
+        particiones = [self._particion(c) for c in sorted(self._manifiesto())]
+        return RangoVentas([(p.ventas, 0, len(p.ventas)) for p in particiones])
+    
+    def obtener_ventas_por_fecha(self, fecha_inicio: str, fecha_fin: str) -> Sequence[Venta]:
+        """Obtiene ventas en un rango de fechas (AAAA-MM-DD, ambos inclusive)
+
+        Regresa una vista perezosa sobre las ventas ordenadas, sin copiarlas.
+        Sólo se cargan los meses que tocan el rango.
+        """
+        desde, hasta = particion_de(fecha_inicio), particion_de(fecha_fin)
+        claves = sorted(c for c in self._manifiesto() if desde <= c <= hasta)
+        return RangoVentas([self._particion(c).tramo(fecha_inicio, fecha_fin)
+                            for c in claves])
     
     def obtener_ventas_cajero(self, cajero: str) -> List[Venta]:
         """Obtiene todas las ventas de un cajero"""
-        return [v for v in self.ventas if v.cajero == cajero]
+        if self.backend.indexado:
+            return self._resolver(self.backend.consultar_ventas_cajero(cajero))
+        return [v for v in self.obtener_todas_ventas() if v.cajero == cajero]
     
-    def calcular_total_ventas(self, ventas: List[Venta]) -> float:
+    def calcular_total_ventas(self, ventas: Sequence[Venta]) -> float:
         """Calcula el total de una lista de ventas"""
         return sum(v.total for v in ventas)
     
-    def obtener_ventas_del_dia(self) -> List[Venta]:
+    def obtener_ventas_del_dia(self) -> Sequence[Venta]:
         """Obtiene las ventas del día actual"""
         hoy = datetime.now().strftime("%Y-%m-%d")
         return self.obtener_ventas_por_fecha(hoy, hoy)
     
-    def obtener_productos_mas_vendidos(self, limite: int = 10) -> List[tuple]:
-        """Obtiene los productos más vendidos"""
-        productos_vendidos = {}
-        
-        for venta in self.ventas:
-            for item in venta.items:
-                codigo = item.codigo_barras
-                if codigo in productos_vendidos:
-                    productos_vendidos[codigo]['cantidad'] += item.cantidad
-                    productos_vendidos[codigo]['total'] += item.subtotal
-                else:
-                    productos_vendidos[codigo] = {
-                        'nombre': item.nombre,
-                        'cantidad': item.cantidad,
-                        'total': item.subtotal
-                    }
-        
-        # Ordenar por cantidad vendida
-        productos_ordenados = sorted(
-            productos_vendidos.items(),
-            key=lambda x: x[1]['cantidad'],
-            reverse=True
-        )
+    def obtener_productos_mas_vendidos(self, limite: int = 10, dias: Optional[int] = None,
+                                       criterio: str = 'cantidad') -> List[tuple]:
+        """Obtiene los productos más vendidos
+
+        dias: None para todo el historial, 1 para hoy, 7 o 30 para los
+        últimos días (incluyendo hoy). criterio: 'cantidad' o 'total'.
+        Regresa [(codigo, {'nombre', 'cantidad', 'total'}), ...].
+        """
+        if dias is None:
+            acumulado = self.vendidos.totales
+        else:
+            # Sólo se leen los acumulados de los días pedidos (y sus meses)
+            hoy = datetime.now()
+            fechas = [(hoy - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(dias)]
+            for clave in {particion_de(f) for f in fechas}:
+                self._vendidos_mes(clave)
+            acumulado = self.vendidos.de_los_dias(fechas)
         
-        return productos_ordenados[:limite]
+        mejores = heapq.nlargest(limite, acumulado.items(),
+                                 key=lambda x: x[1][criterio])
+        return [(codigo, {'nombre': datos['nombre'], 'cantidad': datos['cantidad'],
+                          'total': datos['total']})
+                for codigo, datos in mejores]
     
     def obtener_reporte_ventas(self, fecha_inicio: str, fecha_fin: str) -> dict:
-        """Genera un reporte de ventas para un período"""
-        ventas = self.obtener_ventas_por_fecha(fecha_inicio, fecha_fin)
-        
-        total_ventas = len(ventas)
-        total_dinero = self.calcular_total_ventas(ventas)
-        
-        # Ventas por cajero
-        ventas_por_cajero = {}
-        for venta in ventas:
-            if venta.cajero in ventas_por_cajero:
-                ventas_por_cajero[venta.cajero] += venta.total
-            else:
-                ventas_por_cajero[venta.cajero] = venta.total
-        
-        # Ventas por método de pago
-        ventas_por_metodo = {}
-        for venta in ventas:
-            metodo = venta.metodo_pago
-            if metodo in ventas_por_metodo:
-                ventas_por_metodo[metodo] += venta.total
-            else:
-                ventas_por_metodo[metodo] = venta.total
+        """Genera un reporte de ventas para un período (desde los acumulados)"""
+        resumen = self.resumen.reporte(fecha_inicio, fecha_fin)
+        # Tickets cobrados (sin devoluciones); el total es neto de devoluciones
+        total_ventas = resumen['ventas']
+        total_dinero = resumen['total']
+        # El promedio es de lo cobrado, antes de restar lo devuelto
+        cobrado = total_dinero + resumen['devuelto']
         
         return {
             'periodo': f"{fecha_inicio} a {fecha_fin}",
             'total_ventas': total_ventas,
+            'total_devoluciones': resumen['devoluciones'],
+            'total_devuelto': resumen['devuelto'],
             'total_dinero': total_dinero,
-            'promedio_venta': total_dinero / total_ventas if total_ventas > 0 else 0,
-            'ventas_por_cajero': ventas_por_cajero,
-            'ventas_por_metodo': ventas_por_metodo
+            'subtotal': resumen['subtotal'],
+            'iva': resumen['iva'],
+            'total_items': resumen['items'],
+            'total_items_devueltos': resumen['items_devueltos'],
+            'promedio_venta': cobrado / total_ventas if total_ventas > 0 else 0,
+            'ventas_por_cajero': resumen['por_cajero'],
+            'ventas_por_metodo': resumen['por_metodo']
         }
@@ -6,19 +6,25 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import os
 import json
+import queue
+import atexit
+from datetime import datetime
 
 from src.controllers.auth_controller import AuthController
-from src.controllers.producto_controller import ProductoController
-from src.controllers.venta_controller import VentaController
 from src.views.login_view import LoginView
-from src.views.main_view import MainView
 from src.utils.theme_manager import ThemeManager
+from src.utils.arranque import Arranque
+from src.storage import EscritorSegundoPlano, crear_backend
 
 class App:
     def __init__(self):
-        self.root = tk.Tk()
+        # Línea de tiempo del arranque y señal de datos listos
+        self.arranque = Arranque()
+        with self.arranque.fase("ventana Tk"):
+            self.root = tk.Tk()
         # Cargar configuración
-        self.cargar_configuracion()
+        with self.arranque.fase("configuración"):
+            self.cargar_configuracion()
 
         # Título de la app (nombre configurable)
         self.root.title(
@@ -32,27 +38,104 @@ class App:
         self.theme_manager = ThemeManager(self.config.get('theme', 'light'))
         
         # Configurar estilo
-        self.configurar_estilo()
+        with self.arranque.fase("estilo"):
+            self.configurar_estilo()
+        
+        # Inicializar almacenamiento (JSON o SQLite según config.json); los
+        # archivos JSON se escriben en un hilo para no congelar la ventana
+        storage = self.config.get('storage', {})
+        with self.arranque.fase("almacenamiento"):
+            self.escritor = EscritorSegundoPlano(
+                storage.get('intervalo_guardado_ms', 1000) / 1000)
+            atexit.register(self.escritor.cerrar)
+            self.backend = crear_backend(self.config, self.escritor)
+        
+        # El login sólo necesita los usuarios
+        with self.arranque.fase("usuarios"):
+            self.auth_controller = AuthController(backend=self.backend)
         
-        # Inicializar controladores
-        self.auth_controller = AuthController()
-        self.producto_controller = ProductoController()
-        self.venta_controller = VentaController()
+        # Catálogo y ventas se cargan en otro hilo mientras se muestra el
+        # login; MainView espera a arranque.listo (ver mostrar_sistema)
+        self.producto_controller = None
+        self.venta_controller = None
+        self.punto_de_venta = None
+        self._sistema_pendiente = False
+        self.arranque.en_segundo_plano(
+            lambda: self.cargar_datos(storage.get('memoria_ventas_mb', 64)),
+            calentamiento=self.calentar_busqueda)
         
         # Vista actual
         self.vista_actual = None
         
+        # No cerrar sin terminar de escribir lo pendiente
+        self.root.protocol("WM_DELETE_WINDOW", self.al_cerrar)
+        self.revisar_guardado()
+        
         # Mostrar login
-        self.mostrar_login()
+        with self.arranque.fase("login"):
+            self.mostrar_login()
+        self.root.after(50, self.revisar_arranque)
+    
+    def cargar_datos(self, memoria_ventas_mb):
+        """Crea los controladores de catálogo y ventas (hilo de arranque).
+
+        No toca Tk: sólo deja listos los controladores. Sus módulos se
+        importan aquí, fuera del camino al login.
+        """
+        from src.controllers.producto_controller import ProductoController
+        from src.controllers.venta_controller import VentaController
+        from src.services.punto_de_venta import PuntoDeVenta
+        
+        with self.arranque.fase("productos"):
+            self.producto_controller = ProductoController(backend=self.backend)
+        with self.arranque.fase("ventas"):
+            self.venta_controller = VentaController(
+                backend=self.backend, memoria_mb=memoria_ventas_mb)
+        # Cobro, devoluciones y reportes sin Tk (lo mismo que usa src.cli)
+        self.punto_de_venta = PuntoDeVenta(self.producto_controller, self.venta_controller,
+                                           self.config.get('tax_rate', 0.16))
+    
+    def calentar_busqueda(self):
+        """Arma los índices de búsqueda ya con los datos listos (hilo de
+        arranque): la primera búsqueda en caja no espera a construirlos"""
+        with self.arranque.fase("índices de búsqueda"):
+            self.producto_controller.preparar_indices()
+    
+    def revisar_arranque(self):
+        """Sigue, sin bloquear Tk, la carga en segundo plano: abre el sistema
+        si el login ya pasó y, al terminar, imprime la línea de tiempo"""
+        if self.arranque.listo.is_set():
+            if self.arranque.error is not None:
+                messagebox.showerror("Error",
+                                     f"No se pudieron cargar los datos:\n{self.arranque.error}")
+                self.al_cerrar()
+                return
+            if self._sistema_pendiente:
+                self._sistema_pendiente = False
+                self.mostrar_sistema()
+        if self.arranque.terminado():
+            print(self.arranque.reporte())
+            return
+        self.root.after(50, self.revisar_arranque)
+    
+    def mostrar_carga(self):
+        """Pantalla de espera mientras terminan de cargar los datos"""
+        if self.vista_actual:
+            self.vista_actual.destroy()
+        
+        frame = ttk.Frame(self.root)
+        frame.pack(fill='both', expand=True)
+        ttk.Label(frame, text="Cargando inventario y ventas...",
+                  style='Subtitle.TLabel').pack(pady=(250, 10))
+        barra = ttk.Progressbar(frame, mode='indeterminate', length=300)
+        barra.pack()
+        barra.start(15)
+        self.vista_actual = frame
     
     def cargar_configuracion(self):
         """Carga la configuración desde config.json"""
         try:
-            config_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                'config.json'
-            )
-            with open(config_path, 'r', encoding='utf-8') as f:
+            with open(self.ruta_configuracion(), 'r', encoding='utf-8') as f:
                 self.config = json.load(f)
         except Exception as e:
             print(f"Error al cargar configuración: {e}")
@@ -61,19 +144,31 @@ class App:
                 'ui': {'window_width': 1400, 'window_height': 800}
             }
     
+    @staticmethod
+    def ruta_configuracion():
+        """Ruta de config.json (raíz del proyecto)"""
+        return os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            'config.json'
+        )
+    
     def guardar_configuracion(self):
         """Guarda la configuración en config.json"""
         try:
-            config_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-                'config.json'
-            )
             self.config['theme'] = self.theme_manager.get_theme_name()
-            with open(config_path, 'w', encoding='utf-8') as f:
+            with open(self.ruta_configuracion(), 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"Error al guardar configuración: {e}")
     
+    def programar_guardado_configuracion(self):
+        """Guarda config.json en el hilo escritor (cambios seguidos, p. ej.
+        varios cambios de tema, se combinan en una sola escritura; lo
+        pendiente se escribe al cerrar)"""
+        self.config['theme'] = self.theme_manager.get_theme_name()
+        datos = dict(self.config)
+        self.escritor.programar(self.ruta_configuracion(), lambda: datos)
+    
     def configurar_estilo(self):
         """Configura el estilo de la aplicación según el tema"""
         style = ttk.Style()
@@ -175,17 +270,20 @@ class App:
         self.colors = colors
     
     def toggle_theme(self):
-        """Cambia entre modo claro y oscuro"""
+        """Cambia entre modo claro y oscuro.
+
+        No reconstruye la interfaz: se cambian los estilos ttk y los colores
+        de los widgets registrados en el gestor de temas, así que el carrito,
+        los filtros y la posición de las tablas se conservan.
+        """
         self.theme_manager.toggle_theme()
+        self.aplicar_tema()
+        self.programar_guardado_configuracion()
+    
+    def aplicar_tema(self):
+        """Aplica el tema actual a la interfaz existente"""
         self.configurar_estilo()
-        self.guardar_configuracion()
-        
-        # Recargar la vista actual
-        if self.vista_actual:
-            if hasattr(self, 'auth_controller') and self.auth_controller.obtener_usuario_actual():
-                self.mostrar_sistema()
-            else:
-                self.mostrar_login()
+        self.theme_manager.apply_registered()
     
     def mostrar_login(self):
         """Muestra la ventana de login"""
@@ -196,9 +294,17 @@ class App:
     
     def mostrar_sistema(self):
         """Muestra el sistema principal después del login"""
+        if not self.arranque.listo.is_set():
+            # revisar_arranque lo vuelve a llamar al terminar la carga
+            self._sistema_pendiente = True
+            self.mostrar_carga()
+            return
+        
         if self.vista_actual:
             self.vista_actual.destroy()
         
+        # Primera vez: se importa aquí, no al arrancar
+        from src.views.main_view import MainView
         usuario = self.auth_controller.obtener_usuario_actual()
         if usuario:
             self.vista_actual = MainView(self.root, self, usuario)
@@ -206,6 +312,40 @@ class App:
             messagebox.showerror("Error", "No hay usuario autenticado")
             self.mostrar_login()
     
+    def revisar_guardado(self):
+        """Muestra el resultado de las escrituras en segundo plano.
+
+        Corre en el hilo de Tk vía after(): el escritor sólo deja eventos en
+        su cola.
+        """
+        ultimo = None
+        while True:
+            try:
+                path, error = self.escritor.eventos.get_nowait()
+            except queue.Empty:
+                break
+            ultimo = (path, error)
+            if error is not None:
+                messagebox.showerror("Error al guardar",
+                                     f"No se pudo guardar {os.path.basename(path)}:\n{error}")
+        
+        if ultimo is not None and hasattr(self.vista_actual, 'mostrar_estado_guardado'):
+            if ultimo[1] is None:
+                texto = f"💾 Guardado {datetime.now().strftime('%H:%M:%S')}"
+            else:
+                texto = "⚠️ Error al guardar"
+            self.vista_actual.mostrar_estado_guardado(texto)
+        
+        self.root.after(250, self.revisar_guardado)
+    
+    def al_cerrar(self):
+        """Termina las escrituras pendientes antes de cerrar la ventana"""
+        # Que la carga de datos no quede a medias sobre el backend cerrado
+        self.arranque.esperar()
+        self.escritor.cerrar()
+        self.backend.cerrar()
+        self.root.destroy()
+    
     def cerrar_sesion(self):
         """Cierra la sesión actual"""
         self.auth_controller.logout()
@@ -215,6 +355,7 @@ class App:
         """Ejecuta la aplicación"""
         # Centrar ventana
         self.root.update_idletasks()
+        self.arranque.marcar("ventana visible")
         width = self.root.winfo_width()
         height = self.root.winfo_height()
         x = (self.root.winfo_screenwidth() // 2) - (width // 2)
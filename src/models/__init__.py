@@ -4,5 +4,6 @@ Paquete de modelos
 from .producto import Producto
 from .usuario import Usuario, RolUsuario
 from .venta import Venta, ItemVenta
+from .carrito import Carrito
 
-__all__ = ['Producto', 'Usuario', 'RolUsuario', 'Venta', 'ItemVenta']
+__all__ = ['Producto', 'Usuario', 'RolUsuario', 'Venta', 'ItemVenta', 'Carrito']
@@ -0,0 +1,89 @@
+"""
+Modelo de Carrito de compras
+Renglones por código de barras con totales acumulados: agregar, quitar o
+cambiar una cantidad cuesta lo mismo con 3 que con 3,000 renglones.
+"""
+from typing import Dict, Iterator, List, Optional
+from src.models.producto import Producto
+from src.models.venta import ItemVenta
+
+class Carrito:
+    def __init__(self, tasa_iva: float = 0.16):
+        self.tasa_iva = tasa_iva
+        # Los dicts conservan el orden de alta: así se muestran los renglones
+        self._lineas: Dict[str, ItemVenta] = {}
+        self.subtotal = 0.0
+        self.unidades = 0
+
+    def __len__(self) -> int:
+        return len(self._lineas)
+
+    def __iter__(self) -> Iterator[ItemVenta]:
+        return iter(self._lineas.values())
+
+    def __contains__(self, codigo: str) -> bool:
+        return codigo in self._lineas
+
+    @property
+    def iva(self) -> float:
+        return self.subtotal * self.tasa_iva
+
+    @property
+    def total(self) -> float:
+        return self.subtotal + self.iva
+
+    def linea(self, codigo: str) -> Optional[ItemVenta]:
+        return self._lineas.get(codigo)
+
+    def cantidad_de(self, codigo: str) -> int:
+        linea = self._lineas.get(codigo)
+        return linea.cantidad if linea else 0
+
+    def agregar(self, producto: Producto, cantidad: int = 1) -> ItemVenta:
+        """Suma unidades del producto (crea el renglón si no existe)"""
+        linea = self._lineas.get(producto.codigo_barras)
+        if linea is None:
+            linea = ItemVenta(producto.codigo_barras, producto.nombre, 0,
+                              producto.precio, 0.0)
+            self._lineas[producto.codigo_barras] = linea
+        self._ajustar(linea, linea.cantidad + cantidad)
+        return linea
+
+    def cambiar_cantidad(self, codigo: str, cantidad: int) -> Optional[ItemVenta]:
+        """Fija la cantidad de un renglón; 0 o menos lo quita"""
+        linea = self._lineas.get(codigo)
+        if linea is None:
+            return None
+        if cantidad <= 0:
+            self.quitar(codigo)
+            return None
+        self._ajustar(linea, cantidad)
+        return linea
+
+    def quitar(self, codigo: str) -> bool:
+        linea = self._lineas.pop(codigo, None)
+        if linea is None:
+            return False
+        self.subtotal -= linea.subtotal
+        self.unidades -= linea.cantidad
+        if not self._lineas:
+            # Sin renglones no debe quedar residuo de redondeo
+            self.subtotal = 0.0
+        return True
+
+    def limpiar(self):
+        self._lineas = {}
+        self.subtotal = 0.0
+        self.unidades = 0
+
+    def _ajustar(self, linea: ItemVenta, cantidad: int):
+        """Cambia la cantidad del renglón y corrige los totales por la diferencia"""
+        nuevo_subtotal = linea.precio_unitario * cantidad
+        self.subtotal += nuevo_subtotal - linea.subtotal
+        self.unidades += cantidad - linea.cantidad
+        linea.cantidad = cantidad
+        linea.subtotal = nuevo_subtotal
+
+    def a_items(self) -> List[ItemVenta]:
+        """Renglones listos para la Venta (el carrito debe limpiarse después)"""
+        return list(self._lineas.values())
@@ -0,0 +1,12 @@
+"""
+Internado de textos repetidos
+Campos con pocos valores distintos (categoría, proveedor, unidad, método de
+pago, cajero) y los nombres que cada renglón de venta copia del catálogo:
+todos los objetos comparten una sola copia de cada texto.
+"""
+import sys
+
+
+def internar(valor):
+    """sys.intern para textos; cualquier otro valor (None, números) pasa igual"""
+    return sys.intern(valor) if type(valor) is str else valor
@@ -3,21 +3,34 @@ Modelo de Producto
 """
 from datetime import datetime
 from typing import Optional
+from src.models.internado import internar
 
 class Producto:
+    __slots__ = ("codigo_barras", "nombre", "precio", "stock", "categoria",
+                 "proveedor", "precio_compra", "unidad", "fecha_creacion",
+                 "fecha_actualizacion")
+
     def __init__(self, codigo_barras: str, nombre: str, precio: float, 
                  stock: int, categoria: str, proveedor: str = "",
-                 precio_compra: float = 0.0, unidad: str = "pz"):
+                 precio_compra: float = 0.0, unidad: str = "pz",
+                 fecha_creacion: Optional[str] = None,
+                 fecha_actualizacion: Optional[str] = None):
         self.codigo_barras = codigo_barras
         self.nombre = nombre
         self.precio = precio
         self.stock = stock
-        self.categoria = categoria
-        self.proveedor = proveedor
+        self.categoria = internar(categoria)
+        self.proveedor = internar(proveedor)
         self.precio_compra = precio_compra
-        self.unidad = unidad
-        self.fecha_creacion = datetime.now().isoformat()
-        self.fecha_actualizacion = datetime.now().isoformat()
+        self.unidad = internar(unidad)
+        if fecha_creacion is None or fecha_actualizacion is None:
+            ahora = datetime.now().isoformat()
+            if fecha_creacion is None:
+                fecha_creacion = ahora
+            if fecha_actualizacion is None:
+                fecha_actualizacion = ahora
+        self.fecha_creacion = fecha_creacion
+        self.fecha_actualizacion = fecha_actualizacion
     
     def to_dict(self) -> dict:
         """Convierte el producto a diccionario"""
@@ -37,7 +50,7 @@ class Producto:
     @staticmethod
     def from_dict(data: dict) -> 'Producto':
         """Crea un producto desde un diccionario"""
-        producto = Producto(
+        return Producto(
             codigo_barras=data["codigo_barras"],
             nombre=data["nombre"],
             precio=data["precio"],
@@ -45,11 +58,10 @@ class Producto:
             categoria=data["categoria"],
             proveedor=data.get("proveedor", ""),
             precio_compra=data.get("precio_compra", 0.0),
-            unidad=data.get("unidad", "pz")
+            unidad=data.get("unidad", "pz"),
+            fecha_creacion=data.get("fecha_creacion"),
+            fecha_actualizacion=data.get("fecha_actualizacion")
         )
-        producto.fecha_creacion = data.get("fecha_creacion", datetime.now().isoformat())
-        producto.fecha_actualizacion = data.get("fecha_actualizacion", datetime.now().isoformat())
-        return producto
     
     def actualizar_stock(self, cantidad: int):
         """Actualiza el stock del producto"""
@@ -11,6 +11,9 @@ class RolUsuario(Enum):
     CAJERO = "CAJERO"
 
 class Usuario:
+    __slots__ = ("username", "password_hash", "rol", "nombre_completo", "activo",
+                 "fecha_creacion", "ultimo_acceso")
+
     def __init__(self, username: str, password: str, rol: RolUsuario, 
                  nombre_completo: str = ""):
         self.username = username
@@ -65,7 +68,8 @@ class Usuario:
         usuario.rol = RolUsuario[data["rol"]]
         usuario.nombre_completo = data.get("nombre_completo", data["username"])
         usuario.activo = data.get("activo", True)
-        usuario.fecha_creacion = data.get("fecha_creacion", datetime.now().isoformat())
+        usuario.fecha_creacion = (data["fecha_creacion"] if "fecha_creacion" in data
+                                  else datetime.now().isoformat())
         usuario.ultimo_acceso = data.get("ultimo_acceso")
         return usuario
     
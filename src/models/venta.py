@@ -1,14 +1,27 @@
 """
 Modelo de Venta
+Las ventas leídas de la bitácora guardan sus renglones como el texto JSON
+del arreglo y crean los ItemVenta hasta que alguien usa `.items`: cargar el
+historial no paga esa conversión y los reportes que sólo leen la cabecera
+(fecha, cajero, total, método de pago) nunca los tocan.
+
+Una devolución es una Venta con cantidades e importes negativos y
+`referencia` = folio de la venta original.
 """
+import json
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
+from src.models.internado import internar
 
 class ItemVenta:
+    __slots__ = ("codigo_barras", "nombre", "cantidad", "precio_unitario", "subtotal")
+
     def __init__(self, codigo_barras: str, nombre: str, cantidad: int, 
                  precio_unitario: float, subtotal: float):
-        self.codigo_barras = codigo_barras
-        self.nombre = nombre
+        # Cada renglón repite el código y el nombre del producto: se
+        # comparte una sola copia entre todas las ventas
+        self.codigo_barras = internar(codigo_barras)
+        self.nombre = internar(nombre)
         self.cantidad = cantidad
         self.precio_unitario = precio_unitario
         self.subtotal = subtotal
@@ -33,26 +46,64 @@ class ItemVenta:
         )
 
 class Venta:
+    __slots__ = ("folio", "cajero", "_items", "_items_crudos", "subtotal", "iva",
+                 "total", "metodo_pago", "fecha", "cliente_rfc", "facturada", "referencia")
+
     def __init__(self, folio: str, cajero: str, items: List[ItemVenta], 
                  subtotal: float, iva: float, total: float, 
-                 metodo_pago: str = "Efectivo"):
+                 metodo_pago: str = "Efectivo", fecha: Optional[str] = None):
         self.folio = folio
-        self.cajero = cajero
-        self.items = items
+        self.cajero = internar(cajero)
+        self._items = items
+        # Renglones sin convertir: texto JSON del arreglo
+        self._items_crudos: Optional[str] = None
         self.subtotal = subtotal
         self.iva = iva
         self.total = total
-        self.metodo_pago = metodo_pago
-        self.fecha = datetime.now().isoformat()
+        self.metodo_pago = internar(metodo_pago)
+        self.fecha = fecha or datetime.now().isoformat()
         self.cliente_rfc = None
         self.facturada = False
+        # Folio de la venta original (sólo en devoluciones)
+        self.referencia: Optional[str] = None
+    
+    @property
+    def es_devolucion(self) -> bool:
+        return self.referencia is not None
+    
+    @property
+    def items(self) -> List[ItemVenta]:
+        """Renglones de la venta (se crean al primer acceso)"""
+        if self._items is None:
+            self._items = [ItemVenta.from_dict(item) for item in json.loads(self._items_crudos)]
+            self._items_crudos = None
+        return self._items
+    
+    @items.setter
+    def items(self, items: List[ItemVenta]):
+        self._items = items
+        self._items_crudos = None
+    
+    @property
+    def num_items(self) -> int:
+        """Cantidad de renglones sin crear los ItemVenta"""
+        if self._items is not None:
+            return len(self._items)
+        # Cada renglón tiene una sola llave codigo_barras (dentro de un
+        # texto JSON las comillas van escapadas, así que no hay falsos)
+        return self._items_crudos.count('"codigo_barras":')
+    
+    def _items_dict(self) -> List[dict]:
+        if self._items is not None:
+            return [item.to_dict() for item in self._items]
+        return json.loads(self._items_crudos)
     
     def to_dict(self) -> dict:
-        """Convierte la venta a diccionario"""
-        return {
+        """Convierte la venta a diccionario (referencia sólo si la hay)"""
+        datos = {
             "folio": self.folio,
             "cajero": self.cajero,
-            "items": [item.to_dict() for item in self.items],
+            "items": self._items_dict(),
             "subtotal": self.subtotal,
             "iva": self.iva,
             "total": self.total,
@@ -61,23 +112,37 @@ class Venta:
             "cliente_rfc": self.cliente_rfc,
             "facturada": self.facturada
         }
+        if self.referencia is not None:
+            datos["referencia"] = self.referencia
+        return datos
     
     @staticmethod
     def from_dict(data: dict) -> 'Venta':
-        """Crea una venta desde un diccionario"""
-        items = [ItemVenta.from_dict(item) for item in data["items"]]
+        """Crea una venta desde un diccionario.
+
+        data["items"] puede ser el texto JSON del arreglo (bitácora, ver
+        json_backend._leer_linea), que se guarda tal cual hasta usar
+        `.items`, o la lista de dicts, que se convierte de una vez: los
+        dicts ocupan más que los ItemVenta.
+        """
         venta = Venta(
             folio=data["folio"],
             cajero=data["cajero"],
-            items=items,
+            items=None,
             subtotal=data["subtotal"],
             iva=data["iva"],
             total=data["total"],
-            metodo_pago=data.get("metodo_pago", "Efectivo")
+            metodo_pago=data.get("metodo_pago", "Efectivo"),
+            fecha=data["fecha"]
         )
-        venta.fecha = data["fecha"]
+        items = data["items"]
+        if isinstance(items, str):
+            venta._items_crudos = items
+        else:
+            venta._items = [ItemVenta.from_dict(item) for item in items]
         venta.cliente_rfc = data.get("cliente_rfc")
         venta.facturada = data.get("facturada", False)
+        venta.referencia = data.get("referencia")
         return venta
     
     def marcar_facturada(self, rfc_cliente: str):
@@ -86,4 +151,4 @@ class Venta:
         self.cliente_rfc = rfc_cliente
     
     def __str__(self) -> str:
-        return f"Venta {self.folio} - ${self.total:.2f} ({len(self.items)} items)"
+        return f"Venta {self.folio} - ${self.total:.2f} ({self.num_items} items)"
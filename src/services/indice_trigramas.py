@@ -0,0 +1,207 @@
+"""src/services/indice_trigramas.py
+
+Índice invertido de trigramas para búsqueda por subcadena.
+
+- Los textos se normalizan (sin acentos, casefold): "limon" encuentra "Limón".
+- Cada trigrama apunta a una lista ordenada de ids (array de enteros), así
+  100k productos ocupan unos pocos MB.
+- Una consulta de 3+ caracteres toma la lista más corta de sus trigramas
+  como candidatos (si algún trigrama no existe no hay resultados) y la
+  intersecta con el resto verificando la subcadena sobre el texto ya
+  normalizado: esa prueba en C es más barata que sondear las demás listas
+  desde Python. Consultas de 1-2 caracteres recorren los textos
+  normalizados.
+- Los resultados salen en orden de alta (el mismo orden del catálogo).
+- `refinar` filtra un resultado previo cuando la consulta crece ("coc" ->
+  "coca"): sólo verifica la subcadena sobre esos candidatos.
+- `similares` tolera errores de captura ("sabritaz", "cocacola"): cuenta
+  trigramas compartidos recorriendo sólo las listas de la consulta (sin
+  calcular distancia de edición contra todo el catálogo) y regresa los
+  mejores k con su puntaje.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+import heapq
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+def normalizar(texto: str) -> str:
+    """Quita acentos/diacríticos y pasa a minúsculas sin distinción de caso."""
+    if texto.isascii():
+        return texto.casefold()
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c)).casefold()
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Trigramas de un texto ya normalizado."""
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+class IndiceTrigramas:
+    """Índice incremental clave -> texto para búsquedas por subcadena."""
+
+    def __init__(self, elementos: Iterable = ()):
+        self._postings: Dict[str, array] = {}
+        self._textos: Dict[int, str] = {}
+        self._claves: Dict[int, Hashable] = {}
+        self._ids: Dict[Hashable, int] = {}
+        self._num_trigramas: Dict[int, int] = {}
+        self._siguiente = 0
+        self._construir(elementos)
+
+    def _construir(self, elementos: Iterable):
+        """Carga masiva: acumula en listas y convierte a arrays al final."""
+        postings = defaultdict(list)
+        for clave, texto in elementos:
+            if clave in self._ids:
+                continue
+            id_ = self._siguiente
+            self._siguiente += 1
+            normalizado = normalizar(texto)
+            self._ids[clave] = id_
+            self._claves[id_] = clave
+            self._textos[id_] = normalizado
+            tris = trigramas(normalizado)
+            self._num_trigramas[id_] = len(tris)
+            for tri in tris:
+                postings[tri].append(id_)
+        for tri, ids in postings.items():
+            self._postings[tri] = array("I", ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._ids
+
+    def agregar(self, clave: Hashable, texto: str):
+        """Da de alta una clave (si ya existía, actualiza su texto)."""
+        if clave in self._ids:
+            self.actualizar(clave, texto)
+            return
+        id_ = self._siguiente
+        self._siguiente += 1
+        normalizado = normalizar(texto)
+        self._ids[clave] = id_
+        self._claves[id_] = clave
+        self._textos[id_] = normalizado
+        tris = trigramas(normalizado)
+        self._num_trigramas[id_] = len(tris)
+        for tri in tris:
+            lista = self._postings.get(tri)
+            if lista is None:
+                self._postings[tri] = array("I", (id_,))
+            else:
+                # Los ids crecen: casi siempre es un append
+                lista.append(id_)
+
+    def actualizar(self, clave: Hashable, texto: str):
+        """Reindexa sólo los trigramas que cambiaron, conservando el orden."""
+        id_ = self._ids.get(clave)
+        if id_ is None:
+            self.agregar(clave, texto)
+            return
+        anterior = self._textos[id_]
+        normalizado = normalizar(texto)
+        if normalizado == anterior:
+            return
+        viejos = trigramas(anterior)
+        nuevos = trigramas(normalizado)
+        for tri in viejos - nuevos:
+            self._quitar_posting(tri, id_)
+        for tri in nuevos - viejos:
+            lista = self._postings.get(tri)
+            if lista is None:
+                self._postings[tri] = array("I", (id_,))
+            else:
+                insort(lista, id_)
+        self._textos[id_] = normalizado
+        self._num_trigramas[id_] = len(nuevos)
+
+    def eliminar(self, clave: Hashable):
+        id_ = self._ids.pop(clave, None)
+        if id_ is None:
+            return
+        for tri in trigramas(self._textos.pop(id_)):
+            self._quitar_posting(tri, id_)
+        del self._claves[id_]
+        del self._num_trigramas[id_]
+
+    def _quitar_posting(self, tri: str, id_: int):
+        lista = self._postings[tri]
+        del lista[bisect_left(lista, id_)]
+        if not lista:
+            del self._postings[tri]
+
+    def buscar(self, consulta: str) -> List[Hashable]:
+        """Claves cuyo texto contiene `consulta` (normalizada)."""
+        consulta = normalizar(consulta)
+        # Los dicts conservan el orden de alta (ids crecientes)
+        if len(consulta) < 3:
+            claves = self._claves
+            return [claves[i] for i, t in self._textos.items() if consulta in t]
+
+        candidatos = None
+        for tri in trigramas(consulta):
+            lista = self._postings.get(tri)
+            if lista is None:
+                return []
+            if candidatos is None or len(lista) < len(candidatos):
+                candidatos = lista
+
+        # La subcadena implica todos los trigramas (y su contigüidad)
+        textos = self._textos
+        claves = self._claves
+        return [claves[i] for i in candidatos if consulta in textos[i]]
+
+    def refinar(self, claves: Iterable[Hashable], consulta: str) -> List[Hashable]:
+        """De `claves`, las que contienen `consulta`, en orden de alta.
+
+        Para consultas que extienden a una anterior: sus resultados son un
+        subconjunto de los previos, así que no hace falta recorrer el índice.
+        """
+        consulta = normalizar(consulta)
+        ids = self._ids
+        textos = self._textos
+        encontrados = sorted(ids[c] for c in claves
+                             if c in ids and consulta in textos[ids[c]])
+        claves_por_id = self._claves
+        return [claves_por_id[i] for i in encontrados]
+
+    def similares(self, consulta: str, limite: int = 10,
+                  minimo: float = 0.3) -> List[Tuple[Hashable, float]]:
+        """Mejores `limite` claves parecidas a `consulta`, con puntaje 0..1.
+
+        cobertura = trigramas de la consulta presentes en el texto
+        dice = 2·compartidos / (trigramas consulta + trigramas texto)
+        puntaje = (cobertura + dice) / 2
+
+        Se descartan textos con cobertura menor a `minimo`.
+        """
+        tris = trigramas(normalizar(consulta))
+        if not tris:
+            return []
+
+        compartidos = Counter()
+        for tri in tris:
+            lista = self._postings.get(tri)
+            if lista is not None:
+                compartidos.update(lista)
+
+        total = len(tris)
+        necesarios = minimo * total
+        num_trigramas = self._num_trigramas
+
+        def puntaje(id_: int, n: int) -> float:
+            return (n / total + 2 * n / (total + num_trigramas[id_])) / 2
+
+        mejores = heapq.nlargest(
+            limite,
+            ((puntaje(i, n), -i) for i, n in compartidos.items() if n >= necesarios))
+        return [(self._claves[-i], round(p, 3)) for p, i in mejores]
@@ -0,0 +1,248 @@
+"""src/services/punto_de_venta.py
+
+Punto de venta sin interfaz: búsqueda, carrito, cobro, devoluciones y
+reportes sobre ProductoController y VentaController.
+
+- Lo usan las vistas de Tk, la línea de comandos (src/cli.py) y los
+  benchmarks; nada aquí importa Tk.
+- Los errores de captura (producto inexistente, sin stock, carrito vacío)
+  se regresan como mensaje, igual que ProductoController.validar_stock;
+  las operaciones regresan (resultado, error) con uno de los dos en None.
+- Una devolución se registra como un ticket con cantidades e importes
+  negativos y `referencia` = folio original: repone el stock con la misma
+  transacción del cobro y los reportes la restan sola.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.models.carrito import Carrito
+from src.models.producto import Producto
+from src.models.venta import ItemVenta, Venta
+
+METODOS_PAGO = ('Efectivo', 'Tarjeta', 'Transferencia')
+PERIODOS = ('hoy', 'semana', 'mes')
+
+# (código de barras, cantidad)
+Renglon = Tuple[str, int]
+
+
+def rango_periodo(periodo: str, hoy: Optional[datetime] = None) -> Tuple[str, str]:
+    """(fecha_inicio, fecha_fin) AAAA-MM-DD de 'hoy', 'semana' o 'mes'"""
+    hoy = hoy or datetime.now()
+    dias = {'hoy': 0, 'semana': 7, 'mes': 30}[periodo]
+    return (hoy - timedelta(days=dias)).strftime("%Y-%m-%d"), hoy.strftime("%Y-%m-%d")
+
+
+class PuntoDeVenta:
+    def __init__(self, producto_controller, venta_controller, tasa_iva: float = 0.16):
+        self.productos = producto_controller
+        self.ventas = venta_controller
+        self.tasa_iva = tasa_iva
+
+    # Búsqueda
+    def buscar(self, termino: str) -> Tuple[List[Producto], bool]:
+        """Productos por código exacto o por nombre.
+
+        Sin coincidencias se sugieren los más parecidos (errores de
+        captura); el segundo valor indica si son sugerencias.
+        """
+        termino = termino.strip()
+        if not termino:
+            return [], False
+        producto = self.productos.buscar_por_codigo(termino)
+        if producto:
+            return [producto], False
+        resultados = self.productos.buscar_por_nombre(termino)
+        if resultados:
+            return resultados, False
+        return [p for p, _ in self.productos.buscar_similares(termino)], True
+
+    # Carrito
+    def nuevo_carrito(self) -> Carrito:
+        return Carrito(self.tasa_iva)
+
+    def agregar(self, carrito: Carrito, codigo: str,
+                cantidad: int = 1) -> Tuple[Optional[ItemVenta], Optional[str]]:
+        """Agrega unidades al carrito validando el stock contra lo que ya
+        lleva; regresa (renglón, error)"""
+        if cantidad <= 0:
+            return None, "Cantidad inválida"
+        producto = self.productos.buscar_por_codigo(codigo)
+        if not producto:
+            return None, "Producto no encontrado"
+        if producto.stock <= 0:
+            return None, "Producto sin stock"
+        if carrito.cantidad_de(codigo) + cantidad > producto.stock:
+            return None, "No hay más stock disponible"
+        return carrito.agregar(producto, cantidad), None
+
+    # Cobro
+    def cobrar(self, carrito: Carrito, cajero: str, metodo_pago: str = 'Efectivo',
+               fecha: Optional[str] = None) -> Tuple[Optional[Venta], Optional[str]]:
+        """Cobra el carrito en una sola transacción (stock + venta).
+
+        Si sale bien el carrito queda vacío; si no, queda intacto.
+        fecha: ISO, para reproducir tickets de otro momento (por omisión ahora).
+        """
+        if not carrito:
+            return None, "El carrito está vacío"
+        if metodo_pago not in METODOS_PAGO:
+            return None, f"Método de pago inválido: {metodo_pago}"
+
+        # Los renglones del carrito ya son los items de la venta
+        items = carrito.a_items()
+        error = self.productos.validar_stock(items)
+        if error:
+            return None, error
+        venta = Venta(
+            folio=self.ventas.generar_folio(fecha),
+            cajero=cajero,
+            items=items,
+            subtotal=carrito.subtotal,
+            iva=carrito.iva,
+            total=carrito.total,
+            metodo_pago=metodo_pago,
+            fecha=fecha
+        )
+        # Descontar stock y registrar venta en una sola transacción
+        if not self.productos.confirmar_venta(venta, self.ventas):
+            return None, "No se pudo registrar la venta"
+        carrito.limpiar()
+        return venta, None
+
+    def cobrar_renglones(self, renglones: Iterable[Renglon], cajero: str,
+                         metodo_pago: str = 'Efectivo',
+                         fecha: Optional[str] = None) -> Tuple[Optional[Venta], Optional[str]]:
+        """Arma un carrito con (código, cantidad) y lo cobra (uso por lotes)"""
+        carrito = self.nuevo_carrito()
+        for codigo, cantidad in renglones:
+            _, error = self.agregar(carrito, codigo, cantidad)
+            if error:
+                return None, f"{codigo}: {error}"
+        return self.cobrar(carrito, cajero, metodo_pago, fecha)
+
+    # Devoluciones
+    def devoluciones_de(self, folio: str) -> List[Venta]:
+        """Devoluciones registradas contra una venta (sólo se revisan los
+        tickets desde el día de la venta)"""
+        original = self.ventas.buscar_venta(folio)
+        if original is None:
+            return []
+        hoy = datetime.now().strftime("%Y-%m-%d")
+        return [v for v in self.ventas.obtener_ventas_por_fecha(original.fecha[:10], hoy)
+                if v.referencia == folio]
+
+    def _venta_a_devolver(self, folio: str) -> Tuple[Optional[Venta], Optional[str]]:
+        original = self.ventas.buscar_venta(folio)
+        if original is None:
+            return None, "Venta no encontrada"
+        if original.es_devolucion:
+            return None, (f"El folio {folio} es una devolución de la venta "
+                          f"{original.referencia}: use el folio de la venta")
+        return original, None
+
+    def _renglones_pendientes(self, original: Venta) -> Dict[str, List[list]]:
+        """Por código, los renglones de la venta como [renglón, unidades que
+        aún pueden devolverse]. Un código puede venir en varios renglones
+        (con precios distintos): lo ya devuelto se descuenta de los primeros."""
+        renglones: Dict[str, List[list]] = {}
+        for item in original.items:
+            renglones.setdefault(item.codigo_barras, []).append([item, item.cantidad])
+        for devolucion in self.devoluciones_de(original.folio):
+            for item in devolucion.items:
+                por_descontar = -item.cantidad  # cantidades negativas
+                for renglon in renglones.get(item.codigo_barras, ()):
+                    tomar = min(renglon[1], por_descontar)
+                    renglon[1] -= tomar
+                    por_descontar -= tomar
+        return renglones
+
+    @staticmethod
+    def _sumar_pendientes(renglones: Dict[str, List[list]]) -> Dict[str, int]:
+        pendientes = {codigo: sum(unidades for _, unidades in lista)
+                      for codigo, lista in renglones.items()}
+        return {codigo: cantidad for codigo, cantidad in pendientes.items() if cantidad > 0}
+
+    def pendientes_de_devolver(self, folio: str) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+        """Unidades por código que aún pueden devolverse; regresa
+        (pendientes, error) (error si la venta no existe o es una devolución)"""
+        original, error = self._venta_a_devolver(folio)
+        if error:
+            return None, error
+        return self._sumar_pendientes(self._renglones_pendientes(original)), None
+
+    def devolver(self, folio: str, cajero: str,
+                 renglones: Optional[Iterable[Renglon]] = None,
+                 fecha: Optional[str] = None) -> Tuple[Optional[Venta], Optional[str]]:
+        """Devuelve unidades de una venta (todas las pendientes si no se
+        indican) y repone su stock; regresa (devolución, error)"""
+        original, error = self._venta_a_devolver(folio)
+        if error:
+            return None, error
+        por_codigo = self._renglones_pendientes(original)
+        pendientes = self._sumar_pendientes(por_codigo)
+        if renglones is None:
+            pedidos = dict(pendientes)
+        else:
+            pedidos = {}
+            for codigo, cantidad in renglones:
+                pedidos[codigo] = pedidos.get(codigo, 0) + cantidad
+        if not pedidos:
+            return None, "No hay nada que devolver"
+        for codigo, cantidad in pedidos.items():
+            if cantidad <= 0:
+                return None, f"{codigo}: Cantidad inválida"
+            if cantidad > pendientes.get(codigo, 0):
+                return None, f"{codigo}: sólo se pueden devolver {pendientes.get(codigo, 0)}"
+
+        # Cada unidad se devuelve al precio del renglón en que se cobró
+        items = []
+        for codigo, cantidad in pedidos.items():
+            for item, disponibles in por_codigo[codigo]:
+                tomar = min(disponibles, cantidad)
+                if tomar > 0:
+                    items.append(ItemVenta(codigo, item.nombre, -tomar, item.precio_unitario,
+                                           -item.precio_unitario * tomar))
+                    cantidad -= tomar
+        subtotal = sum(item.subtotal for item in items)
+        # El IVA se devuelve con la tasa con que se cobró
+        tasa = original.iva / original.subtotal if original.subtotal else self.tasa_iva
+        devolucion = Venta(
+            folio=self.ventas.generar_folio(fecha),
+            cajero=cajero,
+            items=items,
+            subtotal=subtotal,
+            iva=subtotal * tasa,
+            total=subtotal * (1 + tasa),
+            metodo_pago=original.metodo_pago,
+            fecha=fecha
+        )
+        devolucion.referencia = folio
+        # Cantidades negativas: la misma transacción del cobro repone el stock
+        if not self.productos.confirmar_venta(devolucion, self.ventas):
+            return None, "No se pudo registrar la devolución"
+        return devolucion, None
+
+    # Reportes
+    def reporte(self, fecha_inicio: str, fecha_fin: str) -> dict:
+        """Totales del período (desde los acumulados diarios)"""
+        return self.ventas.obtener_reporte_ventas(fecha_inicio, fecha_fin)
+
+    def ventas_del_periodo(self, fecha_inicio: str, fecha_fin: str):
+        """Tickets del período en orden de fecha (vista perezosa)"""
+        return self.ventas.obtener_ventas_por_fecha(fecha_inicio, fecha_fin)
+
+    def mas_vendidos(self, limite: int = 20, dias: Optional[int] = None) -> List[tuple]:
+        return self.ventas.obtener_productos_mas_vendidos(limite, dias=dias)
+
+    def estado_inventario(self, umbral: int = 10) -> dict:
+        """Conteo, valor del inventario y productos con stock bajo"""
+        productos = self.productos.obtener_todos_productos()
+        return {
+            'total_productos': len(productos),
+            'valor': sum(p.precio * p.stock for p in productos),
+            'bajo_stock': self.productos.obtener_productos_bajo_stock(umbral)
+        }
@@ -0,0 +1,204 @@
+"""src/services/resumen_ventas.py
+
+Acumulados diarios de ventas: una fila por día × cajero × método de pago
+con el número de tickets, total, subtotal, IVA y renglones (items).
+
+- Las devoluciones (ventas con `referencia`) restan en total, subtotal e
+  IVA, pero se cuentan aparte: `ventas` e `items` son sólo cobros y
+  `devoluciones` / `devuelto` / `items_devueltos` el número, el importe
+  devuelto (positivo) y sus renglones.
+
+- Se actualizan con cada venta registrada, así que un reporte de semana o
+  mes suma a lo más unas decenas de filas en vez de recorrer los tickets.
+- Las filas son diccionarios planos, listos para persistirse junto con las
+  ventas (ver StorageBackend.guardar_resumenes).
+- Los días se guardan ordenados; un rango se resuelve con bisect.
+
+VendidosPorDia hace lo mismo para los productos más vendidos: totales por
+producto de todo el historial y filas por día × producto guardadas por mes,
+así un top de 1, 7 o 30 días sólo lee los acumulados de esos días.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.models.venta import Venta
+
+CAMPOS = ('ventas', 'devoluciones', 'total', 'devuelto', 'subtotal', 'iva', 'items',
+          'items_devueltos')
+
+
+class ResumenVentas:
+    """Filas de acumulados por (fecha, cajero, metodo_pago)."""
+
+    def __init__(self, filas: Iterable[dict] = ()):
+        self._por_dia: Dict[str, Dict[Tuple[str, str], dict]] = {}
+        self._dias: List[str] = []
+        self._ventas = 0
+        # Filas guardadas antes de contar las devoluciones aparte: hay que
+        # reconstruir (ahí una devolución contaba como venta y sus renglones
+        # como vendidos)
+        self.formato_anterior = False
+        for fila in filas:
+            fila = dict(fila)
+            if 'devoluciones' not in fila or 'items_devueltos' not in fila:
+                self.formato_anterior = True
+                fila.setdefault('devoluciones', 0)
+                fila.setdefault('devuelto', 0.0)
+                fila['items_devueltos'] = 0
+            self._del_dia(fila['fecha'])[(fila['cajero'], fila['metodo_pago'])] = fila
+            self._ventas += fila['ventas'] + fila['devoluciones']
+
+    @classmethod
+    def desde_ventas(cls, ventas: Iterable[Venta]) -> 'ResumenVentas':
+        resumen = cls()
+        for venta in ventas:
+            resumen.acumular(venta)
+        return resumen
+
+    def __len__(self) -> int:
+        """Tickets acumulados, devoluciones incluidas (para validar contra
+        el historial)."""
+        return self._ventas
+
+    def _del_dia(self, dia: str) -> Dict[Tuple[str, str], dict]:
+        filas = self._por_dia.get(dia)
+        if filas is None:
+            filas = self._por_dia[dia] = {}
+            if not self._dias or dia > self._dias[-1]:
+                self._dias.append(dia)
+            else:
+                insort(self._dias, dia)
+        return filas
+
+    def acumular(self, venta: Venta) -> dict:
+        """Suma la venta a su fila y regresa la fila modificada."""
+        dia = venta.fecha[:10]
+        filas = self._del_dia(dia)
+        llave = (venta.cajero, venta.metodo_pago)
+        fila = filas.get(llave)
+        if fila is None:
+            fila = filas[llave] = {
+                'fecha': dia, 'cajero': venta.cajero, 'metodo_pago': venta.metodo_pago,
+                'ventas': 0, 'devoluciones': 0, 'total': 0.0, 'devuelto': 0.0,
+                'subtotal': 0.0, 'iva': 0.0, 'items': 0, 'items_devueltos': 0
+            }
+        if venta.referencia:
+            fila['devoluciones'] += 1
+            fila['devuelto'] -= venta.total
+            fila['items_devueltos'] += venta.num_items
+        else:
+            fila['ventas'] += 1
+            fila['items'] += venta.num_items
+        fila['total'] += venta.total
+        fila['subtotal'] += venta.subtotal
+        fila['iva'] += venta.iva
+        self._ventas += 1
+        return fila
+
+    def filas(self, fecha_inicio: Optional[str] = None,
+              fecha_fin: Optional[str] = None) -> Iterator[dict]:
+        """Filas de los días en [fecha_inicio, fecha_fin] (AAAA-MM-DD), en orden."""
+        dias = self._dias
+        inicio = 0 if fecha_inicio is None else bisect_left(dias, fecha_inicio)
+        fin = len(dias) if fecha_fin is None else bisect_left(dias, fecha_fin + "~")
+        for dia in dias[inicio:fin]:
+            yield from self._por_dia[dia].values()
+
+    def reporte(self, fecha_inicio: str, fecha_fin: str) -> dict:
+        """Totales del período y desgloses por cajero y por método de pago."""
+        totales = dict.fromkeys(CAMPOS, 0)
+        por_cajero: Dict[str, float] = {}
+        por_metodo: Dict[str, float] = {}
+        for fila in self.filas(fecha_inicio, fecha_fin):
+            for campo in CAMPOS:
+                totales[campo] += fila[campo]
+            por_cajero[fila['cajero']] = por_cajero.get(fila['cajero'], 0) + fila['total']
+            por_metodo[fila['metodo_pago']] = por_metodo.get(fila['metodo_pago'], 0) + fila['total']
+        totales['por_cajero'] = por_cajero
+        totales['por_metodo'] = por_metodo
+        return totales
+
+
+class VendidosPorDia:
+    """Acumulados de productos vendidos ({'nombre', 'cantidad', 'total'}).
+
+    `totales` cubre todo el historial; los días se cargan por mes (ver
+    poner_mes). Cada fila cuenta sus renglones para validarla contra el
+    manifiesto de ventas (entrada['items']).
+    """
+
+    def __init__(self, totales: Iterable[dict] = ()):
+        self.totales: Dict[str, dict] = {f['codigo_barras']: dict(f) for f in totales}
+        self.renglones = sum(f['renglones'] for f in self.totales.values())
+        # mes (AAAA-MM) -> día -> código -> fila
+        self._meses: Dict[str, Dict[str, Dict[str, dict]]] = {}
+
+    @classmethod
+    def desde_ventas(cls, ventas: Iterable[Venta]) -> 'VendidosPorDia':
+        vendidos = cls()
+        for venta in ventas:
+            vendidos._meses.setdefault(venta.fecha[:7], {})
+            vendidos.acumular(venta)
+        return vendidos
+
+    @staticmethod
+    def renglones_de(filas: Iterable[dict]) -> int:
+        return sum(f['renglones'] for f in filas)
+
+    def tiene_mes(self, clave: str) -> bool:
+        return clave in self._meses
+
+    def meses(self) -> List[str]:
+        return sorted(self._meses)
+
+    def poner_mes(self, clave: str, filas: Iterable[dict]):
+        """Filas por día de un mes (como las regresa filas_mes)"""
+        dias: Dict[str, Dict[str, dict]] = {}
+        for fila in filas:
+            dias.setdefault(fila['fecha'], {})[fila['codigo_barras']] = dict(fila)
+        self._meses[clave] = dias
+
+    def acumular(self, venta: Venta) -> Tuple[List[dict], List[dict]]:
+        """Suma los renglones de la venta (su mes debe estar cargado) y
+        regresa las filas modificadas: (totales, del día)."""
+        dia = venta.fecha[:10]
+        del_dia = self._meses[dia[:7]].setdefault(dia, {})
+        totales, diarias = [], []
+        for item in venta.items:
+            for acumulado, extra, cambiadas in ((self.totales, {}, totales),
+                                                (del_dia, {'fecha': dia}, diarias)):
+                fila = acumulado.get(item.codigo_barras)
+                if fila is None:
+                    fila = acumulado[item.codigo_barras] = dict(
+                        extra, codigo_barras=item.codigo_barras, nombre=item.nombre,
+                        cantidad=0, total=0.0, renglones=0)
+                fila['cantidad'] += item.cantidad
+                fila['total'] += item.subtotal
+                fila['renglones'] += 1
+                cambiadas.append(fila)
+        self.renglones += venta.num_items
+        return totales, diarias
+
+    def filas_totales(self) -> List[dict]:
+        return list(self.totales.values())
+
+    def filas_mes(self, clave: str) -> List[dict]:
+        return [fila for dia in sorted(self._meses.get(clave, {}))
+                for fila in self._meses[clave][dia].values()]
+
+    def de_los_dias(self, dias: Iterable[str]) -> Dict[str, dict]:
+        """Suma por producto de los días dados (sus meses deben estar cargados)"""
+        suma: Dict[str, dict] = {}
+        for dia in dias:
+            for codigo, fila in self._meses.get(dia[:7], {}).get(dia, {}).items():
+                acumulado = suma.get(codigo)
+                if acumulado is None:
+                    suma[codigo] = {'nombre': fila['nombre'], 'cantidad': fila['cantidad'],
+                                    'total': fila['total']}
+                else:
+                    acumulado['cantidad'] += fila['cantidad']
+                    acumulado['total'] += fila['total']
+        return suma
@@ -0,0 +1,19 @@
+"""
+Backends de almacenamiento (JSON o SQLite)
+SQLiteBackend (y sqlite3) se importa al pedirlo: con el backend JSON no
+hace falta.
+"""
+from .base import ConsultasIndexadas, StorageBackend
+from .escritor import EscritorSegundoPlano
+from .json_backend import JsonBackend
+from .factory import crear_backend
+
+__all__ = ['StorageBackend', 'ConsultasIndexadas', 'EscritorSegundoPlano', 'JsonBackend', 'SQLiteBackend',
+           'crear_backend']
+
+
+def __getattr__(nombre):
+    if nombre == 'SQLiteBackend':
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
@@ -0,0 +1,141 @@
+"""
+Interfaz común de los backends de almacenamiento
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional
+from src.models.producto import Producto
+from src.models.usuario import Usuario
+from src.models.venta import Venta
+
+
+def particion_de(fecha: str) -> str:
+    """Partición (mes, AAAA-MM) a la que pertenece una fecha ISO"""
+    return fecha[:7]
+
+
+class StorageBackend(ABC):
+    """Persistencia de productos, ventas y usuarios.
+
+    Los controladores mantienen los objetos en memoria y delegan aquí la
+    lectura inicial y las escrituras. `cambiados`/`eliminados` indican qué
+    registros tocó la operación para que los backends que lo soporten
+    escriban sólo esas filas; None significa "todo".
+
+    Los backends que además implementan ConsultasIndexadas (indexado =
+    True) resuelven las consultas con índices propios; los demás las
+    resuelve el controlador sobre sus objetos en memoria.
+    """
+
+    indexado = False
+
+    # Productos
+    @abstractmethod
+    def cargar_productos(self) -> List[Producto]:
+        """Lee todo el catálogo"""
+
+    @abstractmethod
+    def guardar_productos(self, productos: List[Producto],
+                          cambiados: Optional[Iterable[Producto]] = None,
+                          eliminados: Iterable[str] = (), esperar: bool = False):
+        """Persiste el catálogo; lanza excepción si falla.
+
+        Un backend que difiere escrituras puede regresar antes de que el
+        catálogo quede en disco; con esperar=True no regresa hasta entonces
+        (y un error al escribirlo también lanza excepción)."""
+
+    # Ventas (particionadas por mes, ver particion_de)
+    @abstractmethod
+    def cargar_ventas(self) -> Iterator[Venta]:
+        """Lee el historial completo como flujo, partición por partición"""
+
+    @abstractmethod
+    def particiones_ventas(self) -> Dict[str, dict]:
+        """Manifiesto de particiones: 'AAAA-MM' -> {'ventas', 'items',
+        'desde', 'hasta'} (fechas ISO de la primera y la última venta).
+        Se consulta seguido: debe regresar la copia en memoria."""
+
+    @abstractmethod
+    def cargar_ventas_particion(self, clave: str) -> Iterator[Venta]:
+        """Lee las ventas de una partición, en orden de registro"""
+
+    @abstractmethod
+    def agregar_venta(self, venta: Venta):
+        """Persiste una venta nueva; lanza excepción si falla"""
+
+    @abstractmethod
+    def reescribir_ventas(self, ventas: List[Venta]):
+        """Reescribe el historial completo (y el manifiesto)"""
+
+    # Acumulados diarios de ventas (ver src/services/resumen_ventas.py)
+    @abstractmethod
+    def cargar_resumenes(self) -> List[dict]:
+        """Lee las filas de acumulados (vacío si nunca se guardaron)"""
+
+    @abstractmethod
+    def guardar_resumenes(self, filas: List[dict],
+                          cambiados: Optional[Iterable[dict]] = None):
+        """Persiste los acumulados; lanza excepción si falla"""
+
+    # Acumulados de productos vendidos (ver VendidosPorDia)
+    @abstractmethod
+    def cargar_vendidos_totales(self) -> List[dict]:
+        """Filas por producto de todo el historial (vacío si nunca se guardaron)"""
+
+    @abstractmethod
+    def guardar_vendidos_totales(self, filas: List[dict],
+                                 cambiados: Optional[Iterable[dict]] = None):
+        """Persiste los totales por producto; lanza excepción si falla"""
+
+    @abstractmethod
+    def cargar_vendidos_mes(self, clave: str) -> List[dict]:
+        """Filas por día × producto del mes AAAA-MM (vacío si no hay)"""
+
+    @abstractmethod
+    def guardar_vendidos_mes(self, clave: str, filas: List[dict],
+                             cambiados: Optional[Iterable[dict]] = None):
+        """Persiste las filas por día de un mes; lanza excepción si falla"""
+
+    # Usuarios
+    @abstractmethod
+    def cargar_usuarios(self) -> List[Usuario]:
+        """Lee todos los usuarios"""
+
+    @abstractmethod
+    def guardar_usuarios(self, usuarios: List[Usuario],
+                         cambiados: Optional[Iterable[Usuario]] = None):
+        """Persiste los usuarios; lanza excepción si falla"""
+
+    def confirmar(self):
+        """Punto de confirmación (p. ej. al cobrar): lo que el backend tenga
+        diferido debe escribirse ya"""
+
+    def cerrar(self):
+        """Libera recursos (conexiones, archivos)"""
+
+
+class ConsultasIndexadas(ABC):
+    """Consultas que un backend resuelve con índices propios.
+
+    Se mezcla con StorageBackend (class X(ConsultasIndexadas,
+    StorageBackend)). Regresan llaves (código o folio) que el controlador
+    traduce a sus objetos en memoria; los controladores sólo las llaman si
+    `backend.indexado`.
+    """
+
+    indexado = True
+
+    @abstractmethod
+    def consultar_productos_por_categoria(self, categoria: str) -> List[str]:
+        """Códigos de los productos de la categoría"""
+
+    @abstractmethod
+    def consultar_productos_bajo_stock(self, umbral: int) -> List[str]:
+        """Códigos de los productos con stock <= umbral"""
+
+    @abstractmethod
+    def consultar_categorias(self) -> List[str]:
+        """Categorías distintas, ordenadas"""
+
+    @abstractmethod
+    def consultar_ventas_cajero(self, cajero: str) -> List[str]:
+        """Folios de las ventas del cajero, en orden de fecha"""
@@ -0,0 +1,183 @@
+"""
+Escritor en segundo plano para los archivos JSON
+Un solo hilo escribe los archivos; quien guarda sólo marca el archivo como
+sucio y regresa de inmediato.
+
+- Marcas repetidas de un archivo que aún no se escribe se combinan: sólo se
+  escribe el contenido más reciente.
+- Cada archivo se escribe a lo más una vez por `intervalo` segundos, salvo
+  en los puntos de confirmación (`confirmar`, p. ej. al cobrar) y al cerrar.
+- `confirmar(esperar=True)` regresa cuando los archivos quedaron en disco y
+  lanza la excepción de la escritura si alguna falló.
+- Escritura vía archivo temporal + fsync + rename: nunca queda a medias.
+- `estadisticas()` da escrituras, bytes y tiempo por archivo.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+
+def escribir_json_atomico(path: str, data) -> int:
+    """Escribe vía temporal + fsync + rename; regresa los bytes escritos"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+        escritos = os.fstat(f.fileno()).st_size
+    os.replace(tmp_path, path)
+    return escritos
+
+
+class EscritorSegundoPlano:
+    """Hilo escritor con marcas de archivo sucio y escrituras combinadas.
+
+    programar(path, obtener_datos, despues): obtener_datos() se llama ya en
+    el hilo escritor y regresa lo que se serializa a JSON; despues(datos),
+    si se da, corre en el mismo hilo tras escribir (p. ej. cachés derivadas).
+
+    El resultado de cada escritura queda en `eventos` como (path, error),
+    con error None si salió bien; la interfaz los consume con after() (Tk
+    no debe tocarse desde otro hilo).
+    """
+
+    def __init__(self, intervalo: float = 1.0):
+        self.intervalo = intervalo
+        self._sucios: Dict[str, Tuple[Callable[[], object], Optional[Callable]]] = {}
+        self._urgentes: Set[str] = set()
+        self._en_curso: Set[str] = set()
+        # Error de la última escritura de cada archivo (sólo si falló)
+        self._errores: Dict[str, Exception] = {}
+        self._ultima_escritura: Dict[str, float] = {}
+        self._estadisticas: Dict[str, dict] = {}
+        self._cerrando = False
+        self._cond = threading.Condition()
+        self.eventos: "queue.Queue[tuple]" = queue.Queue()
+        self._hilo = threading.Thread(target=self._trabajar, name="escritor-json",
+                                      daemon=True)
+        self._hilo.start()
+
+    def programar(self, path: str, obtener_datos: Callable[[], object],
+                  despues: Optional[Callable[[object], None]] = None):
+        """Marca path como sucio (reemplaza el contenido pendiente)"""
+        with self._cond:
+            if path in self._sucios:
+                self._contador(path)['combinadas'] += 1
+            self._sucios[path] = (obtener_datos, despues)
+            self._cond.notify_all()
+
+    def confirmar(self, paths: Optional[Iterable[str]] = None, esperar: bool = False):
+        """Punto de confirmación: escribe ya lo sucio sin esperar el intervalo.
+
+        esperar=True bloquea hasta que esos archivos queden en disco y lanza
+        la excepción de la escritura si alguno no pudo escribirse.
+        """
+        with self._cond:
+            paths = set(self._sucios if paths is None else paths)
+            self._urgentes |= paths & set(self._sucios)
+            self._cond.notify_all()
+            if not esperar:
+                return
+            pendientes = paths & (set(self._sucios) | self._en_curso)
+            for path in pendientes:
+                self._errores.pop(path, None)
+            # Lo que se espera se escribe antes que el resto de lo urgente
+            self._sucios = {**{p: self._sucios[p] for p in pendientes if p in self._sucios},
+                            **self._sucios}
+            while self._hilo.is_alive() and pendientes & (set(self._sucios) | self._en_curso):
+                self._cond.wait()
+            if pendientes & set(self._sucios):
+                raise RuntimeError("El escritor se detuvo con archivos sin escribir")
+            for path in sorted(pendientes):
+                if path in self._errores:
+                    raise self._errores[path]
+
+    def pendientes(self) -> int:
+        with self._cond:
+            return len(self._sucios) + len(self._en_curso)
+
+    def estadisticas(self) -> dict:
+        """Totales y desglose por archivo: escrituras, bytes, segundos,
+        marcas combinadas y duración de la última escritura"""
+        with self._cond:
+            por_archivo = {path: dict(datos) for path, datos in self._estadisticas.items()}
+        totales = {campo: sum(d[campo] for d in por_archivo.values())
+                   for campo in ('escrituras', 'bytes', 'segundos', 'combinadas')}
+        totales['por_archivo'] = por_archivo
+        return totales
+
+    def _contador(self, path: str) -> dict:
+        datos = self._estadisticas.get(path)
+        if datos is None:
+            datos = self._estadisticas[path] = {
+                'escrituras': 0, 'bytes': 0, 'segundos': 0.0,
+                'combinadas': 0, 'ultima_ms': 0.0
+            }
+        return datos
+
+    def _siguiente(self):
+        """Espera el próximo archivo que toca escribir; None al cerrar"""
+        with self._cond:
+            while True:
+                ahora = time.monotonic()
+                espera = None
+                for path in self._sucios:
+                    vence = self._ultima_escritura.get(path, float('-inf')) + self.intervalo
+                    if path in self._urgentes or self._cerrando or ahora >= vence:
+                        self._urgentes.discard(path)
+                        self._en_curso.add(path)
+                        return path, self._sucios.pop(path)
+                    espera = vence - ahora if espera is None else min(espera, vence - ahora)
+                if self._cerrando:
+                    return None
+                self._cond.wait(espera)
+
+    def _trabajar(self):
+        while True:
+            siguiente = self._siguiente()
+            if siguiente is None:
+                return
+            path, (obtener_datos, despues) = siguiente
+            inicio = time.perf_counter()
+            error = None
+            escritos = 0
+            try:
+                datos = obtener_datos()
+                escritos = escribir_json_atomico(path, datos)
+                if despues is not None:
+                    despues(datos)
+            except Exception as e:
+                print(f"Error al guardar {path}: {e}")
+                error = e
+            duracion = time.perf_counter() - inicio
+            with self._cond:
+                self._en_curso.discard(path)
+                self._ultima_escritura[path] = time.monotonic()
+                if error is not None:
+                    self._errores[path] = error
+                else:
+                    self._errores.pop(path, None)
+                    datos = self._contador(path)
+                    datos['escrituras'] += 1
+                    datos['bytes'] += escritos
+                    datos['segundos'] += duracion
+                    datos['ultima_ms'] = duracion * 1000
+                self._cond.notify_all()
+            self.eventos.put((path, error))
+
+    def vaciar(self):
+        """Bloquea hasta que todo lo marcado quede escrito"""
+        self.confirmar(esperar=True)
+
+    def cerrar(self):
+        """Escribe lo pendiente y termina el hilo (llamar al salir)"""
+        with self._cond:
+            self._cerrando = True
+            self._cond.notify_all()
+        if self._hilo.is_alive():
+            self._hilo.join()
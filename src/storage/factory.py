@@ -0,0 +1,30 @@
+"""
+Selección del backend según config.json
+"""
+from typing import Optional
+from src.storage.base import StorageBackend
+from src.storage.escritor import EscritorSegundoPlano
+from src.storage.json_backend import JsonBackend
+
+
+def crear_backend(config: dict,
+                  escritor: Optional[EscritorSegundoPlano] = None) -> StorageBackend:
+    """Crea el backend indicado en config['storage']['backend'] ('json' o 'sqlite')
+
+    escritor: hilo para las escrituras de los archivos JSON (sólo backend json;
+    SQLite escribe por filas y no lo necesita).
+    """
+    storage = config.get('storage', {})
+    tipo = storage.get('backend', 'json')
+    # Ventas de ejemplo para una instalación nueva (las ventas no van en git)
+    semilla = storage.get('semilla_ventas', 'src/data/ventas_demo.jsonl')
+    if tipo == 'json':
+        return JsonBackend(escritor=escritor,
+                           cache_catalogo=storage.get('cache_catalogo', True),
+                           semilla_ventas=semilla)
+    json_backend = JsonBackend(semilla_ventas=semilla)
+    if tipo == 'sqlite':
+        from src.storage.sqlite_backend import SQLiteBackend
+        return SQLiteBackend(storage.get('sqlite_path', 'src/data/tiendita.db'),
+                             importar_desde=json_backend)
+    raise ValueError(f"Backend de almacenamiento desconocido: {tipo}")
@@ -0,0 +1,370 @@
+"""
+Backend JSON: un archivo por colección (comportamiento original)
+El catálogo y los usuarios se reescriben completos; las ventas van a
+bitácoras append-only (JSONL, una venta por línea), una por mes:
+
+    src/data/ventas/2025-12.jsonl
+    src/data/ventas/manifiesto.json   (conteos y rango de fechas por mes)
+
+El manifiesto guarda además el tamaño de cada archivo: si no cuadra (corte
+entre la venta y el manifiesto, archivo copiado a mano) esa partición se
+vuelve a contar al arrancar. La bitácora única anterior (ventas.jsonl) y el
+historial más viejo (ventas.json) se reparten en meses la primera vez.
+
+Las particiones y los acumulados son datos de la tienda y no van en git;
+una instalación nueva arranca con las ventas de la semilla (ver
+semilla_ventas), que se copia y no se modifica.
+"""
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from src.models.producto import Producto
+from src.models.usuario import Usuario
+from src.models.venta import Venta
+from src.storage.base import StorageBackend, particion_de
+from src.storage.escritor import EscritorSegundoPlano, escribir_json_atomico
+from src.storage.snapshot import SnapshotCatalogo, leer_json_con_llave
+
+
+def serializar_venta(venta: Venta) -> str:
+    """Serializa una venta como una línea de la bitácora"""
+    return json.dumps(venta.to_dict(), ensure_ascii=False, separators=(',', ':')) + "\n"
+
+
+# Límites del arreglo de renglones en una línea escrita por serializar_venta
+# (to_dict pone "items" justo antes de "subtotal"). Dentro de un texto JSON
+# las comillas van escapadas, así que estas marcas sólo aparecen como llaves.
+_INICIO_ITEMS = '"items":['
+_FIN_ITEMS = '],"subtotal":'
+
+
+def _leer_linea(linea: str) -> dict:
+    """Decodifica la cabecera de la venta; los renglones quedan como texto
+    JSON para que Venta los convierta sólo si se usan. Si la línea no tiene
+    la forma de serializar_venta se decodifica completa."""
+    inicio = linea.find(_INICIO_ITEMS)
+    fin = linea.find(_FIN_ITEMS, inicio) if inicio >= 0 else -1
+    if fin < 0:
+        return json.loads(linea)
+    datos = json.loads(linea[:inicio] + linea[fin + 2:])
+    datos["items"] = linea[inicio + len(_INICIO_ITEMS) - 1:fin + 1]
+    return datos
+
+
+def leer_bitacora(lineas: Iterable[str]) -> Iterator[Venta]:
+    """Lee ventas de una bitácora JSONL como flujo.
+
+    Las líneas vacías se ignoran; una línea corrupta (p. ej. una escritura
+    interrumpida al final del archivo) se reporta y se omite.
+    """
+    for numero, linea in enumerate(lineas, 1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            yield Venta.from_dict(_leer_linea(linea))
+        except (ValueError, KeyError) as e:
+            print(f"Línea {numero} de ventas inválida, se omite: {e}")
+
+
+def escribir_bitacora(path: str, ventas: Iterable[Venta]):
+    """Escribe la bitácora completa vía archivo temporal + fsync + rename"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for venta in ventas:
+            f.write(serializar_venta(venta))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _termina_en_salto(path: str) -> bool:
+    """Indica si el archivo está vacío o su último byte es un salto de línea"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _leer_json(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _sumar_venta(entrada: dict, venta: Venta):
+    """Suma una venta a la entrada de su partición en el manifiesto"""
+    entrada['ventas'] += 1
+    entrada['items'] += venta.num_items
+    if entrada['desde'] is None or venta.fecha < entrada['desde']:
+        entrada['desde'] = venta.fecha
+    if entrada['hasta'] is None or venta.fecha > entrada['hasta']:
+        entrada['hasta'] = venta.fecha
+
+
+class JsonBackend(StorageBackend):
+    def __init__(self, productos_path: str = "src/data/productos.json",
+                 ventas_path: str = "src/data/ventas.jsonl",
+                 usuarios_path: str = "src/data/usuarios.json",
+                 resumen_path: Optional[str] = None,
+                 escritor: Optional[EscritorSegundoPlano] = None,
+                 cache_catalogo: bool = False,
+                 particiones_path: Optional[str] = None,
+                 semilla_ventas: Optional[str] = None):
+        """escritor: si se da, guardar_* sólo marca el archivo como sucio y
+        el escritor lo escribe en su hilo (ver src/storage/escritor.py).
+        cache_catalogo: mantener la caché binaria del catálogo
+        (ver src/storage/snapshot.py).
+        ventas_path: bitácora única anterior, sólo para migrarla; las
+        particiones van en particiones_path (por omisión la carpeta
+        ventas/ junto a ella).
+        semilla_ventas: bitácora JSONL con la que se llenan las particiones
+        si no existen ni hay historial anterior que migrar."""
+        self.productos_path = productos_path
+        self.ventas_path = ventas_path
+        self.usuarios_path = usuarios_path
+        # Por omisión los acumulados y las particiones viven junto a la bitácora
+        self.resumen_path = resumen_path or os.path.join(
+            os.path.dirname(ventas_path), "ventas_resumen.json")
+        # Productos vendidos: totales junto a los acumulados y los días de
+        # cada mes junto a su partición (AAAA-MM.vendidos.json)
+        self.vendidos_path = os.path.join(
+            os.path.dirname(self.resumen_path), "ventas_vendidos.json")
+        self.particiones_path = particiones_path or os.path.join(
+            os.path.dirname(ventas_path), "ventas")
+        self.manifiesto_path = os.path.join(self.particiones_path, "manifiesto.json")
+        self.semilla_ventas = semilla_ventas
+        self.escritor = escritor
+        self.snapshot = SnapshotCatalogo(productos_path) if cache_catalogo else None
+        self._manifiesto: Optional[Dict[str, dict]] = None
+        # Particiones cuyo final ya se revisó en esta sesión (ver agregar_venta)
+        self._revisadas: Set[str] = set()
+    
+    def _guardar_json(self, path: str, obtener_datos, despues=None, esperar: bool = False):
+        if self.escritor is None:
+            datos = obtener_datos()
+            escribir_json_atomico(path, datos)
+            if despues is not None:
+                despues(datos)
+        else:
+            self.escritor.programar(path, obtener_datos, despues)
+            if esperar:
+                self.escritor.confirmar([path], esperar=True)
+    
+    def confirmar(self):
+        if self.escritor is not None:
+            self.escritor.confirmar()
+    
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.vaciar()
+    
+    @property
+    def legacy_ventas_path(self) -> str:
+        """Ruta del historial anterior (un solo arreglo JSON)"""
+        base, _ = os.path.splitext(self.ventas_path)
+        return base + ".json"
+    
+    # Productos
+    def cargar_productos(self) -> List[Producto]:
+        if not os.path.exists(self.productos_path):
+            return []
+        if self.snapshot is None:
+            return [Producto.from_dict(p) for p in _leer_json(self.productos_path)]
+        
+        productos = self.snapshot.cargar()
+        if productos is not None:
+            return productos
+        # Caché ausente o vencida: parsear el JSON y rehacerla sin esperar
+        registros, llave = leer_json_con_llave(self.productos_path)
+        productos = [Producto.from_dict(p) for p in registros]
+        self.snapshot.reconstruir_en_segundo_plano(registros, llave)
+        return productos
+    
+    def guardar_productos(self, productos, cambiados=None, eliminados=(), esperar=False):
+        # JSON no permite escrituras parciales: siempre se reescribe todo.
+        # Los dicts se arman aquí: el escritor no debe leer productos que la
+        # interfaz sigue modificando (stock a medio cobrar, ediciones)
+        datos = [p.to_dict() for p in productos]
+        self._guardar_json(self.productos_path, lambda: datos,
+                           self.snapshot.guardar if self.snapshot is not None else None,
+                           esperar)
+    
+    # Ventas
+    def ruta_particion(self, clave: str) -> str:
+        return os.path.join(self.particiones_path, f"{clave}.jsonl")
+    
+    def particiones_ventas(self) -> Dict[str, dict]:
+        if self._manifiesto is None:
+            self._migrar_bitacora()
+            self._manifiesto = self._leer_manifiesto()
+        return self._manifiesto
+    
+    def cargar_ventas(self) -> Iterator[Venta]:
+        for clave in sorted(self.particiones_ventas()):
+            yield from self.cargar_ventas_particion(clave)
+    
+    def cargar_ventas_particion(self, clave: str) -> Iterator[Venta]:
+        path = self.ruta_particion(clave)
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            yield from leer_bitacora(f)
+    
+    def _leer_manifiesto(self) -> Dict[str, dict]:
+        """Manifiesto guardado, recontando las particiones que no cuadran"""
+        guardado = {}
+        if os.path.exists(self.manifiesto_path):
+            try:
+                guardado = _leer_json(self.manifiesto_path).get('particiones', {})
+            except (ValueError, AttributeError) as e:
+                print(f"Manifiesto de ventas inválido, se reconstruye: {e}")
+        manifiesto = {}
+        if os.path.isdir(self.particiones_path):
+            for nombre in sorted(os.listdir(self.particiones_path)):
+                if not nombre.endswith(".jsonl"):
+                    continue
+                clave = nombre[:-len(".jsonl")]
+                entrada = guardado.get(clave)
+                if (entrada is None or
+                        entrada.get('bytes') != os.path.getsize(self.ruta_particion(clave))):
+                    entrada = self._contar_particion(clave)
+                manifiesto[clave] = entrada
+        if manifiesto != guardado:
+            self._guardar_manifiesto(manifiesto)
+        return manifiesto
+    
+    def _contar_particion(self, clave: str) -> dict:
+        entrada = {'ventas': 0, 'items': 0, 'desde': None, 'hasta': None, 'bytes': 0}
+        path = self.ruta_particion(clave)
+        with open(path, 'r', encoding='utf-8') as f:
+            for venta in leer_bitacora(f):
+                _sumar_venta(entrada, venta)
+            entrada['bytes'] = os.fstat(f.fileno()).st_size
+        return entrada
+    
+    def _guardar_manifiesto(self, manifiesto: Dict[str, dict]):
+        datos = {'version': 1,
+                 'particiones': {clave: dict(e) for clave, e in sorted(manifiesto.items())}}
+        self._guardar_json(self.manifiesto_path, lambda: datos)
+    
+    def _migrar_bitacora(self):
+        """Reparte en meses la bitácora única (o el ventas.json anterior) la
+        primera vez; el original se borra tras verificar el conteo"""
+        if os.path.isdir(self.particiones_path):
+            return
+        if os.path.exists(self.ventas_path):
+            origen = self.ventas_path
+            with open(origen, 'r', encoding='utf-8') as f:
+                ventas = list(leer_bitacora(f))
+        elif (self.legacy_ventas_path != self.ventas_path
+                and os.path.exists(self.legacy_ventas_path)):
+            origen = self.legacy_ventas_path
+            ventas = [Venta.from_dict(v) for v in _leer_json(origen)]
+        elif self.semilla_ventas and os.path.exists(self.semilla_ventas):
+            # Instalación nueva: la semilla se copia, no se borra
+            with open(self.semilla_ventas, 'r', encoding='utf-8') as f:
+                self.reescribir_ventas(list(leer_bitacora(f)))
+            self._manifiesto = None
+            return
+        else:
+            return
+        self.reescribir_ventas(ventas)
+        escritas = sum(e['ventas'] for e in self._manifiesto.values())
+        if escritas == len(ventas):
+            os.remove(origen)
+        else:
+            print(f"Migración de ventas: se esperaban {len(ventas)} y se escribieron "
+                  f"{escritas}; se conserva {origen}")
+        self._manifiesto = None
+    
+    def agregar_venta(self, venta: Venta):
+        manifiesto = self.particiones_ventas()
+        clave = particion_de(venta.fecha)
+        path = self.ruta_particion(clave)
+        os.makedirs(self.particiones_path, exist_ok=True)
+        # No pegar la venta a una línea truncada por un corte previo
+        incompleta = (clave not in self._revisadas and os.path.exists(path)
+                      and not _termina_en_salto(path))
+        with open(path, 'a', encoding='utf-8') as f:
+            if incompleta:
+                f.write("\n")
+            f.write(serializar_venta(venta))
+            f.flush()
+            os.fsync(f.fileno())
+            tamano = os.fstat(f.fileno()).st_size
+        self._revisadas.add(clave)
+        entrada = manifiesto.get(clave)
+        if entrada is None:
+            entrada = manifiesto[clave] = {'ventas': 0, 'items': 0, 'desde': None,
+                                           'hasta': None, 'bytes': 0}
+        _sumar_venta(entrada, venta)
+        entrada['bytes'] = tamano
+        self._guardar_manifiesto(manifiesto)
+    
+    def reescribir_ventas(self, ventas):
+        por_particion: Dict[str, List[Venta]] = {}
+        for venta in ventas:
+            por_particion.setdefault(particion_de(venta.fecha), []).append(venta)
+        manifiesto = {}
+        for clave, grupo in sorted(por_particion.items()):
+            path = self.ruta_particion(clave)
+            escribir_bitacora(path, grupo)
+            entrada = manifiesto[clave] = {'ventas': 0, 'items': 0, 'desde': None,
+                                           'hasta': None, 'bytes': os.path.getsize(path)}
+            for venta in grupo:
+                _sumar_venta(entrada, venta)
+        # Meses que quedaron vacíos
+        if os.path.isdir(self.particiones_path):
+            for nombre in os.listdir(self.particiones_path):
+                for sufijo in (".jsonl", ".vendidos.json"):
+                    if nombre.endswith(sufijo) and nombre[:-len(sufijo)] not in manifiesto:
+                        os.remove(os.path.join(self.particiones_path, nombre))
+        self._manifiesto = manifiesto
+        self._revisadas = set(manifiesto)
+        self._guardar_manifiesto(manifiesto)
+    
+    # Acumulados diarios
+    def cargar_resumenes(self) -> List[dict]:
+        if not os.path.exists(self.resumen_path):
+            return []
+        return _leer_json(self.resumen_path)
+    
+    def guardar_resumenes(self, filas, cambiados=None):
+        filas = [dict(f) for f in filas]
+        self._guardar_json(self.resumen_path, lambda: filas)
+    
+    # Acumulados de productos vendidos
+    def ruta_vendidos_mes(self, clave: str) -> str:
+        return os.path.join(self.particiones_path, f"{clave}.vendidos.json")
+    
+    def cargar_vendidos_totales(self) -> List[dict]:
+        if not os.path.exists(self.vendidos_path):
+            return []
+        return _leer_json(self.vendidos_path)
+    
+    def guardar_vendidos_totales(self, filas, cambiados=None):
+        filas = [dict(f) for f in filas]
+        self._guardar_json(self.vendidos_path, lambda: filas)
+    
+    def cargar_vendidos_mes(self, clave: str) -> List[dict]:
+        path = self.ruta_vendidos_mes(clave)
+        if not os.path.exists(path):
+            return []
+        return _leer_json(path)
+    
+    def guardar_vendidos_mes(self, clave, filas, cambiados=None):
+        filas = [dict(f) for f in filas]
+        self._guardar_json(self.ruta_vendidos_mes(clave), lambda: filas)
+    
+    # Usuarios
+    def cargar_usuarios(self) -> List[Usuario]:
+        if not os.path.exists(self.usuarios_path):
+            return []
+        return [Usuario.from_dict(u) for u in _leer_json(self.usuarios_path)]
+    
+    def guardar_usuarios(self, usuarios, cambiados=None):
+        datos = [u.to_dict() for u in usuarios]
+        self._guardar_json(self.usuarios_path, lambda: datos)
@@ -0,0 +1,127 @@
+"""
+Caché binaria del catálogo para arrancar rápido
+productos.json se guarda además como columnas en formato marshal, con la
+llave del JSON del que salió (mtime, tamaño y hash) en un encabezado corto.
+Al arrancar, si la llave coincide se carga la caché en vez de parsear el
+JSON.
+
+- mtime_ns + tamaño iguales: válida sin leer el JSON.
+- Sólo cambió el mtime (checkout, copia de respaldo): se compara el hash.
+- Cualquier otro caso: inválida; se carga el JSON y la caché se rehace en
+  un hilo.
+Los productos se crean con el recolector de basura pausado: crear cientos
+de miles de objetos lo dispararía en vano.
+"""
+import gc
+import hashlib
+import json
+import marshal
+import os
+import struct
+import threading
+from datetime import datetime
+from typing import List, Optional, Tuple
+from src.models.producto import Producto
+
+VERSION = 1
+CAMPOS = ("codigo_barras", "nombre", "precio", "stock", "categoria", "proveedor",
+          "precio_compra", "unidad", "fecha_creacion", "fecha_actualizacion")
+# Valores por omisión de Producto.from_dict para registros incompletos
+OMISION = {"proveedor": "", "precio_compra": 0.0, "unidad": "pz"}
+
+# Largo del encabezado, antes de él
+PREFIJO = struct.Struct('<I')
+
+# (mtime_ns, tamaño, hash) del JSON
+Llave = Tuple[int, int, str]
+
+
+def _hash(datos: bytes) -> str:
+    return hashlib.blake2b(datos, digest_size=16).hexdigest()
+
+
+def _hash_archivo(path: str) -> str:
+    with open(path, 'rb') as f:
+        return _hash(f.read())
+
+
+def leer_json_con_llave(path: str) -> Tuple[list, Llave]:
+    """Lee el JSON y calcula su llave sobre los mismos bytes leídos"""
+    with open(path, 'rb') as f:
+        estado = os.fstat(f.fileno())
+        datos = f.read()
+    return json.loads(datos), (estado.st_mtime_ns, estado.st_size, _hash(datos))
+
+
+class SnapshotCatalogo:
+    def __init__(self, json_path: str, cache_path: Optional[str] = None):
+        self.json_path = json_path
+        self.cache_path = cache_path or json_path + ".cache"
+        self._hilo: Optional[threading.Thread] = None
+
+    def cargar(self) -> Optional[List[Producto]]:
+        """Productos de la caché si corresponde al JSON actual; si no, None"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                largo, = PREFIJO.unpack(f.read(PREFIJO.size))
+                version, mtime_ns, tamano, hash_json = marshal.loads(f.read(largo))
+                if version != VERSION:
+                    return None
+                estado = os.stat(self.json_path)
+                if estado.st_size != tamano:
+                    return None
+                if estado.st_mtime_ns != mtime_ns and _hash_archivo(self.json_path) != hash_json:
+                    return None
+                # marshal.loads sobre bytes: marshal.load(f) lee de a poco
+                columnas = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError, struct.error):
+            return None
+
+        pausar = gc.isenabled()
+        if pausar:
+            gc.disable()
+        try:
+            # Las columnas siguen el orden de los parámetros de Producto
+            productos = [Producto(*fila) for fila in zip(*columnas)]
+        finally:
+            if pausar:
+                gc.enable()
+        return productos
+
+    def guardar(self, registros: List[dict], llave: Optional[Llave] = None):
+        """Escribe la caché con los mismos dicts que contiene el JSON.
+
+        llave: la del JSON del que salieron los registros; si se omite se
+        toma la del archivo actual (llamar justo después de escribirlo).
+        """
+        if llave is None:
+            estado = os.stat(self.json_path)
+            llave = (estado.st_mtime_ns, estado.st_size, _hash_archivo(self.json_path))
+        ahora = datetime.now().isoformat()
+        omision = dict(OMISION, fecha_creacion=ahora, fecha_actualizacion=ahora)
+        columnas = tuple([r.get(c, omision[c]) for r in registros] if c in omision
+                         else [r[c] for r in registros]
+                         for c in CAMPOS)
+        # Temporal por hilo: el escritor y una reconstrucción pueden coincidir
+        tmp_path = f"{self.cache_path}.{threading.get_ident()}.tmp"
+        encabezado = marshal.dumps((VERSION,) + tuple(llave))
+        with open(tmp_path, 'wb') as f:
+            f.write(PREFIJO.pack(len(encabezado)))
+            f.write(encabezado)
+            f.write(marshal.dumps(columnas))
+        os.replace(tmp_path, self.cache_path)
+
+    def reconstruir_en_segundo_plano(self, registros: List[dict], llave: Llave):
+        """Rehace la caché en un hilo (al arrancar con la caché vencida)"""
+        def trabajar():
+            try:
+                self.guardar(registros, llave)
+            except Exception as e:
+                print(f"Error al guardar caché del catálogo: {e}")
+        self._hilo = threading.Thread(target=trabajar, name="snapshot-catalogo", daemon=True)
+        self._hilo.start()
+
+    def esperar(self):
+        """Espera a que termine una reconstrucción en curso"""
+        if self._hilo is not None:
+            self._hilo.join()
@@ -0,0 +1,402 @@
+"""
+Backend SQLite (sqlite3 de la biblioteca estándar, modo WAL)
+Cada mutación toca sólo las filas afectadas y las consultas usan índices.
+"""
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional
+from src.models.producto import Producto
+from src.models.usuario import Usuario
+from src.models.venta import Venta, ItemVenta
+from src.storage.base import ConsultasIndexadas, StorageBackend, particion_de
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS productos (
+    codigo_barras TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    precio REAL NOT NULL,
+    stock INTEGER NOT NULL,
+    categoria TEXT NOT NULL,
+    proveedor TEXT NOT NULL DEFAULT '',
+    precio_compra REAL NOT NULL DEFAULT 0,
+    unidad TEXT NOT NULL DEFAULT 'pz',
+    fecha_creacion TEXT,
+    fecha_actualizacion TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_productos_categoria ON productos(categoria);
+CREATE INDEX IF NOT EXISTS idx_productos_stock ON productos(stock);
+
+CREATE TABLE IF NOT EXISTS ventas (
+    folio TEXT PRIMARY KEY,
+    cajero TEXT NOT NULL,
+    subtotal REAL NOT NULL,
+    iva REAL NOT NULL,
+    total REAL NOT NULL,
+    metodo_pago TEXT NOT NULL,
+    fecha TEXT NOT NULL,
+    cliente_rfc TEXT,
+    facturada INTEGER NOT NULL DEFAULT 0,
+    referencia TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_ventas_fecha ON ventas(fecha);
+CREATE INDEX IF NOT EXISTS idx_ventas_cajero ON ventas(cajero);
+
+CREATE TABLE IF NOT EXISTS venta_items (
+    folio TEXT NOT NULL REFERENCES ventas(folio),
+    linea INTEGER NOT NULL,
+    codigo_barras TEXT NOT NULL,
+    nombre TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    precio_unitario REAL NOT NULL,
+    subtotal REAL NOT NULL,
+    PRIMARY KEY (folio, linea)
+);
+CREATE INDEX IF NOT EXISTS idx_venta_items_codigo ON venta_items(codigo_barras);
+
+CREATE TABLE IF NOT EXISTS resumen_diario (
+    fecha TEXT NOT NULL,
+    cajero TEXT NOT NULL,
+    metodo_pago TEXT NOT NULL,
+    ventas INTEGER NOT NULL,
+    total REAL NOT NULL,
+    subtotal REAL NOT NULL,
+    iva REAL NOT NULL,
+    items INTEGER NOT NULL,
+    devoluciones INTEGER NOT NULL DEFAULT 0,
+    devuelto REAL NOT NULL DEFAULT 0,
+    items_devueltos INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, cajero, metodo_pago)
+);
+
+CREATE TABLE IF NOT EXISTS vendidos_total (
+    codigo_barras TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    total REAL NOT NULL,
+    renglones INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS vendidos_diario (
+    fecha TEXT NOT NULL,
+    codigo_barras TEXT NOT NULL,
+    nombre TEXT NOT NULL,
+    cantidad INTEGER NOT NULL,
+    total REAL NOT NULL,
+    renglones INTEGER NOT NULL,
+    PRIMARY KEY (fecha, codigo_barras)
+);
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    username TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    rol TEXT NOT NULL,
+    nombre_completo TEXT NOT NULL,
+    activo INTEGER NOT NULL DEFAULT 1,
+    fecha_creacion TEXT,
+    ultimo_acceso TEXT
+);
+"""
+
+COLUMNAS_PRODUCTO = ("codigo_barras, nombre, precio, stock, categoria, proveedor, "
+                     "precio_compra, unidad, fecha_creacion, fecha_actualizacion")
+COLUMNAS_VENTA = ("folio, cajero, subtotal, iva, total, metodo_pago, fecha, cliente_rfc, "
+                  "facturada, referencia")
+COLUMNAS_RESUMEN = ("fecha, cajero, metodo_pago, ventas, total, subtotal, iva, items, "
+                    "devoluciones, devuelto, items_devueltos")
+COLUMNAS_VENDIDOS = "codigo_barras, nombre, cantidad, total, renglones"
+COLUMNAS_USUARIO = "username, password_hash, rol, nombre_completo, activo, fecha_creacion, ultimo_acceso"
+
+
+def _fila_producto(p: Producto) -> tuple:
+    return (p.codigo_barras, p.nombre, p.precio, p.stock, p.categoria,
+            p.proveedor, p.precio_compra, p.unidad, p.fecha_creacion, p.fecha_actualizacion)
+
+
+def _fila_usuario(u: Usuario) -> tuple:
+    return (u.username, u.password_hash, u.rol.value, u.nombre_completo,
+            int(u.activo), u.fecha_creacion, u.ultimo_acceso)
+
+
+class SQLiteBackend(ConsultasIndexadas, StorageBackend):
+    def __init__(self, db_path: str = "src/data/tiendita.db",
+                 importar_desde: Optional[StorageBackend] = None):
+        """Abre (o crea) la base de datos.
+
+        importar_desde: backend cuyos datos se copian si la base está vacía,
+        para que cambiar de backend en config.json no pierda el historial.
+        """
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # La conexión se comparte entre hilos; el candado serializa su uso
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(ESQUEMA)
+        self._actualizar_esquema()
+        self._manifiesto: Optional[Dict[str, dict]] = None
+        if importar_desde is not None and self._vacia():
+            self._importar(importar_desde)
+    
+    def _actualizar_esquema(self):
+        """Agrega las columnas que no existían en bases creadas antes"""
+        columnas = {fila[1] for fila in self.conn.execute("PRAGMA table_info(ventas)")}
+        if 'referencia' not in columnas:
+            with self.conn:
+                self.conn.execute("ALTER TABLE ventas ADD COLUMN referencia TEXT")
+        columnas = {fila[1] for fila in self.conn.execute("PRAGMA table_info(resumen_diario)")}
+        if 'devoluciones' not in columnas:
+            # Ahí las devoluciones contaban como ventas: se vacía para que
+            # VentaController reconstruya los acumulados
+            with self.conn:
+                self.conn.execute("ALTER TABLE resumen_diario ADD COLUMN devoluciones "
+                                  "INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute("ALTER TABLE resumen_diario ADD COLUMN devuelto "
+                                  "REAL NOT NULL DEFAULT 0")
+                self.conn.execute("DELETE FROM resumen_diario")
+        if 'items_devueltos' not in columnas:
+            # Ahí los renglones devueltos se sumaban a items: también se rehace
+            with self.conn:
+                self.conn.execute("ALTER TABLE resumen_diario ADD COLUMN items_devueltos "
+                                  "INTEGER NOT NULL DEFAULT 0")
+                self.conn.execute("DELETE FROM resumen_diario")
+    
+    def _vacia(self) -> bool:
+        for tabla in ("productos", "ventas", "usuarios"):
+            if self.conn.execute(f"SELECT 1 FROM {tabla} LIMIT 1").fetchone():
+                return False
+        return True
+    
+    def _importar(self, origen: StorageBackend):
+        """Copia todos los registros de otro backend en una sola transacción"""
+        productos = origen.cargar_productos()
+        ventas = list(origen.cargar_ventas())
+        usuarios = origen.cargar_usuarios()
+        with self._lock, self.conn:
+            self._upsert_productos(productos)
+            for venta in ventas:
+                self._insertar_venta(venta)
+            self._upsert_usuarios(usuarios)
+    
+    # Productos
+    def cargar_productos(self) -> List[Producto]:
+        with self._lock:
+            filas = self.conn.execute(
+                f"SELECT {COLUMNAS_PRODUCTO} FROM productos ORDER BY rowid").fetchall()
+        productos = []
+        for (codigo, nombre, precio, stock, categoria, proveedor,
+             precio_compra, unidad, creacion, actualizacion) in filas:
+            productos.append(Producto(codigo, nombre, precio, stock, categoria, proveedor,
+                                      precio_compra, unidad, creacion, actualizacion))
+        return productos
+    
+    def _upsert_productos(self, productos):
+        # UPSERT (no INSERT OR REPLACE) para conservar el rowid y con él el orden
+        self.conn.executemany(
+            f"INSERT INTO productos ({COLUMNAS_PRODUCTO}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(codigo_barras) DO UPDATE SET nombre = excluded.nombre, "
+            "precio = excluded.precio, "
+            "stock = excluded.stock, categoria = excluded.categoria, "
+            "proveedor = excluded.proveedor, precio_compra = excluded.precio_compra, "
+            "unidad = excluded.unidad, fecha_actualizacion = excluded.fecha_actualizacion",
+            [_fila_producto(p) for p in productos])
+    
+    def _upsert_usuarios(self, usuarios):
+        self.conn.executemany(
+            f"INSERT INTO usuarios ({COLUMNAS_USUARIO}) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(username) DO UPDATE SET password_hash = excluded.password_hash, "
+            "rol = excluded.rol, nombre_completo = excluded.nombre_completo, "
+            "activo = excluded.activo, ultimo_acceso = excluded.ultimo_acceso",
+            [_fila_usuario(u) for u in usuarios])
+    
+    def guardar_productos(self, productos, cambiados=None, eliminados=(), esperar=False):
+        # Escritura síncrona: al regresar ya está en disco
+        with self._lock, self.conn:
+            self._upsert_productos(productos if cambiados is None else cambiados)
+            self.conn.executemany("DELETE FROM productos WHERE codigo_barras = ?",
+                                  [(c,) for c in eliminados])
+    
+    # Ventas (las particiones son rangos de fecha sobre idx_ventas_fecha)
+    def cargar_ventas(self) -> Iterator[Venta]:
+        return self._cargar_ventas()
+    
+    def cargar_ventas_particion(self, clave: str) -> Iterator[Venta]:
+        # fecha es ISO: '~' ordena después de cualquier día del mes
+        return self._cargar_ventas("WHERE v.fecha >= ? AND v.fecha < ?", (clave, clave + "~"))
+    
+    def _cargar_ventas(self, filtro: str = "", params: tuple = ()) -> Iterator[Venta]:
+        columnas = ", ".join(f"v.{c}" for c in COLUMNAS_VENTA.split(", "))
+        with self._lock:
+            cabeceras = self.conn.execute(
+                f"SELECT {columnas} FROM ventas v {filtro} ORDER BY v.fecha, v.rowid",
+                params).fetchall()
+            items = {}
+            for folio, *datos in self.conn.execute(
+                    "SELECT i.folio, i.codigo_barras, i.nombre, i.cantidad, i.precio_unitario, "
+                    f"i.subtotal FROM venta_items i JOIN ventas v ON v.folio = i.folio {filtro} "
+                    "ORDER BY i.folio, i.linea", params):
+                items.setdefault(folio, []).append(ItemVenta(*datos))
+        for (folio, cajero, subtotal, iva, total, metodo, fecha, rfc, facturada,
+             referencia) in cabeceras:
+            venta = Venta(folio, cajero, items.get(folio, []), subtotal, iva, total,
+                          metodo, fecha)
+            venta.cliente_rfc = rfc
+            venta.facturada = bool(facturada)
+            venta.referencia = referencia
+            yield venta
+    
+    def particiones_ventas(self) -> Dict[str, dict]:
+        if self._manifiesto is None:
+            with self._lock:
+                ventas = self.conn.execute(
+                    "SELECT substr(fecha, 1, 7), COUNT(*), MIN(fecha), MAX(fecha) "
+                    "FROM ventas GROUP BY 1").fetchall()
+                items = dict(self.conn.execute(
+                    "SELECT substr(v.fecha, 1, 7), COUNT(*) FROM venta_items i "
+                    "JOIN ventas v ON v.folio = i.folio GROUP BY 1").fetchall())
+            self._manifiesto = {
+                clave: {'ventas': total, 'items': items.get(clave, 0),
+                        'desde': desde, 'hasta': hasta}
+                for clave, total, desde, hasta in ventas
+            }
+        return self._manifiesto
+    
+    def _insertar_venta(self, venta: Venta):
+        self.conn.execute(
+            f"INSERT INTO ventas ({COLUMNAS_VENTA}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (venta.folio, venta.cajero, venta.subtotal, venta.iva, venta.total,
+             venta.metodo_pago, venta.fecha, venta.cliente_rfc, int(venta.facturada),
+             venta.referencia))
+        self.conn.executemany(
+            "INSERT INTO venta_items (folio, linea, codigo_barras, nombre, cantidad, "
+            "precio_unitario, subtotal) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(venta.folio, i, it.codigo_barras, it.nombre, it.cantidad,
+              it.precio_unitario, it.subtotal) for i, it in enumerate(venta.items)])
+    
+    def agregar_venta(self, venta: Venta):
+        manifiesto = self.particiones_ventas()
+        with self._lock, self.conn:
+            self._insertar_venta(venta)
+        entrada = manifiesto.setdefault(particion_de(venta.fecha), {
+            'ventas': 0, 'items': 0, 'desde': venta.fecha, 'hasta': venta.fecha})
+        entrada['ventas'] += 1
+        entrada['items'] += venta.num_items
+        entrada['desde'] = min(entrada['desde'], venta.fecha)
+        entrada['hasta'] = max(entrada['hasta'], venta.fecha)
+    
+    def reescribir_ventas(self, ventas):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM venta_items")
+            self.conn.execute("DELETE FROM ventas")
+            for venta in ventas:
+                self._insertar_venta(venta)
+        self._manifiesto = None
+    
+    # Acumulados diarios
+    def cargar_resumenes(self) -> List[dict]:
+        columnas = COLUMNAS_RESUMEN.split(", ")
+        with self._lock:
+            filas = self.conn.execute(
+                f"SELECT {COLUMNAS_RESUMEN} FROM resumen_diario ORDER BY fecha").fetchall()
+        return [dict(zip(columnas, fila)) for fila in filas]
+    
+    def guardar_resumenes(self, filas, cambiados=None):
+        with self._lock, self.conn:
+            if cambiados is None:
+                self.conn.execute("DELETE FROM resumen_diario")
+            self.conn.executemany(
+                f"INSERT INTO resumen_diario ({COLUMNAS_RESUMEN}) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(fecha, cajero, metodo_pago) DO UPDATE SET "
+                "ventas = excluded.ventas, total = excluded.total, "
+                "subtotal = excluded.subtotal, iva = excluded.iva, items = excluded.items, "
+                "devoluciones = excluded.devoluciones, devuelto = excluded.devuelto, "
+                "items_devueltos = excluded.items_devueltos",
+                [(f['fecha'], f['cajero'], f['metodo_pago'], f['ventas'], f['total'],
+                  f['subtotal'], f['iva'], f['items'], f['devoluciones'], f['devuelto'],
+                  f['items_devueltos'])
+                 for f in (filas if cambiados is None else cambiados)])
+    
+    # Acumulados de productos vendidos
+    def cargar_vendidos_totales(self) -> List[dict]:
+        columnas = COLUMNAS_VENDIDOS.split(", ")
+        with self._lock:
+            filas = self.conn.execute(f"SELECT {COLUMNAS_VENDIDOS} FROM vendidos_total").fetchall()
+        return [dict(zip(columnas, fila)) for fila in filas]
+    
+    def guardar_vendidos_totales(self, filas, cambiados=None):
+        with self._lock, self.conn:
+            if cambiados is None:
+                self.conn.execute("DELETE FROM vendidos_total")
+            self.conn.executemany(
+                f"INSERT INTO vendidos_total ({COLUMNAS_VENDIDOS}) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(codigo_barras) DO UPDATE SET nombre = excluded.nombre, "
+                "cantidad = excluded.cantidad, total = excluded.total, "
+                "renglones = excluded.renglones",
+                [(f['codigo_barras'], f['nombre'], f['cantidad'], f['total'], f['renglones'])
+                 for f in (filas if cambiados is None else cambiados)])
+    
+    def cargar_vendidos_mes(self, clave: str) -> List[dict]:
+        columnas = ["fecha"] + COLUMNAS_VENDIDOS.split(", ")
+        with self._lock:
+            filas = self.conn.execute(
+                f"SELECT fecha, {COLUMNAS_VENDIDOS} FROM vendidos_diario "
+                "WHERE fecha >= ? AND fecha < ? ORDER BY fecha", (clave, clave + "~")).fetchall()
+        return [dict(zip(columnas, fila)) for fila in filas]
+    
+    def guardar_vendidos_mes(self, clave, filas, cambiados=None):
+        with self._lock, self.conn:
+            if cambiados is None:
+                self.conn.execute("DELETE FROM vendidos_diario WHERE fecha >= ? AND fecha < ?",
+                                  (clave, clave + "~"))
+            self.conn.executemany(
+                f"INSERT INTO vendidos_diario (fecha, {COLUMNAS_VENDIDOS}) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(fecha, codigo_barras) DO UPDATE SET nombre = excluded.nombre, "
+                "cantidad = excluded.cantidad, total = excluded.total, "
+                "renglones = excluded.renglones",
+                [(f['fecha'], f['codigo_barras'], f['nombre'], f['cantidad'], f['total'],
+                  f['renglones'])
+                 for f in (filas if cambiados is None else cambiados)])
+    
+    # Usuarios
+    def cargar_usuarios(self) -> List[Usuario]:
+        with self._lock:
+            filas = self.conn.execute(
+                f"SELECT {COLUMNAS_USUARIO} FROM usuarios ORDER BY rowid").fetchall()
+        return [Usuario.from_dict({
+            "username": username, "password_hash": password_hash, "rol": rol,
+            "nombre_completo": nombre, "activo": bool(activo),
+            "fecha_creacion": creacion, "ultimo_acceso": acceso
+        }) for username, password_hash, rol, nombre, activo, creacion, acceso in filas]
+    
+    def guardar_usuarios(self, usuarios, cambiados=None):
+        with self._lock, self.conn:
+            self._upsert_usuarios(usuarios if cambiados is None else cambiados)
+    
+    # Consultas indexadas
+    def _llaves(self, sql: str, params: tuple = ()) -> List[str]:
+        with self._lock:
+            return [fila[0] for fila in self.conn.execute(sql, params)]
+    
+    def consultar_productos_por_categoria(self, categoria: str) -> List[str]:
+        return self._llaves("SELECT codigo_barras FROM productos WHERE categoria = ? ORDER BY rowid",
+                            (categoria,))
+    
+    def consultar_productos_bajo_stock(self, umbral: int) -> List[str]:
+        return self._llaves("SELECT codigo_barras FROM productos WHERE stock <= ? ORDER BY rowid",
+                            (umbral,))
+    
+    def consultar_categorias(self) -> List[str]:
+        return self._llaves("SELECT DISTINCT categoria FROM productos ORDER BY categoria")
+    
+    def consultar_ventas_cajero(self, cajero: str) -> List[str]:
+        return self._llaves("SELECT folio FROM ventas WHERE cajero = ? ORDER BY fecha, rowid",
+                            (cajero,))
+    
+    def cerrar(self):
+        with self._lock:
+            self.conn.close()
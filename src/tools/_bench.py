@@ -0,0 +1,75 @@
+"""Helpers compartidos por los benchmarks de src/tools.
+
+No forman parte de la app: generan datos sintéticos en memoria o en
+directorios temporales y miden tiempos con time.perf_counter.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+from src.models.venta import Venta, ItemVenta
+from src.services.catalog_generator import generate_catalog, make_internal_ean13
+
+CAJEROS = ["owner", "admin", "cajero"]
+METODOS_PAGO = ["Efectivo", "Tarjeta", "Transferencia"]
+
+
+def catalogo_sintetico(total: int, prefix: str = "991") -> List[Dict]:
+    """Regresa `total` productos válidos replicando el catálogo base.
+
+    El generador deduplica por nombre+unidad (~1,900 productos), así que
+    para tamaños mayores se clonan los registros con códigos nuevos y un
+    sufijo de lote en el nombre.
+    """
+    base = generate_catalog(size_multiplier=8)
+    productos: List[Dict] = []
+    for i in range(total):
+        p = dict(base[i % len(base)])
+        lote = i // len(base)
+        p["codigo_barras"] = make_internal_ean13(prefix, i)
+        if lote:
+            p["nombre"] = f"{p['nombre']} (lote {lote})"
+        productos.append(p)
+    return productos
+
+
+def ventas_sinteticas(dias: int, por_dia: int, productos: List[Dict],
+                      hasta: datetime = None, semilla: int = 2025) -> List[Venta]:
+    """Historial de `dias` días con `por_dia` tickets de 1 a 5 líneas.
+
+    Folios AAAAMMDD-NNNN y fechas ISO crecientes, terminando en `hasta`
+    (por defecto, hoy).
+    """
+    rng = random.Random(semilla)
+    hasta = hasta or datetime.now()
+    inicio = datetime(hasta.year, hasta.month, hasta.day) - timedelta(days=dias - 1)
+    ventas: List[Venta] = []
+    for d in range(dias):
+        dia = inicio + timedelta(days=d)
+        for n in range(1, por_dia + 1):
+            items = []
+            for p in rng.sample(productos, rng.randint(1, 5)):
+                cantidad = rng.randint(1, 3)
+                items.append(ItemVenta(p["codigo_barras"], p["nombre"], cantidad,
+                                       p["precio"], round(p["precio"] * cantidad, 2)))
+            subtotal = round(sum(i.subtotal for i in items), 2)
+            iva = round(subtotal * 0.16, 2)
+            venta = Venta(f"{dia:%Y%m%d}-{n:04d}", rng.choice(CAJEROS), items,
+                          subtotal, iva, round(subtotal + iva, 2), rng.choice(METODOS_PAGO))
+            venta.fecha = (dia + timedelta(hours=8, seconds=n * 50400 // (por_dia + 1))).isoformat()
+            ventas.append(venta)
+    return ventas
+
+
+def medir(fn: Callable[[], object], repeticiones: int = 5) -> float:
+    """Mejor tiempo (ms) de `repeticiones` ejecuciones de fn."""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor * 1000.0
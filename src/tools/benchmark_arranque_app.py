@@ -0,0 +1,148 @@
+"""Benchmark del arranque de la app (src.main).
+
+Cada corrida es un intérprete nuevo (sin módulos ya importados):
+- importación: `python -X importtime -c "import src.main"`; tiempo
+  acumulado de src.main, los módulos con más tiempo propio y las pantallas
+  o librerías pesadas que no deberían cargarse antes del login
+- primera ventana: desde lanzar el proceso hasta que la ventana de login
+  quedó dibujada (App() + root.update()). Necesita pantalla (en un
+  servidor: xvfb-run); sin ella sólo se mide la importación.
+  Usa config.json y src/data reales (sólo lectura).
+
+Para comparar contra el cambio anterior:
+  TIENDITA_BENCH_REFERENCIA=/tmp/arranque.json
+la primera vez guarda ahí los resultados; las siguientes imprime la
+diferencia contra ellos.
+
+Uso:
+  python3 -m src.tools.benchmark_arranque_app
+
+Opcional:
+  TIENDITA_BENCH_CORRIDAS=7
+  TIENDITA_BENCH_MODULOS=12        (módulos en el top por tiempo propio)
+  TIENDITA_BENCH_REFERENCIA=ruta.json
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+# No hacen falta para mostrar el login
+DIFERIBLES = ("src.views.ventas_view", "src.views.inventario_view",
+              "src.views.reportes_view", "src.views.main_view",
+              "src.controllers.producto_controller", "src.controllers.venta_controller",
+              "PIL", "reportlab", "barcode", "qrcode")
+
+PRIMERA_VENTANA = """
+import time
+inicio = time.perf_counter()
+from src.main import App
+app = App()
+app.root.update()
+print(f"listo {(time.perf_counter() - inicio) * 1000:.3f}", flush=True)
+app.al_cerrar()
+"""
+
+
+def _importtime() -> Tuple[Dict[str, Tuple[int, int]], float]:
+    """{módulo: (propio µs, acumulado µs)} de un intérprete nuevo y el
+    tiempo total del proceso en ms"""
+    inicio = time.perf_counter()
+    salida = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.main"],
+                            cwd=RAIZ, capture_output=True, text=True, check=True)
+    total = (time.perf_counter() - inicio) * 1000
+    modulos = {}
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos[nombre.strip()] = (int(propio), int(acumulado))
+    return modulos, total
+
+
+def _primera_ventana() -> Optional[Tuple[float, float]]:
+    """(ms desde lanzar el proceso, ms dentro del proceso) hasta el login
+    dibujado; None sin pantalla"""
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([sys.executable, "-c", PRIMERA_VENTANA], cwd=RAIZ,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    for linea in proceso.stdout:
+        if linea.startswith("listo "):
+            externo = (time.perf_counter() - inicio) * 1000
+            proceso.communicate()
+            return externo, float(linea.split()[1])
+    proceso.wait()
+    return None
+
+
+def main() -> int:
+    corridas = int(os.environ.get("TIENDITA_BENCH_CORRIDAS", "7"))
+    top = int(os.environ.get("TIENDITA_BENCH_MODULOS", "12"))
+    referencia = os.environ.get("TIENDITA_BENCH_REFERENCIA")
+
+    propios: Dict[str, List[int]] = defaultdict(list)
+    acumulado_main, procesos, importados = [], [], set()
+    for _ in range(corridas):
+        modulos, total = _importtime()
+        procesos.append(total)
+        acumulado_main.append(modulos["src.main"][1] / 1000)
+        importados.update(modulos)
+        for nombre, (propio, _) in modulos.items():
+            propios[nombre].append(propio)
+
+    resultados = {
+        "import_src_main_ms": statistics.median(acumulado_main),
+        "proceso_import_ms": statistics.median(procesos),
+        "modulos": len(importados),
+    }
+    print(f"{corridas} intérpretes nuevos; medianas")
+    print(f"import src.main: {resultados['import_src_main_ms']:.1f} ms acumulado, "
+          f"proceso completo {resultados['proceso_import_ms']:.1f} ms, "
+          f"{resultados['modulos']} módulos")
+    print(f"\n{'tiempo propio µs':>16}  módulo")
+    for nombre in sorted(propios, key=lambda n: -statistics.median(propios[n]))[:top]:
+        print(f"{statistics.median(propios[nombre]):>16.0f}  {nombre}")
+
+    cargados = [m for m in DIFERIBLES
+                if any(n == m or n.startswith(m + ".") for n in importados)]
+    print("\nse importan antes del login y podrían esperar: "
+          + (", ".join(cargados) if cargados else "ninguno"))
+
+    ventanas = [v for v in (_primera_ventana() for _ in range(min(corridas, 3))) if v]
+    if ventanas:
+        resultados["primera_ventana_ms"] = statistics.median(v[0] for v in ventanas)
+        resultados["primera_ventana_en_proceso_ms"] = statistics.median(v[1] for v in ventanas)
+        print(f"\nprimera ventana (login dibujado): {resultados['primera_ventana_ms']:.0f} ms "
+              f"desde lanzar el proceso, {resultados['primera_ventana_en_proceso_ms']:.0f} ms "
+              f"desde el primer import")
+    else:
+        print("\nprimera ventana: sin pantalla, no se midió")
+
+    if referencia:
+        if os.path.exists(referencia):
+            with open(referencia, encoding="utf-8") as f:
+                anterior = json.load(f)
+            print(f"\ncontra {referencia}:")
+            for campo, valor in resultados.items():
+                if campo in anterior:
+                    print(f"  {campo:<32} {anterior[campo]:>9.1f} -> {valor:>9.1f} "
+                          f"({valor - anterior[campo]:+.1f})")
+        else:
+            with open(referencia, "w", encoding="utf-8") as f:
+                json.dump(resultados, f, indent=2)
+            print(f"\nreferencia guardada en {referencia}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""Benchmark de arranque del catálogo: JSON vs. caché binaria.
+
+Mide cuánto tarda ProductoController en tener el catálogo listo:
+- frío: sin caché (json.load + Producto.from_dict por registro)
+- tibio: caché válida (marshal por columnas)
+- tocado: el JSON cambió de mtime pero no de contenido (se valida por hash)
+Trabaja sobre un directorio temporal: no toca src/data.
+
+Uso:
+  python3 -m src.tools.benchmark_arranque_catalogo
+
+Opcional:
+  TIENDITA_BENCH_CATALOGOS=2000,50000,200000
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.controllers.producto_controller import ProductoController
+from src.storage import JsonBackend
+from src.tools._bench import catalogo_sintetico
+
+
+def _arrancar(productos_path: Path) -> tuple[float, ProductoController]:
+    backend = JsonBackend(str(productos_path), str(productos_path.with_name("ventas.jsonl")),
+                          str(productos_path.with_name("usuarios.json")), cache_catalogo=True)
+    inicio = time.perf_counter()
+    pc = ProductoController(backend=backend)
+    ms = (time.perf_counter() - inicio) * 1000
+    backend.snapshot.esperar()
+    return ms, pc
+
+
+def _sin_fechas(pc: ProductoController) -> list:
+    # El catálogo sintético no trae fechas: from_dict les pone la hora de carga
+    return [{k: v for k, v in p.to_dict().items() if not k.startswith("fecha_")}
+            for p in pc.productos]
+
+
+def main() -> int:
+    catalogos = [int(x) for x in
+                 os.environ.get("TIENDITA_BENCH_CATALOGOS", "2000,50000,200000").split(",")]
+
+    print(f"{'catálogo':>9} {'frío ms':>9} {'tibio ms':>9} {'tocado ms':>10} {'caché KB':>9}")
+    for total in catalogos:
+        with tempfile.TemporaryDirectory() as tmp:
+            productos_path = Path(tmp) / "productos.json"
+            productos_path.write_text(json.dumps(catalogo_sintetico(total), ensure_ascii=False,
+                                                 indent=2), encoding="utf-8")
+
+            frio, pc_frio = _arrancar(productos_path)
+            tibio, pc_tibio = _arrancar(productos_path)
+            assert _sin_fechas(pc_frio) == _sin_fechas(pc_tibio)
+            os.utime(productos_path)
+            tocado, _ = _arrancar(productos_path)
+
+            cache_kb = Path(str(productos_path) + ".cache").stat().st_size / 1024
+            print(f"{total:>9} {frio:>9.1f} {tibio:>9.1f} {tocado:>10.1f} {cache_kb:>9.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
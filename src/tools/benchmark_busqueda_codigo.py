@@ -0,0 +1,81 @@
+"""Micro-benchmark de búsqueda por código de barras.
+
+Compara el recorrido lineal anterior de buscar_por_codigo contra el índice
+por código de ProductoController, con catálogos sintéticos en memoria
+(no toca src/data). También mide alta+baja de un producto nuevo y
+actualizar (objeto distinto con el mismo código), que no deben crecer con
+el catálogo, y baja+alta de productos ya existentes: la baja conserva el
+orden del catálogo y renumera los que siguen, así que ésa sí crece.
+
+Uso:
+  python3 -m src.tools.benchmark_busqueda_codigo
+
+Opcional:
+  TIENDITA_BENCH_SKUS=1000,10000,100000
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from src.controllers.producto_controller import ProductoController
+from src.models.producto import Producto
+from src.tools._bench import catalogo_sintetico, medir
+
+CONSULTAS = 1000
+
+
+def _buscar_lineal(productos, codigo):
+    for producto in productos:
+        if producto.codigo_barras == codigo:
+            return producto
+    return None
+
+
+def main() -> int:
+    tamaños = [int(x) for x in os.environ.get("TIENDITA_BENCH_SKUS", "1000,10000,100000").split(",")]
+    rng = random.Random(2025)
+
+    print(f"{'SKUs':>8} {'lineal µs/consulta':>19} {'índice µs/consulta':>19} "
+          f"{'alta+baja µs':>13} {'actualizar µs':>14} {'baja+alta µs':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for total in tamaños:
+            path = Path(tmp) / f"productos_{total}.json"
+            path.write_text(json.dumps(catalogo_sintetico(total), ensure_ascii=False), encoding="utf-8")
+            pc = ProductoController(str(path))
+            # Sin escritura a disco: sólo se mide el costo en memoria
+            pc.guardar_productos = lambda *args, **kwargs: True
+
+            # Mitad aciertos, mitad códigos inexistentes (peor caso del recorrido)
+            codigos = [p.codigo_barras for p in rng.sample(pc.productos, CONSULTAS // 2)]
+            codigos += [f"000{i:010d}" for i in range(CONSULTAS // 2)]
+
+            lineal = medir(lambda: [_buscar_lineal(pc.productos, c) for c in codigos], 1)
+            indice = medir(lambda: [pc.buscar_por_codigo(c) for c in codigos], 5)
+
+            nuevo = Producto("0000000000000", "Bench", 1.0, 1, "Bench")
+            alta_baja = medir(lambda: (pc.agregar_producto(nuevo),
+                                       pc.eliminar_producto(nuevo.codigo_barras)), 5)
+
+            # Productos repartidos por todo el catálogo (no sólo al final)
+            existentes = rng.sample(pc.productos, 100)
+            copias = [Producto.from_dict(p.to_dict()) for p in existentes]
+            actualizar = medir(lambda: [pc.actualizar_producto(p) for p in copias], 5)
+            # Una sola vuelta: después de la primera ya quedaron al final
+            baja_alta = medir(lambda: [(pc.eliminar_producto(p.codigo_barras),
+                                        pc.agregar_producto(p)) for p in copias], 1)
+            assert len(pc.productos) == total
+
+            print(f"{total:>8} {lineal * 1000 / CONSULTAS:>19.2f} "
+                  f"{indice * 1000 / CONSULTAS:>19.3f} {alta_baja * 1000:>13.1f} "
+                  f"{actualizar * 1000 / len(copias):>14.1f} "
+                  f"{baja_alta * 1000 / len(copias):>13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
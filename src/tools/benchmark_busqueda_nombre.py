@@ -0,0 +1,69 @@
+"""Benchmark de búsqueda por nombre.
+
+Compara el recorrido anterior (lower() + subcadena sobre todo el catálogo)
+contra el índice de trigramas de ProductoController, y el costo de
+mantener el índice al agregar/editar/eliminar. Catálogo sintético en
+memoria (no toca src/data).
+
+Uso:
+  python3 -m src.tools.benchmark_busqueda_nombre
+
+Opcional:
+  TIENDITA_BENCH_SKUS=10000,100000,200000
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.controllers.producto_controller import ProductoController
+from src.models.producto import Producto
+from src.tools._bench import catalogo_sintetico, medir
+
+CONSULTAS = ["coca", "limon", "limón", "sabritas", "leche entera", "jabon", "galletas mar", "zzz"]
+
+
+def _buscar_lineal(productos, termino):
+    termino = termino.lower()
+    return [p for p in productos if termino in p.nombre.lower()]
+
+
+def main() -> int:
+    tamaños = [int(x) for x in os.environ.get("TIENDITA_BENCH_SKUS", "10000,100000,200000").split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for total in tamaños:
+            path = Path(tmp) / f"productos_{total}.json"
+            path.write_text(json.dumps(catalogo_sintetico(total), ensure_ascii=False), encoding="utf-8")
+            t0 = time.perf_counter()
+            pc = ProductoController(str(path))
+            carga = (time.perf_counter() - t0) * 1000
+            t0 = time.perf_counter()
+            pc.preparar_indices()
+            indices = (time.perf_counter() - t0) * 1000
+            pc.guardar_productos = lambda *args, **kwargs: True
+
+            print(f"\n{total} SKUs (carga: {carga:.0f} ms, índices: {indices:.0f} ms)")
+            print(f"{'consulta':>14} {'lineal ms':>10} {'índice ms':>10} {'resultados':>11}")
+            for consulta in CONSULTAS:
+                lineal = medir(lambda: _buscar_lineal(pc.productos, consulta), 3)
+                indice = medir(lambda: pc.buscar_por_nombre(consulta), 5)
+                resultados = len(pc.buscar_por_nombre(consulta))
+                print(f"{consulta:>14} {lineal:>10.2f} {indice:>10.3f} {resultados:>11}")
+
+            producto = Producto("0000000000000", "Limón Persa Bench", 1.0, 1, "Bench")
+            alta = medir(lambda: (pc.agregar_producto(producto),
+                                  pc.eliminar_producto(producto.codigo_barras)), 5)
+            pc.agregar_producto(producto)
+            producto.nombre = "Lima Bench"
+            edicion = medir(lambda: pc.actualizar_producto(producto), 5)
+            print(f"alta+baja: {alta:.2f} ms  edición: {edicion:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
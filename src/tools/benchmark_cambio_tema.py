@@ -0,0 +1,121 @@
+"""Benchmark del cambio de tema con el inventario cargado.
+
+Arma la ventana principal con un catálogo sintético (directorio temporal,
+no toca src/data), visita Punto de Venta, Inventario y Reportes y mide el
+cambio de tema hasta que Tk termina de redibujar (root.update):
+- en su lugar: estilos ttk + widgets registrados en el gestor de temas
+  (App.toggle_theme actual)
+- reconstruyendo: destruir y volver a crear la ventana principal y el
+  inventario (lo que hacía antes el cambio de tema)
+
+Necesita pantalla (en un servidor: xvfb-run).
+
+Uso:
+  python3 -m src.tools.benchmark_cambio_tema
+
+Opcional:
+  TIENDITA_BENCH_PRODUCTOS=50000
+  TIENDITA_BENCH_REPETICIONES=10
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import tempfile
+import time
+import tkinter as tk
+from pathlib import Path
+from typing import List
+
+from src.controllers.producto_controller import ProductoController
+from src.controllers.venta_controller import VentaController
+from src.main import App
+from src.models.usuario import RolUsuario, Usuario
+from src.storage import JsonBackend
+from src.tools._bench import catalogo_sintetico
+from src.utils.theme_manager import ThemeManager
+from src.views.main_view import MainView
+
+
+class _AppBanco:
+    """Lo que las vistas usan de App, con los mismos métodos de tema"""
+    configurar_estilo = App.configurar_estilo
+    aplicar_tema = App.aplicar_tema
+
+    def __init__(self, root: tk.Tk, directorio: Path):
+        self.root = root
+        self.config = {'tax_rate': 0.16}
+        self.theme_manager = ThemeManager('light')
+        self.configurar_estilo()
+        backend = JsonBackend(str(directorio / "productos.json"),
+                              str(directorio / "ventas.jsonl"),
+                              str(directorio / "usuarios.json"))
+        self.producto_controller = ProductoController(backend=backend)
+        self.venta_controller = VentaController(backend=backend)
+
+
+def _abrir(app: _AppBanco, usuario: Usuario) -> MainView:
+    vista = MainView(app.root, app, usuario)
+    vista.mostrar_inventario()
+    app.root.update()
+    return vista
+
+
+def _resumen(nombre: str, tiempos: List[float]):
+    print(f"{nombre:<16} {statistics.median(tiempos):>10.1f} {max(tiempos):>10.1f}")
+
+
+def main() -> int:
+    total = int(os.environ.get("TIENDITA_BENCH_PRODUCTOS", "50000"))
+    repeticiones = int(os.environ.get("TIENDITA_BENCH_REPETICIONES", "10"))
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"Se necesita pantalla para este benchmark: {e}")
+        return 1
+    root.geometry("1400x800")
+    usuario = Usuario("owner", "owner", RolUsuario.OWNER, "Propietario")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directorio = Path(tmp)
+        with open(directorio / "productos.json", 'w', encoding='utf-8') as f:
+            json.dump(catalogo_sintetico(total), f, ensure_ascii=False)
+        app = _AppBanco(root, directorio)
+
+        vista = _abrir(app, usuario)
+        for mostrar in (vista.mostrar_ventas, vista.mostrar_reportes, vista.mostrar_inventario):
+            mostrar()
+            root.update()
+        inventario = vista.vista_actual
+
+        en_su_lugar = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            app.theme_manager.toggle_theme()
+            app.aplicar_tema()
+            root.update()
+            en_su_lugar.append((time.perf_counter() - inicio) * 1000)
+        assert vista.vista_actual is inventario, "el cambio de tema reconstruyó la vista"
+
+        reconstruyendo = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            app.theme_manager.toggle_theme()
+            app.configurar_estilo()
+            vista.destroy()
+            vista = _abrir(app, usuario)
+            reconstruyendo.append((time.perf_counter() - inicio) * 1000)
+
+    root.destroy()
+    print(f"{total} productos, {repeticiones} cambios de tema")
+    print(f"{'cambio de tema':<16} {'mediana ms':>10} {'máx ms':>10}")
+    _resumen("en su lugar", en_su_lugar)
+    _resumen("reconstruyendo", reconstruyendo)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
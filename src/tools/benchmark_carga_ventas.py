@@ -0,0 +1,75 @@
+"""Benchmark de carga del historial de ventas con renglones perezosos.
+
+Mide el tiempo de carga del historial completo en VentaController sobre
+una bitácora sintética, con los renglones aún sin convertir, y lo que
+cuesta después crear todos los ItemVenta (lo que antes se pagaba siempre
+al cargar). Verifica que el reporte por período no cree ninguno. (Al
+arrancar sólo se carga el mes actual: ver benchmark_particiones_ventas.
+La memoria por renglón está en reporte_memoria_modelos.)
+Trabaja sobre un directorio temporal: no toca src/data.
+
+Uso:
+  python3 -m src.tools.benchmark_carga_ventas
+
+Opcional:
+  TIENDITA_BENCH_VENTAS=50000,250000   (tickets de 1 a 5 renglones)
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.controllers.venta_controller import VentaController
+from src.storage.json_backend import escribir_bitacora
+from src.tools._bench import catalogo_sintetico, ventas_sinteticas
+
+POR_DIA = 500
+
+
+def _cargar(path: Path) -> VentaController:
+    vc = VentaController(str(path), memoria_mb=4096)
+    vc.obtener_todas_ventas()
+    return vc
+
+
+def _materializar(vc: VentaController) -> int:
+    return sum(len(v.items) for v in vc.obtener_todas_ventas())
+
+
+def main() -> int:
+    totales = [int(x) for x in
+               os.environ.get("TIENDITA_BENCH_VENTAS", "50000,250000").split(",")]
+    productos = catalogo_sintetico(2000)
+
+    print(f"{'ventas':>8} {'renglones':>10} {'carga ms':>12} {'+items ms':>10}")
+    for total in totales:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "ventas.jsonl"
+            escribir_bitacora(str(path), ventas_sinteticas(total // POR_DIA, POR_DIA, productos))
+            # Primer arranque: reparte en meses y arma los acumulados por día
+            VentaController(str(path))
+            gc.collect()
+
+            inicio = time.perf_counter()
+            vc = _cargar(path)
+            arranque = (time.perf_counter() - inicio) * 1000
+            reporte = vc.obtener_reporte_ventas("2000-01-01", "2100-12-31")
+            ventas = vc.obtener_todas_ventas()
+            assert reporte['total_ventas'] == len(ventas)
+            assert all(v._items is None for v in ventas), "el reporte creó renglones"
+            inicio = time.perf_counter()
+            renglones = _materializar(vc)
+            con_items = (time.perf_counter() - inicio) * 1000
+            assert renglones == reporte['total_items']
+            del vc, ventas
+
+            print(f"{total:>8} {renglones:>10} {arranque:>12.0f} {con_items:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""Benchmark de cobro: una escritura por línea vs. transacción única.
+
+Compara el flujo anterior de VentasView.procesar_venta (registrar_venta +
+actualizar_stock por cada línea, reescribiendo el catálogo N veces) contra
+ProductoController.confirmar_venta (un solo guardado del catálogo).
+
+Trabaja sobre un directorio temporal: no toca src/data.
+
+Uso:
+  python3 -m src.tools.benchmark_checkout
+
+Opcional:
+  TIENDITA_BENCH_CATALOGOS=2000,20000   (tamaños de catálogo)
+  TIENDITA_BENCH_LINEAS=1,5,20,50       (líneas por ticket)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from src.controllers.producto_controller import ProductoController
+from src.controllers.venta_controller import VentaController
+from src.models.venta import Venta, ItemVenta
+from src.tools._bench import catalogo_sintetico, medir
+
+
+def _venta(productos, lineas: int, folio: str) -> Venta:
+    items = [
+        ItemVenta(p.codigo_barras, p.nombre, 1, p.precio, p.precio)
+        for p in productos[:lineas]
+    ]
+    subtotal = sum(i.subtotal for i in items)
+    return Venta(folio, "bench", items, subtotal, subtotal * 0.16, subtotal * 1.16)
+
+
+def _checkout_legado(pc: ProductoController, vc: VentaController, venta: Venta):
+    if vc.registrar_venta(venta):
+        for item in venta.items:
+            pc.actualizar_stock(item.codigo_barras, -item.cantidad)
+
+
+def main() -> int:
+    catalogos = [int(x) for x in os.environ.get("TIENDITA_BENCH_CATALOGOS", "2000,20000").split(",")]
+    lineas_por_ticket = [int(x) for x in os.environ.get("TIENDITA_BENCH_LINEAS", "1,5,20,50").split(",")]
+
+    print(f"{'catálogo':>9} {'líneas':>7} {'legado ms':>10} {'transacción ms':>15}")
+    for total in catalogos:
+        with tempfile.TemporaryDirectory() as tmp:
+            data = catalogo_sintetico(total)
+            for p in data:
+                p["stock"] = 10**6
+            productos_path = Path(tmp) / "productos.json"
+            productos_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+            pc = ProductoController(str(productos_path))
+            vc = VentaController(str(Path(tmp) / "ventas.jsonl"))
+            productos = pc.obtener_todos_productos()
+            contador = iter(range(10**9))
+
+            for lineas in lineas_por_ticket:
+                legado = medir(lambda: _checkout_legado(
+                    pc, vc, _venta(productos, lineas, f"L-{next(contador)}")), 3)
+                nuevo = medir(lambda: pc.confirmar_venta(
+                    _venta(productos, lineas, f"T-{next(contador)}"), vc), 3)
+                print(f"{total:>9} {lineas:>7} {legado:>10.1f} {nuevo:>15.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Benchmark de escrituras: costo de E/S por venta con el escritor en segundo plano.
+
+Cobra tickets con ProductoController.confirmar_venta (punto de
+confirmación: el catálogo se escribe en cada venta y el cobro espera a que
+quede en disco, así que "UI ms/op" incluye esa escritura) y después hace
+ajustes de stock sueltos (sin confirmación: se combinan por intervalo). Reporta las
+estadísticas del escritor: escrituras, bytes y tiempo por flush.
+Trabaja sobre un directorio temporal: no toca src/data.
+
+Uso:
+  python3 -m src.tools.benchmark_escrituras
+
+Opcional:
+  TIENDITA_BENCH_CATALOGOS=2000,20000   (tamaños de catálogo)
+  TIENDITA_BENCH_VENTAS=50              (tickets y ajustes por catálogo)
+  TIENDITA_BENCH_INTERVALO_MS=1000      (intervalo del escritor)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.controllers.producto_controller import ProductoController
+from src.controllers.venta_controller import VentaController
+from src.models.venta import Venta, ItemVenta
+from src.storage import EscritorSegundoPlano, JsonBackend
+from src.tools._bench import catalogo_sintetico
+
+
+def _venta(productos, folio: str) -> Venta:
+    items = [ItemVenta(p.codigo_barras, p.nombre, 1, p.precio, p.precio) for p in productos]
+    subtotal = sum(i.subtotal for i in items)
+    return Venta(folio, "bench", items, subtotal, subtotal * 0.16, subtotal * 1.16)
+
+
+def _reporte(etiqueta: str, operaciones: int, ui_ms: float, stats: dict) -> None:
+    escrituras = stats["escrituras"] or 1
+    print(f"{etiqueta:>10} {operaciones:>6} {ui_ms / operaciones:>8.2f} "
+          f"{stats['escrituras']:>10} {stats['bytes'] / operaciones / 1024:>10.1f} "
+          f"{stats['segundos'] * 1000 / escrituras:>9.1f}")
+
+
+def main() -> int:
+    catalogos = [int(x) for x in os.environ.get("TIENDITA_BENCH_CATALOGOS", "2000,20000").split(",")]
+    operaciones = int(os.environ.get("TIENDITA_BENCH_VENTAS", "50"))
+    intervalo = int(os.environ.get("TIENDITA_BENCH_INTERVALO_MS", "1000")) / 1000
+
+    for total in catalogos:
+        print(f"\ncatálogo: {total} productos (intervalo {intervalo * 1000:.0f} ms)")
+        print(f"{'operación':>10} {'ops':>6} {'UI ms/op':>8} {'escrituras':>10} "
+              f"{'KB/op':>10} {'ms/flush':>9}")
+        with tempfile.TemporaryDirectory() as tmp:
+            data = catalogo_sintetico(total)
+            for p in data:
+                p["stock"] = 10**6
+            productos_path = Path(tmp) / "productos.json"
+            productos_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+            for etiqueta in ("venta", "ajuste"):
+                escritor = EscritorSegundoPlano(intervalo)
+                backend = JsonBackend(str(productos_path), str(Path(tmp) / "ventas.jsonl"),
+                                      str(Path(tmp) / "usuarios.json"), escritor=escritor)
+                pc = ProductoController(backend=backend)
+                vc = VentaController(backend=backend)
+                productos = pc.obtener_todos_productos()
+
+                inicio = time.perf_counter()
+                for i in range(operaciones):
+                    if etiqueta == "venta":
+                        pc.confirmar_venta(_venta(productos[i:i + 5], f"{etiqueta}-{i}"), vc)
+                    else:
+                        pc.actualizar_stock(productos[i].codigo_barras, 1)
+                ui_ms = (time.perf_counter() - inicio) * 1000
+                escritor.cerrar()
+                _reporte(etiqueta, operaciones, ui_ms, escritor.estadisticas())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+"""Benchmark de folios: generación y búsqueda con un año de ventas.
+
+Compara los recorridos anteriores de generar_folio (contar los folios del
+día con startswith) y buscar_venta (lineal por folio) contra el consecutivo
+por día y el índice por folio de VentaController. Historial sintético en
+un directorio temporal (no toca src/data).
+
+Uso:
+  python3 -m src.tools.benchmark_folios
+
+Opcional:
+  TIENDITA_BENCH_VENTAS_DIA=300   (tickets por día durante 365 días)
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from src.controllers.venta_controller import VentaController
+from src.storage.json_backend import escribir_bitacora
+from src.tools._bench import catalogo_sintetico, medir, ventas_sinteticas
+
+CONSULTAS = 1000
+
+
+def _generar_folio_lineal(ventas):
+    fecha = datetime.now().strftime("%Y%m%d")
+    numero = len([v for v in ventas if v.folio.startswith(fecha)]) + 1
+    return f"{fecha}-{numero:04d}"
+
+
+def _buscar_lineal(ventas, folio):
+    for venta in ventas:
+        if venta.folio == folio:
+            return venta
+    return None
+
+
+def main() -> int:
+    por_dia = int(os.environ.get("TIENDITA_BENCH_VENTAS_DIA", "300"))
+    rng = random.Random(2025)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ventas.jsonl"
+        escribir_bitacora(str(path), ventas_sinteticas(365, por_dia, catalogo_sintetico(2000)))
+        # Presupuesto amplio: se compara contra el historial completo en memoria
+        vc = VentaController(str(path), memoria_mb=4096)
+        ventas = vc.obtener_todas_ventas()
+
+        assert _generar_folio_lineal(ventas) == vc.generar_folio()
+        folios = [v.folio for v in rng.sample(ventas, CONSULTAS)]
+
+        folio_lineal = medir(lambda: _generar_folio_lineal(ventas), 3)
+        folio_indice = medir(lambda: vc.generar_folio(), 5)
+        buscar_lineal = medir(lambda: [_buscar_lineal(ventas, f) for f in folios[:50]], 1) / 50
+        buscar_indice = medir(lambda: [vc.buscar_venta(f) for f in folios], 5) / CONSULTAS
+
+        print(f"ventas en historial: {len(ventas)} (365 días x {por_dia})")
+        print(f"{'operación':>14} {'lineal ms':>10} {'índice ms':>10}")
+        print(f"{'generar_folio':>14} {folio_lineal:>10.3f} {folio_indice:>10.4f}")
+        print(f"{'buscar_venta':>14} {buscar_lineal:>10.3f} {buscar_indice:>10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
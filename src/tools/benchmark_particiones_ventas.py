@@ -0,0 +1,105 @@
+"""Benchmark del historial de ventas particionado por mes.
+
+Sobre dos años de ventas sintéticas en un directorio temporal (no toca
+src/data) mide:
+- arranque: VentaController sólo carga el mes actual, contra cargar todo
+  el historial; tiempo y memoria retenida (tracemalloc)
+- consulta de los últimos 90 días: en frío (lee los meses del disco) y en
+  caliente (meses ya en la caché)
+- reporte mes por mes de todo el historial con un presupuesto chico: meses
+  desalojados y memoria estimada que queda cargada
+- la estimación de memoria por venta/renglón contra la medida
+
+Uso:
+  python3 -m src.tools.benchmark_particiones_ventas
+
+Opcional:
+  TIENDITA_BENCH_VENTAS_DIA=200   (tickets por día durante 730 días)
+  TIENDITA_BENCH_MEMORIA_MB=16    (presupuesto del reporte mes por mes)
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.controllers.venta_controller import VentaController
+from src.storage.json_backend import escribir_bitacora
+from src.tools._bench import catalogo_sintetico, medir, ventas_sinteticas
+
+DIAS = 730
+
+
+def _arrancar(path: Path, memoria_mb: float, todo: bool):
+    """(ms, bytes retenidos, controlador)"""
+    gc.collect()
+    inicio = time.perf_counter()
+    vc = VentaController(str(path), memoria_mb=memoria_mb)
+    if todo:
+        vc.obtener_todas_ventas()
+    ms = (time.perf_counter() - inicio) * 1000
+    del vc
+    gc.collect()
+    tracemalloc.start()
+    vc = VentaController(str(path), memoria_mb=memoria_mb)
+    if todo:
+        vc.obtener_todas_ventas()
+    gc.collect()
+    retenidos = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ms, retenidos, vc
+
+
+def main() -> int:
+    por_dia = int(os.environ.get("TIENDITA_BENCH_VENTAS_DIA", "200"))
+    presupuesto = float(os.environ.get("TIENDITA_BENCH_MEMORIA_MB", "16"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ventas.jsonl"
+        escribir_bitacora(str(path), ventas_sinteticas(DIAS, por_dia, catalogo_sintetico(2000)))
+        # Primer arranque: reparte en meses y arma los acumulados por día
+        VentaController(str(path))
+
+        parcial_ms, parcial_b, vc = _arrancar(path, 4096, todo=False)
+        total_ms, total_b, completo = _arrancar(path, 4096, todo=True)
+        print(f"historial: {vc.total_ventas()} ventas en {len(vc._manifiesto())} meses "
+              f"({DIAS} días x {por_dia})")
+        print(f"{'arranque':<22} {'ms':>8} {'MB':>8}")
+        print(f"{'sólo mes actual':<22} {parcial_ms:>8.0f} {parcial_b / 2**20:>8.1f}")
+        print(f"{'historial completo':<22} {total_ms:>8.0f} {total_b / 2**20:>8.1f}")
+        estimado = completo.memoria_cargada()
+        print(f"memoria estimada / medida (historial completo): "
+              f"{estimado / 2**20:.1f} / {total_b / 2**20:.1f} MB")
+        del completo
+
+        hoy = datetime.now()
+        fin = hoy.strftime("%Y-%m-%d")
+        inicio = (hoy - timedelta(days=89)).strftime("%Y-%m-%d")
+        t0 = time.perf_counter()
+        rango = vc.obtener_ventas_por_fecha(inicio, fin)
+        frio = (time.perf_counter() - t0) * 1000
+        caliente = medir(lambda: vc.obtener_ventas_por_fecha(inicio, fin), 50)
+        print(f"últimos 90 días: {len(rango)} ventas, frío {frio:.0f} ms, "
+              f"caliente {caliente:.3f} ms, meses cargados {len(vc.particiones_cargadas())}")
+
+        vc = VentaController(str(path), memoria_mb=presupuesto)
+        dia = hoy - timedelta(days=DIAS)
+        vistas = 0
+        while dia <= hoy:
+            mes = dia.strftime("%Y-%m")
+            vistas += len(vc.obtener_ventas_por_fecha(mes + "-01", mes + "-31"))
+            dia = (dia.replace(day=1) + timedelta(days=32)).replace(day=1)
+        assert vistas == vc.total_ventas()
+        print(f"reporte mes por mes con {presupuesto:.0f} MB: {vc.desalojadas} meses desalojados, "
+              f"{len(vc.particiones_cargadas())} en memoria "
+              f"(~{vc.memoria_cargada() / 2**20:.1f} MB estimados)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
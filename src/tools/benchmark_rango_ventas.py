@@ -0,0 +1,57 @@
+"""Benchmark de consultas por rango de fechas con un año de ventas.
+
+Compara el recorrido anterior de obtener_ventas_por_fecha (comparar
+venta.fecha[:10] en todo el historial) contra la búsqueda binaria sobre la
+lista ordenada de VentaController, para un día, una semana y un mes.
+Historial sintético en un directorio temporal (no toca src/data).
+
+Uso:
+  python3 -m src.tools.benchmark_rango_ventas
+
+Opcional:
+  TIENDITA_BENCH_VENTAS_DIA=300   (tickets por día durante 365 días)
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.controllers.venta_controller import VentaController
+from src.storage.json_backend import escribir_bitacora
+from src.tools._bench import catalogo_sintetico, medir, ventas_sinteticas
+
+
+def _rango_lineal(ventas, fecha_inicio, fecha_fin):
+    return [v for v in ventas if fecha_inicio <= v.fecha[:10] <= fecha_fin]
+
+
+def main() -> int:
+    por_dia = int(os.environ.get("TIENDITA_BENCH_VENTAS_DIA", "300"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ventas.jsonl"
+        escribir_bitacora(str(path), ventas_sinteticas(365, por_dia, catalogo_sintetico(2000)))
+        vc = VentaController(str(path))
+        ventas = vc.obtener_todas_ventas()
+
+        hoy = datetime.now()
+        print(f"ventas en historial: {len(ventas)} (365 días x {por_dia})")
+        print(f"{'rango':>8} {'ventas':>8} {'lineal ms':>10} {'bisect ms':>10}")
+        for nombre, dias in (("día", 0), ("semana", 6), ("mes", 29)):
+            fin = hoy.strftime("%Y-%m-%d")
+            inicio = (hoy - timedelta(days=dias)).strftime("%Y-%m-%d")
+            esperado = _rango_lineal(ventas, inicio, fin)
+            rango = vc.obtener_ventas_por_fecha(inicio, fin)
+            assert list(rango) == esperado
+
+            lineal = medir(lambda: _rango_lineal(ventas, inicio, fin), 3)
+            indice = medir(lambda: vc.obtener_ventas_por_fecha(inicio, fin), 200)
+            print(f"{nombre:>8} {len(rango):>8} {lineal:>10.3f} {indice:>10.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,55 @@
+"""Compacta el historial de ventas (src/data/ventas/AAAA-MM.jsonl).
+
+Acción:
+- Si aún existe la bitácora única src/data/ventas.jsonl (o el historial
+  anterior src/data/ventas.json, un arreglo JSON), la reparte en meses y la
+  elimina tras verificar el conteo.
+- Omite líneas corruptas, elimina folios repetidos (gana el último) y
+  ordena por fecha dentro de cada mes.
+- Reescribe cada mes en archivo temporal + fsync + rename: nunca deja una
+  partición a medias. El manifiesto se rehace con los conteos nuevos.
+
+Ejecutar con la app cerrada.
+
+Uso:
+  python3 -m src.tools.compactar_ventas
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.storage.json_backend import JsonBackend
+
+
+def main() -> int:
+    data_dir = Path(__file__).resolve().parents[2] / "src" / "data"
+    backend = JsonBackend(str(data_dir / "productos.json"), str(data_dir / "ventas.jsonl"),
+                          str(data_dir / "usuarios.json"))
+
+    por_folio = {}
+    leidas = 0
+    for venta in backend.cargar_ventas():
+        por_folio[venta.folio] = venta
+        leidas += 1
+    print(f"ventas_leidas: {leidas}")
+
+    ventas = sorted(por_folio.values(), key=lambda v: v.fecha)
+    try:
+        backend.reescribir_ventas(ventas)
+    except Exception as e:
+        print(f"ERROR: no se pudo reescribir el historial: {e}")
+        return 1
+
+    escritas = sum(1 for _ in backend.cargar_ventas())
+    if escritas != len(ventas):
+        print(f"ERROR: se esperaban {len(ventas)} ventas y se leyeron {escritas}")
+        return 1
+
+    meses = backend.particiones_ventas()
+    print(f"OK: {escritas} ventas en {len(meses)} meses ({Path(backend.particiones_path).name}/)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
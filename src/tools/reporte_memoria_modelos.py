@@ -0,0 +1,131 @@
+"""Reporte de memoria de los modelos (tracemalloc).
+
+Carga un catálogo y un historial de ventas sintéticos como lo hace la app
+(productos.json con json.load, la bitácora renglón por renglón) y mide con
+tracemalloc la memoria que queda retenida por los objetos:
+- antes: clases con __dict__ por instancia y textos sin compartir
+  (equivalentes a los modelos previos a __slots__), cada línea decodificada
+  completa
+- ahora: Producto / Venta actuales (__slots__ + internado), las ventas
+  leídas con json_backend._leer_linea (renglones como texto JSON)
+- ahora con items: además, todos los ItemVenta creados
+
+Uso:
+  python3 -m src.tools.reporte_memoria_modelos
+
+Opcional:
+  TIENDITA_BENCH_PRODUCTOS=100000
+  TIENDITA_BENCH_ITEMS=1000000
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+import random
+import tracemalloc
+from typing import Callable, List
+
+from src.models.producto import Producto
+from src.models.venta import Venta
+from src.storage.json_backend import _leer_linea
+from src.tools._bench import CAJEROS, METODOS_PAGO, catalogo_sintetico
+
+ITEMS_POR_VENTA = 4
+
+
+def _clase_con_dict(nombre: str):
+    """Clase con __dict__ por instancia (diccionario de llaves compartidas,
+    igual que los modelos sin __slots__)"""
+    def __init__(self, datos: dict):
+        for campo, valor in datos.items():
+            setattr(self, campo, valor)
+    return type(nombre, (), {"__init__": __init__})
+
+
+ProductoAntes = _clase_con_dict("ProductoAntes")
+ItemVentaAntes = _clase_con_dict("ItemVentaAntes")
+VentaAntes = _clase_con_dict("VentaAntes")
+
+
+def _venta_antes(datos: dict):
+    datos["items"] = [ItemVentaAntes(item) for item in datos["items"]]
+    return VentaAntes(datos)
+
+
+def _con_items(ventas: list) -> list:
+    for venta in ventas:
+        venta.items
+    return ventas
+
+
+def _medir(construir: Callable[[], list]) -> int:
+    """Bytes retenidos por lo que regresa construir()"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objetos = construir()
+        gc.collect()
+        retenidos = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del objetos
+    return retenidos
+
+
+def _renglones_ventas(productos: List[dict], total_items: int) -> List[str]:
+    """Líneas de bitácora (formato de serializar_venta) con ITEMS_POR_VENTA
+    renglones cada una"""
+    rng = random.Random(2025)
+    renglones = []
+    for n in range(total_items // ITEMS_POR_VENTA):
+        items = []
+        for p in rng.sample(productos, ITEMS_POR_VENTA):
+            items.append({"codigo_barras": p["codigo_barras"], "nombre": p["nombre"],
+                          "cantidad": 1, "precio_unitario": p["precio"],
+                          "subtotal": p["precio"]})
+        subtotal = round(sum(i["subtotal"] for i in items), 2)
+        renglones.append(json.dumps({
+            "folio": f"20250101-{n:07d}", "cajero": rng.choice(CAJEROS), "items": items,
+            "subtotal": subtotal, "iva": round(subtotal * 0.16, 2),
+            "total": round(subtotal * 1.16, 2), "metodo_pago": rng.choice(METODOS_PAGO),
+            "fecha": f"2025-01-01T08:00:{n % 60:02d}", "cliente_rfc": None,
+            "facturada": False
+        }, ensure_ascii=False, separators=(',', ':')))
+    return renglones
+
+
+def _fila(nombre: str, antes: int, ahora: int, cantidad: int):
+    ahorro = 1 - ahora / antes if antes else 0.0
+    print(f"{nombre:<24} {antes / 2**20:>10.1f} {ahora / 2**20:>10.1f} "
+          f"{ahorro:>8.0%} {antes / cantidad:>10.0f} {ahora / cantidad:>10.0f}")
+
+
+def main() -> int:
+    total_productos = int(os.environ.get("TIENDITA_BENCH_PRODUCTOS", "100000"))
+    total_items = int(os.environ.get("TIENDITA_BENCH_ITEMS", "1000000"))
+
+    productos = catalogo_sintetico(total_productos)
+    # Fechas como en un catálogo real (el sintético no las trae)
+    for p in productos:
+        p["fecha_creacion"] = p["fecha_actualizacion"] = "2025-01-01T00:00:00"
+    texto_catalogo = json.dumps(productos, ensure_ascii=False)
+    renglones = _renglones_ventas(productos, total_items)
+
+    print(f"{'modelo':<24} {'antes MB':>10} {'ahora MB':>10} {'ahorro':>8} "
+          f"{'antes B/u':>10} {'ahora B/u':>10}")
+    antes = _medir(lambda: [ProductoAntes(d) for d in json.loads(texto_catalogo)])
+    ahora = _medir(lambda: [Producto.from_dict(d) for d in json.loads(texto_catalogo)])
+    _fila(f"{total_productos:,} productos", antes, ahora, total_productos)
+
+    antes = _medir(lambda: [_venta_antes(json.loads(r)) for r in renglones])
+    ahora = _medir(lambda: [Venta.from_dict(_leer_linea(r)) for r in renglones])
+    _fila(f"{total_items:,} renglones", antes, ahora, total_items)
+    ahora = _medir(lambda: _con_items([Venta.from_dict(_leer_linea(r)) for r in renglones]))
+    _fila("  con ItemVenta", antes, ahora, total_items)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
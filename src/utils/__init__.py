@@ -1,6 +1,23 @@
 """
 Utilidades del sistema
+Se importan al pedirlas (PEP 562): las tablas no hacen falta para el login.
 """
-from .theme_manager import ThemeManager
+import importlib
 
-__all__ = ['ThemeManager']
+_MODULOS = {
+    'ThemeManager': '.theme_manager',
+    'TreeviewConLlaves': '.treeview_diff',
+    'GridVirtual': '.grid_virtual',
+    'ModeloFilas': '.grid_virtual',
+}
+
+__all__ = list(_MODULOS)
+
+
+def __getattr__(nombre):
+    modulo = _MODULOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor
+    return valor
@@ -0,0 +1,91 @@
+"""
+Arranque por etapas
+Lo que el login necesita (configuración, usuarios) se carga en el hilo de
+Tk; catálogo y ventas se cargan en un hilo aparte mientras el usuario
+escribe su contraseña. `listo` avisa cuando los datos están disponibles.
+
+Cada fase queda en una línea de tiempo (inicio y duración desde que
+arrancó la app, y el hilo en que corrió) que se imprime al terminar, para
+notar cuando alguna fase se vuelve lenta.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+
+# (nombre, inicio ms, duración ms, hilo)
+Fase = Tuple[str, float, float, str]
+
+
+class Arranque:
+    def __init__(self):
+        self._inicio = time.perf_counter()
+        self._fases: List[Fase] = []
+        self._lock = threading.Lock()
+        self.listo = threading.Event()
+        self.error: Optional[BaseException] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    def _ms(self) -> float:
+        return (time.perf_counter() - self._inicio) * 1000
+
+    def _anotar(self, nombre: str, inicio: float, duracion: float):
+        with self._lock:
+            self._fases.append((nombre, inicio, duracion,
+                                threading.current_thread().name))
+
+    @contextmanager
+    def fase(self, nombre: str):
+        """Mide el bloque como una fase de la línea de tiempo"""
+        inicio = self._ms()
+        try:
+            yield
+        finally:
+            self._anotar(nombre, inicio, self._ms() - inicio)
+
+    def marcar(self, nombre: str):
+        """Anota un momento (fase de duración cero)"""
+        self._anotar(nombre, self._ms(), 0.0)
+
+    def en_segundo_plano(self, trabajo: Callable[[], None],
+                         calentamiento: Optional[Callable[[], None]] = None,
+                         nombre: str = "carga-datos"):
+        """Corre trabajo() en un hilo y levanta `listo` al terminar (aunque
+        falle: el error queda en `error`). calentamiento(), si se da, sigue
+        en el mismo hilo ya con `listo` arriba (p. ej. preparar índices)."""
+        def correr():
+            try:
+                trabajo()
+            except Exception as e:
+                print(f"Error al cargar datos: {e}")
+                self.error = e
+            finally:
+                self.marcar("datos listos")
+                self.listo.set()
+            if calentamiento is not None and self.error is None:
+                try:
+                    calentamiento()
+                except Exception as e:
+                    print(f"Error al preparar datos en segundo plano: {e}")
+        self._hilo = threading.Thread(target=correr, name=nombre, daemon=True)
+        self._hilo.start()
+
+    def terminado(self) -> bool:
+        """True cuando el hilo terminó, calentamiento incluido"""
+        return self._hilo is not None and not self._hilo.is_alive()
+
+    def esperar(self, timeout: Optional[float] = None) -> bool:
+        """Bloquea hasta que los datos estén listos (no llamar desde Tk
+        salvo al cerrar)"""
+        return self.listo.wait(timeout)
+
+    def fases(self) -> List[Fase]:
+        with self._lock:
+            return sorted(self._fases, key=lambda f: f[1])
+
+    def reporte(self) -> str:
+        """Línea de tiempo del arranque, una fase por renglón"""
+        lineas = ["Arranque (ms desde el inicio):"]
+        for nombre, inicio, duracion, hilo in self.fases():
+            lineas.append(f"  {inicio:>8.1f} +{duracion:>8.1f}  {nombre:<24} [{hilo}]")
+        return "\n".join(lineas)
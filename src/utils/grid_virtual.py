@@ -0,0 +1,236 @@
+"""
+Tabla virtual sobre ttk.Treeview
+Sólo existen en el Treeview las filas visibles; al desplazarse se
+reescriben sus valores con los elementos de la ventana actual del modelo.
+El costo de dibujar no depende del tamaño del catálogo.
+"""
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from src.utils.treeview_diff import TreeviewConLlaves
+
+# (id, título, ancho)
+Columna = Tuple[str, str, int]
+
+
+class ModeloFilas:
+    """Lista de elementos con orden por columna y ventana de filas.
+
+    Guarda referencias a los objetos (no textos formateados); el formato se
+    aplica sólo a las filas que se van a mostrar.
+    """
+
+    def __init__(self, llave: Callable[[Any], str],
+                 claves_orden: Dict[str, Callable[[Any], Any]]):
+        self.llave = llave
+        self.claves_orden = claves_orden
+        self.columna_orden: Optional[str] = None
+        self.descendente = False
+        self._origen: Sequence = []
+        self._elementos: Sequence = []
+        self._posiciones: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._elementos)
+
+    def __getitem__(self, indice: int):
+        return self._elementos[indice]
+
+    def cargar(self, elementos: Sequence):
+        """Reemplaza los elementos conservando el orden elegido"""
+        self._origen = elementos
+        self._aplicar_orden()
+
+    def ordenar(self, columna: str):
+        """Ordena por columna; repetir la columna invierte el sentido"""
+        if columna == self.columna_orden:
+            self.descendente = not self.descendente
+        else:
+            self.columna_orden = columna
+            self.descendente = False
+        self._aplicar_orden()
+
+    def reordenar(self):
+        """Vuelve a ordenar los mismos elementos (cambió el valor de la
+        columna de orden en alguno)"""
+        if self.columna_orden is not None:
+            self._aplicar_orden()
+
+    def _aplicar_orden(self):
+        if self.columna_orden is None:
+            self._elementos = self._origen
+        else:
+            self._elementos = sorted(self._origen,
+                                     key=self.claves_orden[self.columna_orden],
+                                     reverse=self.descendente)
+        self._posiciones = None
+
+    def ventana(self, inicio: int, cantidad: int) -> Sequence:
+        return self._elementos[inicio:inicio + cantidad]
+
+    def posicion(self, llave: str) -> Optional[int]:
+        """Posición de un elemento por su llave (índice construido al pedirlo)"""
+        if self._posiciones is None:
+            self._posiciones = {self.llave(e): i for i, e in enumerate(self._elementos)}
+        return self._posiciones.get(llave)
+
+
+class GridVirtual(ttk.Frame):
+    """Treeview paginado: scroll, orden por columna y conteo total"""
+
+    def __init__(self, parent, columnas: List[Columna], modelo: ModeloFilas,
+                 formatear: Callable[[Any], Tuple[tuple, tuple]]):
+        """formatear(elemento) -> (valores, tags) de una fila"""
+        super().__init__(parent)
+        self.columnas = columnas
+        self.modelo = modelo
+        self.formatear = formatear
+        self.inicio = 0
+        self.filas_visibles = 20
+        self._seleccion: Optional[str] = None
+
+        self.scrollbar_y = ttk.Scrollbar(self, command=self._scroll)
+        self.scrollbar_y.pack(side='right', fill='y')
+
+        self.lbl_conteo = ttk.Label(self, text="")
+        self.lbl_conteo.pack(side='bottom', anchor='w')
+
+        scrollbar_x = ttk.Scrollbar(self, orient='horizontal')
+        scrollbar_x.pack(side='bottom', fill='x')
+
+        self.tree = ttk.Treeview(self, columns=[c[0] for c in columnas],
+                                 show='headings', selectmode='browse',
+                                 height=self.filas_visibles,
+                                 xscrollcommand=scrollbar_x.set)
+        scrollbar_x.config(command=self.tree.xview)
+        for id_, titulo, ancho in columnas:
+            self.tree.heading(id_, text=titulo,
+                              command=lambda c=id_: self.ordenar(c))
+            self.tree.column(id_, width=ancho)
+        self.tree.pack(side='left', fill='both', expand=True)
+        # Las filas visibles usan la llave como iid: al desplazarse sólo
+        # entran y salen las filas de los extremos
+        self.filas = TreeviewConLlaves(self.tree)
+
+        self.tree.bind('<Configure>', self._al_redimensionar)
+        self.tree.bind('<<TreeviewSelect>>', self._al_seleccionar)
+        self.tree.bind('<MouseWheel>', self._rueda)
+        self.tree.bind('<Button-4>', lambda e: self.desplazar(-3))
+        self.tree.bind('<Button-5>', lambda e: self.desplazar(3))
+        for tecla, delta in (('<Up>', -1), ('<Down>', 1)):
+            self.tree.bind(tecla, lambda e, d=delta: self._mover_seleccion(d))
+        self.tree.bind('<Prior>', lambda e: self._mover_seleccion(-self.filas_visibles))
+        self.tree.bind('<Next>', lambda e: self._mover_seleccion(self.filas_visibles))
+
+    # Datos
+    def cargar(self, elementos: Sequence, desde_inicio: bool = True):
+        """Muestra otra lista de elementos (desde el principio o en la
+        misma posición, p. ej. al recargar tras editar)"""
+        self.modelo.cargar(elementos)
+        if desde_inicio:
+            self.inicio = 0
+        self.refrescar()
+
+    def refrescar(self, reordenar: bool = False):
+        """Vuelve a dibujar la ventana actual (p. ej. tras editar un elemento).
+
+        reordenar: si lo editado puede mover filas en el orden actual.
+        """
+        if reordenar:
+            self.modelo.reordenar()
+        self.inicio = max(0, min(self.inicio, len(self.modelo) - self.filas_visibles))
+        self._dibujar()
+
+    def ordenar(self, columna: str):
+        self.modelo.ordenar(columna)
+        flecha = ' ▼' if self.modelo.descendente else ' ▲'
+        for id_, titulo, _ in self.columnas:
+            self.tree.heading(id_, text=titulo + (flecha if id_ == columna else ''))
+        self.inicio = 0
+        posicion = self.modelo.posicion(self._seleccion) if self._seleccion is not None else None
+        if posicion is not None:
+            self._asegurar_visible(posicion)
+        self._dibujar()
+
+    def seleccion(self):
+        """Elemento seleccionado (o None)"""
+        if self._seleccion is None:
+            return None
+        posicion = self.modelo.posicion(self._seleccion)
+        return None if posicion is None else self.modelo[posicion]
+
+    def tag_configure(self, *args, **kwargs):
+        self.tree.tag_configure(*args, **kwargs)
+
+    # Desplazamiento
+    def desplazar(self, filas: int):
+        inicio = max(0, min(self.inicio + filas, len(self.modelo) - self.filas_visibles))
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._dibujar()
+        return 'break'
+
+    def _scroll(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento (moveto / scroll)"""
+        if accion == 'moveto':
+            self.desplazar(int(float(cantidad) * len(self.modelo)) - self.inicio)
+        elif accion == 'scroll':
+            paso = self.filas_visibles if unidad == 'pages' else 1
+            self.desplazar(int(cantidad) * paso)
+
+    def _rueda(self, event):
+        return self.desplazar(-3 if event.delta > 0 else 3)
+
+    def _asegurar_visible(self, posicion: int):
+        if posicion < self.inicio:
+            self.inicio = posicion
+        elif posicion >= self.inicio + self.filas_visibles:
+            self.inicio = posicion - self.filas_visibles + 1
+
+    def _mover_seleccion(self, delta: int):
+        if not len(self.modelo):
+            return 'break'
+        posicion = self.modelo.posicion(self._seleccion) if self._seleccion is not None else None
+        posicion = 0 if posicion is None else max(0, min(posicion + delta, len(self.modelo) - 1))
+        self._seleccion = self.modelo.llave(self.modelo[posicion])
+        self._asegurar_visible(posicion)
+        self._dibujar()
+        return 'break'
+
+    def _al_seleccionar(self, event):
+        seleccion = self.tree.selection()
+        if seleccion:
+            self._seleccion = seleccion[0]
+
+    def _al_redimensionar(self, event):
+        # Altura de fila medida sobre una fila ya dibujada
+        alto_fila, encabezado = 20, 25
+        if len(self.filas):
+            caja = self.tree.bbox(self.filas.llaves()[0])
+            if caja:
+                encabezado, alto_fila = caja[1], caja[3]
+        filas = max(1, (event.height - encabezado) // alto_fila)
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self.refrescar()
+
+    # Dibujo
+    def _dibujar(self):
+        """Sincroniza el Treeview con la ventana visible del modelo"""
+        ventana = self.modelo.ventana(self.inicio, self.filas_visibles)
+        llave = self.modelo.llave
+        formatear = self.formatear
+        self.filas.sincronizar((llave(e),) + formatear(e) for e in ventana)
+
+        if self._seleccion is not None and self.tree.exists(self._seleccion):
+            if self.tree.selection() != (self._seleccion,):
+                self.tree.selection_set(self._seleccion)
+            self.tree.focus(self._seleccion)
+
+        total = len(self.modelo)
+        if total:
+            fin = self.inicio + len(ventana)
+            self.scrollbar_y.set(self.inicio / total, fin / total)
+            self.lbl_conteo.config(text=f"Mostrando {self.inicio + 1}-{fin} de {total}")
+        else:
+            self.scrollbar_y.set(0, 1)
+            self.lbl_conteo.config(text="Sin resultados")
@@ -1,7 +1,13 @@
 """
 Módulo de Temas para la Aplicación
 Maneja temas claro y oscuro
+
+Los estilos ttk se cambian en App.configurar_estilo; los colores puestos
+directamente en un widget (foreground de una etiqueta, tags de un Treeview)
+se registran aquí para poder cambiarlos en su lugar sin reconstruir la
+interfaz.
 """
+import weakref
 
 class ThemeManager:
     """Gestor de temas de la aplicación"""
@@ -70,6 +76,43 @@ class ThemeManager:
         """Inicializa el gestor de temas"""
         self.current_theme = self.LIGHT_THEME if theme_name == 'light' else self.DARK_THEME
         self.theme_name = theme_name
+        # widget -> {opción: llave de color}; se olvidan solos al destruirse
+        self._widgets = weakref.WeakKeyDictionary()
+        # Treeview (o GridVirtual) -> {tag: {opción: llave de color}}
+        self._tags = weakref.WeakKeyDictionary()
+    
+    def _colores(self, opciones):
+        return {opcion: self.get_color(llave) for opcion, llave in opciones.items()}
+    
+    def register(self, widget, **opciones):
+        """Registra un widget con colores propios (opción -> llave de color,
+        p. ej. foreground='accent_primary'). Se aplican ya y en cada cambio
+        de tema. Regresa el widget."""
+        widget.configure(**self._colores(opciones))
+        self._widgets[widget] = opciones
+        return widget
+    
+    def register_tag(self, tree, tag, **opciones):
+        """Registra los colores de un tag de Treeview (o de GridVirtual)"""
+        tree.tag_configure(tag, **self._colores(opciones))
+        self._tags.setdefault(tree, {})[tag] = opciones
+    
+    def apply_registered(self):
+        """Aplica el tema actual a los widgets registrados que siguen vivos.
+
+        Regresa cuántos widgets y tags se actualizaron.
+        """
+        aplicados = 0
+        for widget, opciones in list(self._widgets.items()):
+            if widget.winfo_exists():
+                widget.configure(**self._colores(opciones))
+                aplicados += 1
+        for tree, tags in list(self._tags.items()):
+            if tree.winfo_exists():
+                for tag, opciones in tags.items():
+                    tree.tag_configure(tag, **self._colores(opciones))
+                    aplicados += 1
+        return aplicados
     
     def get_color(self, color_key):
         """Obtiene un color del tema actual"""
@@ -0,0 +1,87 @@
+"""
+Actualización por diferencias de un ttk.Treeview
+Cada fila tiene una llave (iid) estable: al sincronizar sólo se borran,
+insertan, modifican o mueven las filas que cambiaron, en vez de vaciar la
+tabla y volver a llenarla.
+"""
+from tkinter import ttk
+from typing import Dict, Iterable, Tuple
+
+# (llave, valores, tags)
+Fila = Tuple[str, tuple, tuple]
+
+
+class TreeviewConLlaves:
+    """Recuerda lo que muestra cada fila de un Treeview para aplicarle
+    sólo las diferencias. Todas las altas y bajas de filas de ese Treeview
+    deben pasar por aquí."""
+
+    def __init__(self, tree: ttk.Treeview, padre: str = ''):
+        self.tree = tree
+        self.padre = padre
+        self._orden = []
+        self._filas: Dict[str, Tuple[tuple, tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self._orden)
+
+    def llaves(self):
+        """Llaves en el orden en que se muestran"""
+        return list(self._orden)
+
+    def sincronizar(self, filas: Iterable[Fila]):
+        """Deja el Treeview mostrando exactamente `filas`, en ese orden"""
+        nuevas = []
+        contenido = {}
+        for llave, valores, tags in filas:
+            llave = str(llave)
+            nuevas.append(llave)
+            contenido[llave] = (tuple(valores), tuple(tags))
+
+        sobrantes = [llave for llave in self._orden if llave not in contenido]
+        if sobrantes:
+            self.tree.delete(*sobrantes)
+            for llave in sobrantes:
+                del self._filas[llave]
+            actual = [llave for llave in self._orden if llave in contenido]
+        else:
+            actual = self._orden
+
+        tree = self.tree
+        for posicion, llave in enumerate(nuevas):
+            valores, tags = contenido[llave]
+            anterior = self._filas.get(llave)
+            if anterior is None:
+                tree.insert(self.padre, posicion, iid=llave, values=valores, tags=tags)
+                actual.insert(posicion, llave)
+            else:
+                if anterior != (valores, tags):
+                    tree.item(llave, values=valores, tags=tags)
+                if posicion >= len(actual) or actual[posicion] != llave:
+                    tree.move(llave, self.padre, posicion)
+                    actual.remove(llave)
+                    actual.insert(posicion, llave)
+            self._filas[llave] = (valores, tags)
+
+        self._orden = nuevas
+
+    def poner(self, llave, valores: tuple, tags: tuple = ()):
+        """Actualiza una sola fila, o la agrega al final si no existe"""
+        llave = str(llave)
+        valores, tags = tuple(valores), tuple(tags)
+        anterior = self._filas.get(llave)
+        if anterior is None:
+            self.tree.insert(self.padre, 'end', iid=llave, values=valores, tags=tags)
+            self._orden.append(llave)
+        elif anterior != (valores, tags):
+            self.tree.item(llave, values=valores, tags=tags)
+        self._filas[llave] = (valores, tags)
+
+    def quitar(self, llave):
+        llave = str(llave)
+        if self._filas.pop(llave, None) is not None:
+            self.tree.delete(llave)
+            self._orden.remove(llave)
+
+    def limpiar(self):
+        self.sincronizar(())
@@ -1,10 +1,25 @@
 """
 Paquete de vistas
+Las pantallas se importan al pedirlas (PEP 562): al arrancar sólo hace
+falta el login.
 """
-from .login_view import LoginView
-from .main_view import MainView
-from .ventas_view import VentasView
-from .inventario_view import InventarioView
-from .reportes_view import ReportesView
+import importlib
 
-__all__ = ['LoginView', 'MainView', 'VentasView', 'InventarioView', 'ReportesView']
+_MODULOS = {
+    'LoginView': '.login_view',
+    'MainView': '.main_view',
+    'VentasView': '.ventas_view',
+    'InventarioView': '.inventario_view',
+    'ReportesView': '.reportes_view',
+}
+
+__all__ = list(_MODULOS)
+
+
+def __getattr__(nombre):
+    modulo = _MODULOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo, __name__), nombre)
+    globals()[nombre] = valor
+    return valor
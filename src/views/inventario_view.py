@@ -4,15 +4,31 @@ Gestión de productos
 """
 import tkinter as tk
 from tkinter import ttk, messagebox
+from src.controllers.producto_controller import CAMBIO_STOCK
+from src.models.internado import internar
 from src.models.producto import Producto
+from src.services.indice_trigramas import normalizar
+from src.utils.grid_virtual import GridVirtual, ModeloFilas
 
 class InventarioView(ttk.Frame):
+    # Espera tras la última tecla antes de filtrar
+    DEBOUNCE_MS = 200
+    
     def __init__(self, parent, app, usuario):
         super().__init__(parent)
         self.app = app
         self.usuario = usuario
         self.pack(fill='both', expand=True)
         
+        # Estado de la búsqueda incremental
+        self._filtro_pendiente = None
+        self._filtro_aplicado = None
+        self._ultimo_termino = ""
+        self._resultados_texto = None
+        self._por_categoria = {}
+        # Versión del catálogo que muestra la tabla
+        self._version = None
+        
         self.crear_interfaz()
         self.cargar_productos()
     
@@ -30,7 +46,8 @@ class InventarioView(ttk.Frame):
         ttk.Label(frame_controles, text="Buscar:").pack(side='left', padx=5)
         self.entry_buscar = ttk.Entry(frame_controles, width=30)
         self.entry_buscar.pack(side='left', padx=5)
-        self.entry_buscar.bind('<KeyRelease>', lambda e: self.filtrar_productos())
+        self.entry_buscar.bind('<KeyRelease>', self.programar_filtro)
+        self.entry_buscar.bind('<Return>', lambda e: self.filtrar_productos())
         
         ttk.Button(frame_controles, text="🔍 Buscar",
                   command=self.filtrar_productos).pack(side='left', padx=5)
@@ -66,42 +83,29 @@ class InventarioView(ttk.Frame):
         ttk.Button(frame_acciones, text="🗑️ Eliminar",
                   command=self.eliminar_producto).pack(side='left', padx=5)
         
-        # Tabla de productos
-        frame_tabla = ttk.Frame(self)
-        frame_tabla.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        scrollbar_y = ttk.Scrollbar(frame_tabla)
-        scrollbar_y.pack(side='right', fill='y')
-        
-        scrollbar_x = ttk.Scrollbar(frame_tabla, orient='horizontal')
-        scrollbar_x.pack(side='bottom', fill='x')
-        
-        self.tree = ttk.Treeview(frame_tabla,
-                                columns=('codigo', 'nombre', 'categoria', 'precio',
-                                        'precio_compra', 'stock', 'proveedor'),
-                                show='headings',
-                                yscrollcommand=scrollbar_y.set,
-                                xscrollcommand=scrollbar_x.set)
-        
-        self.tree.heading('codigo', text='Código de Barras')
-        self.tree.heading('nombre', text='Nombre')
-        self.tree.heading('categoria', text='Categoría')
-        self.tree.heading('precio', text='Precio Venta')
-        self.tree.heading('precio_compra', text='Precio Compra')
-        self.tree.heading('stock', text='Stock')
-        self.tree.heading('proveedor', text='Proveedor')
-        
-        self.tree.column('codigo', width=120)
-        self.tree.column('nombre', width=250)
-        self.tree.column('categoria', width=100)
-        self.tree.column('precio', width=100)
-        self.tree.column('precio_compra', width=100)
-        self.tree.column('stock', width=80)
-        self.tree.column('proveedor', width=150)
-        
-        self.tree.pack(side='left', fill='both', expand=True)
-        scrollbar_y.config(command=self.tree.yview)
-        scrollbar_x.config(command=self.tree.xview)
+        # Tabla de productos (virtual: sólo se dibujan las filas visibles)
+        modelo = ModeloFilas(
+            llave=lambda p: p.codigo_barras,
+            claves_orden={
+                'codigo': lambda p: p.codigo_barras,
+                'nombre': lambda p: p.nombre.casefold(),
+                'categoria': lambda p: p.categoria,
+                'precio': lambda p: p.precio,
+                'precio_compra': lambda p: p.precio_compra,
+                'stock': lambda p: p.stock,
+                'proveedor': lambda p: p.proveedor.casefold()
+            })
+        self.grid = GridVirtual(self, [
+            ('codigo', 'Código de Barras', 120),
+            ('nombre', 'Nombre', 250),
+            ('categoria', 'Categoría', 100),
+            ('precio', 'Precio Venta', 100),
+            ('precio_compra', 'Precio Compra', 100),
+            ('stock', 'Stock', 80),
+            ('proveedor', 'Proveedor', 150)
+        ], modelo, self.formatear_fila)
+        self.grid.pack(fill='both', expand=True, padx=10, pady=5)
+        self.app.theme_manager.register_tag(self.grid, 'stock_bajo', background='stock_low')
         
         # Información de stock bajo
         frame_info = ttk.Frame(self)
@@ -109,38 +113,39 @@ class InventarioView(ttk.Frame):
         
         self.lbl_stock_bajo = ttk.Label(frame_info,
                                        text="",
-                                       foreground='red',
                                        font=('Arial', 9, 'bold'))
+        self.app.theme_manager.register(self.lbl_stock_bajo, foreground='error')
         self.lbl_stock_bajo.pack(side='left')
     
-    def cargar_productos(self):
+    @staticmethod
+    def formatear_fila(producto):
+        """Valores y tags de la fila de un producto"""
+        # Resaltar productos con stock bajo
+        tags = ('stock_bajo',) if producto.stock <= 10 else ()
+        return (
+            producto.codigo_barras,
+            producto.nombre,
+            producto.categoria,
+            f"${producto.precio:.2f}",
+            f"${producto.precio_compra:.2f}",
+            producto.stock,
+            producto.proveedor
+        ), tags
+    
+    def cargar_productos(self, desde_inicio=True):
         """Carga todos los productos"""
-        # Limpiar tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
+        # El catálogo pudo cambiar: descartar resultados y listas guardadas
+        self._filtro_aplicado = None
+        self._ultimo_termino = ""
+        self._resultados_texto = None
+        self._por_categoria = {}
+        self._version = self.app.producto_controller.version
         productos = self.app.producto_controller.obtener_todos_productos()
-        
-        for producto in productos:
-            # Resaltar productos con stock bajo
-            tags = ()
-            if producto.stock <= 10:
-                tags = ('stock_bajo',)
-            
-            self.tree.insert('', 'end', values=(
-                producto.codigo_barras,
-                producto.nombre,
-                producto.categoria,
-                f"${producto.precio:.2f}",
-                f"${producto.precio_compra:.2f}",
-                producto.stock,
-                producto.proveedor
-            ), tags=tags)
-        
-        # Configurar tag para stock bajo
-        self.tree.tag_configure('stock_bajo', background='#FFCDD2')
-        
-        # Actualizar información de stock bajo
+        self.grid.cargar(productos, desde_inicio)
+        self.actualizar_stock_bajo()
+    
+    def actualizar_stock_bajo(self):
+        """Actualiza la información de stock bajo"""
         productos_bajo_stock = self.app.producto_controller.obtener_productos_bajo_stock()
         if productos_bajo_stock:
             self.lbl_stock_bajo.config(
@@ -149,91 +154,128 @@ class InventarioView(ttk.Frame):
         else:
             self.lbl_stock_bajo.config(text="✅ Stock adecuado en todos los productos")
     
-    def filtrar_productos(self):
-        """Filtra productos según búsqueda y categoría"""
-        termino = self.entry_buscar.get().strip().lower()
-        categoria = self.combo_categoria.get()
+    def recargar_productos(self):
+        """Recarga tras editar sin perder la posición en la tabla"""
+        self.cargar_productos(desde_inicio=False)
+    
+    def refresh(self):
+        """Aplica los cambios del catálogo hechos mientras la vista estaba
+        oculta (la llama MainView al volver a mostrarla)"""
+        controller = self.app.producto_controller
+        cambios = controller.cambios_desde(self._version)
+        if cambios == {}:
+            return
+        self._version = controller.version
+        if cambios is not None and all(t == CAMBIO_STOCK for t in cambios.values()):
+            # Sólo cambió el stock (p. ej. ventas): los filtros siguen
+            # valiendo, basta redibujar las filas visibles
+            self.grid.refrescar(reordenar=self.grid.modelo.columna_orden == 'stock')
+            self.actualizar_stock_bajo()
+            return
         
-        # Limpiar tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Altas, bajas o ediciones: rehacer el filtro actual en la misma posición
+        categorias = ['Todas'] + controller.obtener_todas_categorias()
+        self.combo_categoria.config(values=categorias)
+        if self.combo_categoria.get() not in categorias:
+            self.combo_categoria.set('Todas')
+        self._filtro_aplicado = None
+        self._ultimo_termino = ""
+        self._resultados_texto = None
+        self._por_categoria = {}
+        self.filtrar_productos(desde_inicio=False)
+        self.actualizar_stock_bajo()
+    
+    def destroy(self):
+        if self._filtro_pendiente is not None:
+            self.after_cancel(self._filtro_pendiente)
+            self._filtro_pendiente = None
+        super().destroy()
+    
+    def programar_filtro(self, event=None):
+        """Filtra al dejar de teclear; cada tecla cancela el filtro pendiente"""
+        if self._filtro_pendiente is not None:
+            self.after_cancel(self._filtro_pendiente)
+        self._filtro_pendiente = self.after(self.DEBOUNCE_MS, self.filtrar_productos)
+    
+    def filtrar_productos(self, desde_inicio=True):
+        """Filtra productos según búsqueda y categoría"""
+        if self._filtro_pendiente is not None:
+            self.after_cancel(self._filtro_pendiente)
+            self._filtro_pendiente = None
         
-        productos = self.app.producto_controller.obtener_todos_productos()
+        termino = self.entry_buscar.get().strip()
+        categoria = self.combo_categoria.get()
+        # Teclas que no cambian el texto (flechas, Shift) no vuelven a filtrar
+        if (termino, categoria) == self._filtro_aplicado:
+            return
+        self._filtro_aplicado = (termino, categoria)
+        
+        if termino:
+            # Si el término extiende al anterior basta con acotar sus resultados
+            previos = None
+            if (self._resultados_texto is not None
+                    and normalizar(self._ultimo_termino) in normalizar(termino)):
+                previos = self._resultados_texto
+            if termino != self._ultimo_termino or previos is None:
+                self._resultados_texto = self.app.producto_controller.buscar_por_texto(
+                    termino, dentro_de=previos)
+                self._ultimo_termino = termino
+            productos = self._resultados_texto
+            if categoria != 'Todas':
+                productos = [p for p in productos if p.categoria == categoria]
+        else:
+            self._ultimo_termino = ""
+            self._resultados_texto = None
+            if categoria != 'Todas':
+                productos = self.productos_de_categoria(categoria)
+            else:
+                productos = self.app.producto_controller.obtener_todos_productos()
         
-        for producto in productos:
-            # Filtrar por categoría
-            if categoria != 'Todas' and producto.categoria != categoria:
-                continue
-            
-            # Filtrar por término de búsqueda
-            if termino:
-                if (termino not in producto.nombre.lower() and
-                    termino not in producto.codigo_barras.lower()):
-                    continue
-            
-            tags = ()
-            if producto.stock <= 10:
-                tags = ('stock_bajo',)
-            
-            self.tree.insert('', 'end', values=(
-                producto.codigo_barras,
-                producto.nombre,
-                producto.categoria,
-                f"${producto.precio:.2f}",
-                f"${producto.precio_compra:.2f}",
-                producto.stock,
-                producto.proveedor
-            ), tags=tags)
-        
-        self.tree.tag_configure('stock_bajo', background='#FFCDD2')
+        self.grid.cargar(productos, desde_inicio)
+    
+    def productos_de_categoria(self, categoria):
+        """Lista de la categoría, calculada una vez por carga del catálogo"""
+        productos = self._por_categoria.get(categoria)
+        if productos is None:
+            productos = self.app.producto_controller.buscar_por_categoria(categoria)
+            self._por_categoria[categoria] = productos
+        return productos
     
     def nuevo_producto(self):
         """Abre ventana para crear nuevo producto"""
-        ProductoDialog(self, self.app, None, self.cargar_productos)
+        ProductoDialog(self, self.app, None, self.recargar_productos)
     
     def editar_producto(self):
         """Edita el producto seleccionado"""
-        seleccion = self.tree.selection()
-        if not seleccion:
+        producto = self.grid.seleccion()
+        if not producto:
             messagebox.showwarning("Advertencia", "Seleccione un producto")
             return
         
-        item = self.tree.item(seleccion[0])
-        codigo = item['values'][0]
-        producto = self.app.producto_controller.buscar_por_codigo(codigo)
-        
-        ProductoDialog(self, self.app, producto, self.cargar_productos)
+        ProductoDialog(self, self.app, producto, self.recargar_productos)
     
     def ajustar_stock(self):
         """Ajusta el stock del producto seleccionado"""
-        seleccion = self.tree.selection()
-        if not seleccion:
+        producto = self.grid.seleccion()
+        if not producto:
             messagebox.showwarning("Advertencia", "Seleccione un producto")
             return
         
-        item = self.tree.item(seleccion[0])
-        codigo = item['values'][0]
-        producto = self.app.producto_controller.buscar_por_codigo(codigo)
-        
-        StockDialog(self, self.app, producto, self.cargar_productos)
+        StockDialog(self, self.app, producto, self.recargar_productos)
     
     def eliminar_producto(self):
         """Elimina el producto seleccionado"""
-        seleccion = self.tree.selection()
-        if not seleccion:
+        producto = self.grid.seleccion()
+        if not producto:
             messagebox.showwarning("Advertencia", "Seleccione un producto")
             return
         
-        item = self.tree.item(seleccion[0])
-        codigo = item['values'][0]
-        nombre = item['values'][1]
-        
         respuesta = messagebox.askyesno("Confirmar",
-                                        f"¿Desea eliminar el producto?\n{nombre}")
+                                        f"¿Desea eliminar el producto?\n{producto.nombre}")
         if respuesta:
-            if self.app.producto_controller.eliminar_producto(codigo):
+            if self.app.producto_controller.eliminar_producto(producto.codigo_barras):
                 messagebox.showinfo("Éxito", "Producto eliminado correctamente")
-                self.cargar_productos()
+                self.recargar_productos()
             else:
                 messagebox.showerror("Error", "No se pudo eliminar el producto")
 
@@ -335,12 +377,14 @@ class ProductoDialog:
         try:
             codigo = self.entry_codigo.get().strip()
             nombre = self.entry_nombre.get().strip()
-            categoria = self.combo_categoria.get().strip()
+            # Al editar se asignan directo al producto: se internan igual
+            # que en Producto.__init__
+            categoria = internar(self.combo_categoria.get().strip())
             precio = float(self.entry_precio.get().strip())
             precio_compra = float(self.entry_precio_compra.get().strip() or 0)
             stock = int(self.entry_stock.get().strip())
-            unidad = self.combo_unidad.get()
-            proveedor = self.entry_proveedor.get().strip()
+            unidad = internar(self.combo_unidad.get())
+            proveedor = internar(self.entry_proveedor.get().strip())
             
             if not codigo or not nombre or not categoria:
                 messagebox.showwarning("Advertencia",
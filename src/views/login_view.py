@@ -19,12 +19,11 @@ class LoginView(ttk.Frame):
         frame_tema = ttk.Frame(self)
         frame_tema.place(relx=1.0, rely=0.0, anchor='ne', x=-10, y=10)
         
-        tema_icono = "🌙" if self.app.theme_manager.get_theme_name() == 'light' else "☀️"
-        btn_tema = ttk.Button(frame_tema,
-                             text=tema_icono,
-                             command=self.cambiar_tema,
-                             width=3)
-        btn_tema.pack()
+        self.btn_tema = ttk.Button(frame_tema,
+                                   text=self.icono_tema(),
+                                   command=self.cambiar_tema,
+                                   width=3)
+        self.btn_tema.pack()
         
         # Frame central
         frame_central = ttk.Frame(self)
@@ -100,9 +99,14 @@ class LoginView(ttk.Frame):
                  font=('Arial', 8),
                  foreground='gray').pack()
     
+    def icono_tema(self):
+        """Ícono del botón de tema (el tema al que cambia)"""
+        return "🌙" if self.app.theme_manager.get_theme_name() == 'light' else "☀️"
+    
     def cambiar_tema(self):
-        """Cambia el tema de la aplicación"""
+        """Cambia el tema de la aplicación (en su lugar, sin reconstruir)"""
         self.app.toggle_theme()
+        self.btn_tema.config(text=self.icono_tema())
     
     def hacer_login(self):
         """Procesa el login"""
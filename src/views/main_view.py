@@ -2,12 +2,8 @@
 Vista Principal del Sistema
 Contiene el menú y las diferentes secciones
 """
-import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
-from src.views.ventas_view import VentasView
-from src.views.inventario_view import InventarioView
-from src.views.reportes_view import ReportesView
 
 class MainView(ttk.Frame):
     def __init__(self, parent, app, usuario):
@@ -17,6 +13,9 @@ class MainView(ttk.Frame):
         self.pack(fill='both', expand=True)
         
         self.vista_actual = None
+        # Vistas de navegación ya construidas (nombre -> vista): al cambiar
+        # de sección se ocultan en vez de destruirse
+        self.vistas = {}
         self.crear_interfaz()
     
     def crear_interfaz(self):
@@ -27,12 +26,13 @@ class MainView(ttk.Frame):
         frame_superior.pack_propagate(False)
         
         # Título
-        ttk.Label(
+        lbl_titulo = ttk.Label(
             frame_superior,
             text="🏪 TIENDA PUMMAS",
-            font=('Arial', 18, 'bold'),
-            foreground=self.app.color_primario
-        ).pack(side='left', padx=20, pady=10)
+            font=('Arial', 18, 'bold')
+        )
+        self.app.theme_manager.register(lbl_titulo, foreground='accent_primary')
+        lbl_titulo.pack(side='left', padx=20, pady=10)
         
         # Información del usuario
         frame_usuario = ttk.Frame(frame_superior)
@@ -44,18 +44,19 @@ class MainView(ttk.Frame):
         ttk.Label(frame_usuario,
                  text=f"Rol: {self.usuario.rol.value}",
                  font=('Arial', 9)).pack(anchor='e')
+        self.lbl_guardado = ttk.Label(frame_usuario, text="", font=('Arial', 8))
+        self.lbl_guardado.pack(anchor='e')
         
         # Frame de botones
         frame_botones = ttk.Frame(frame_usuario)
         frame_botones.pack(anchor='e', pady=5)
         
         # Botón cambiar tema
-        tema_icono = "🌙" if self.app.theme_manager.get_theme_name() == 'light' else "☀️"
-        btn_tema = ttk.Button(frame_botones,
-                             text=tema_icono,
-                             command=self.cambiar_tema,
-                             width=3)
-        btn_tema.pack(side='left', padx=2)
+        self.btn_tema = ttk.Button(frame_botones,
+                                   text=self.icono_tema(),
+                                   command=self.cambiar_tema,
+                                   width=3)
+        self.btn_tema.pack(side='left', padx=2)
         
         btn_cerrar_sesion = ttk.Button(frame_botones,
                                        text="Cerrar Sesión",
@@ -122,11 +123,30 @@ class MainView(ttk.Frame):
         btn.pack(pady=5, padx=10, fill='x')
     
     def limpiar_area_principal(self):
-        """Limpia el área principal"""
+        """Limpia el área principal (oculta las vistas guardadas)"""
         if self.vista_actual:
-            self.vista_actual.destroy()
+            if self.vista_actual in self.vistas.values():
+                self.vista_actual.pack_forget()
+            else:
+                self.vista_actual.destroy()
             self.vista_actual = None
     
+    def mostrar_vista(self, nombre, clase):
+        """Muestra una vista de navegación; se construye sólo la primera
+        vez, después se vuelve a empacar y se le aplican los cambios con
+        refresh()"""
+        vista = self.vistas.get(nombre)
+        if vista is not None and vista is self.vista_actual:
+            vista.refresh()
+            return
+        self.limpiar_area_principal()
+        if vista is None:
+            vista = self.vistas[nombre] = clase(self.area_principal, self.app, self.usuario)
+        else:
+            vista.pack(fill='both', expand=True)
+            vista.refresh()
+        self.vista_actual = vista
+    
     def mostrar_inicio(self):
         """Muestra la vista de inicio"""
         self.limpiar_area_principal()
@@ -146,18 +166,19 @@ class MainView(ttk.Frame):
     
     def mostrar_ventas(self):
         """Muestra la vista de ventas"""
-        self.limpiar_area_principal()
-        self.vista_actual = VentasView(self.area_principal, self.app, self.usuario)
+        # Las pantallas se importan al abrirlas por primera vez
+        from src.views.ventas_view import VentasView
+        self.mostrar_vista('ventas', VentasView)
     
     def mostrar_inventario(self):
         """Muestra la vista de inventario"""
-        self.limpiar_area_principal()
-        self.vista_actual = InventarioView(self.area_principal, self.app, self.usuario)
+        from src.views.inventario_view import InventarioView
+        self.mostrar_vista('inventario', InventarioView)
     
     def mostrar_reportes(self):
         """Muestra la vista de reportes"""
-        self.limpiar_area_principal()
-        self.vista_actual = ReportesView(self.area_principal, self.app, self.usuario)
+        from src.views.reportes_view import ReportesView
+        self.mostrar_vista('reportes', ReportesView)
     
     def mostrar_configuracion(self):
         """Muestra la vista de configuración"""
@@ -183,6 +204,15 @@ class MainView(ttk.Frame):
         if respuesta:
             self.app.cerrar_sesion()
     
+    def mostrar_estado_guardado(self, texto):
+        """Estado de la última escritura en segundo plano (lo llama App)"""
+        self.lbl_guardado.config(text=texto)
+    
+    def icono_tema(self):
+        """Ícono del botón de tema (el tema al que cambia)"""
+        return "🌙" if self.app.theme_manager.get_theme_name() == 'light' else "☀️"
+    
     def cambiar_tema(self):
-        """Cambia el tema de la aplicación"""
+        """Cambia el tema de la aplicación (en su lugar, sin reconstruir)"""
         self.app.toggle_theme()
+        self.btn_tema.config(text=self.icono_tema())
@@ -1,18 +1,38 @@
 """
 Vista de Reportes
 """
-import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime, timedelta
+from tkinter import ttk
+from datetime import datetime
+from src.services.punto_de_venta import rango_periodo
+from src.utils.treeview_diff import TreeviewConLlaves
 
 class ReportesView(ttk.Frame):
     def __init__(self, parent, app, usuario):
         super().__init__(parent)
         self.app = app
         self.usuario = usuario
+        self.punto_de_venta = self.app.punto_de_venta
         self.pack(fill='both', expand=True)
         
+        # Período mostrado en la pestaña de ventas
+        self.periodo_ventas = 'hoy'
         self.crear_interfaz()
+        # Versiones de ventas y catálogo con las que se llenaron las pestañas
+        self._version_ventas = self.app.venta_controller.version
+        self._version_productos = self.app.producto_controller.version
+    
+    def refresh(self):
+        """Al volver a mostrar la vista: recarga sólo las pestañas cuyos
+        datos cambiaron mientras estaba oculta"""
+        venta_controller = self.app.venta_controller
+        producto_controller = self.app.producto_controller
+        if venta_controller.version != self._version_ventas:
+            self._version_ventas = venta_controller.version
+            self.cargar_reporte_ventas(self.periodo_ventas)
+            self.cargar_productos_mas_vendidos(self.dias_mas_vendidos)
+        if producto_controller.version != self._version_productos:
+            self._version_productos = producto_controller.version
+            self.cargar_estado_inventario()
     
     def crear_interfaz(self):
         """Crea la interfaz de reportes"""
@@ -75,8 +95,8 @@ class ReportesView(ttk.Frame):
         ttk.Label(col1, text="Total Dinero:",
                  font=('Arial', 10)).grid(row=1, column=0, sticky='w', pady=5)
         self.lbl_total_dinero = ttk.Label(col1, text="$0.00",
-                                         font=('Arial', 12, 'bold'),
-                                         foreground=self.app.color_primario)
+                                         font=('Arial', 12, 'bold'))
+        self.app.theme_manager.register(self.lbl_total_dinero, foreground='accent_primary')
         self.lbl_total_dinero.grid(row=1, column=1, sticky='e', padx=10, pady=5)
         
         # Columna 2
@@ -120,6 +140,7 @@ class ReportesView(ttk.Frame):
         self.tree_ventas.column('metodo', width=120)
         
         self.tree_ventas.pack(side='left', fill='both', expand=True)
+        self.filas_ventas = TreeviewConLlaves(self.tree_ventas)
         scrollbar.config(command=self.tree_ventas.yview)
         
         # Cargar datos del día
@@ -133,6 +154,19 @@ class ReportesView(ttk.Frame):
         ttk.Label(frame, text="Productos Más Vendidos",
                  font=('Arial', 12, 'bold')).pack(pady=10)
         
+        # Controles de período (None = todo el historial)
+        self.dias_mas_vendidos = None
+        frame_periodo = ttk.Frame(frame)
+        frame_periodo.pack(fill='x', padx=10)
+        
+        ttk.Label(frame_periodo, text="Período:",
+                 font=('Arial', 10, 'bold')).pack(side='left', padx=5)
+        
+        for texto, dias in (("Hoy", 1), ("7 días", 7), ("30 días", 30), ("Todo", None)):
+            ttk.Button(frame_periodo, text=texto,
+                      command=lambda d=dias: self.cargar_productos_mas_vendidos(d)).pack(
+                          side='left', padx=2)
+        
         frame_tabla = ttk.Frame(frame)
         frame_tabla.pack(fill='both', expand=True, padx=10, pady=10)
         
@@ -155,10 +189,12 @@ class ReportesView(ttk.Frame):
         self.tree_productos.column('total', width=150)
         
         self.tree_productos.pack(side='left', fill='both', expand=True)
+        self.filas_productos = TreeviewConLlaves(self.tree_productos)
         scrollbar.config(command=self.tree_productos.yview)
         
         ttk.Button(frame, text="🔄 Actualizar",
-                  command=self.cargar_productos_mas_vendidos).pack(pady=10)
+                  command=lambda: self.cargar_productos_mas_vendidos(
+                      self.dias_mas_vendidos)).pack(pady=10)
         
         self.cargar_productos_mas_vendidos()
     
@@ -174,28 +210,22 @@ class ReportesView(ttk.Frame):
         frame_resumen = ttk.LabelFrame(frame, text="Resumen", padding=10)
         frame_resumen.pack(fill='x', padx=10, pady=10)
         
-        productos = self.app.producto_controller.obtener_todos_productos()
-        total_productos = len(productos)
-        total_valor = sum(p.precio * p.stock for p in productos)
-        productos_bajo_stock = len(self.app.producto_controller.obtener_productos_bajo_stock())
-        
-        info = [
-            ("Total de Productos:", str(total_productos)),
-            ("Valor Total Inventario:", f"${total_valor:,.2f}"),
-            ("Productos con Stock Bajo:", str(productos_bajo_stock))
-        ]
-        
-        for i, (etiqueta, valor) in enumerate(info):
+        self.lbls_inventario = []
+        for i, etiqueta in enumerate(("Total de Productos:",
+                                      "Valor Total Inventario:",
+                                      "Productos con Stock Bajo:")):
             ttk.Label(frame_resumen, text=etiqueta,
                      font=('Arial', 10)).grid(row=i, column=0, sticky='w', pady=5)
-            ttk.Label(frame_resumen, text=valor,
-                     font=('Arial', 11, 'bold')).grid(row=i, column=1, sticky='e',
-                                                     padx=20, pady=5)
+            lbl = ttk.Label(frame_resumen, text="",
+                           font=('Arial', 11, 'bold'))
+            lbl.grid(row=i, column=1, sticky='e', padx=20, pady=5)
+            self.lbls_inventario.append(lbl)
         
         # Productos con stock bajo
-        ttk.Label(frame, text="⚠️ Productos con Stock Bajo:",
-                 font=('Arial', 10, 'bold'),
-                 foreground='red').pack(padx=10, pady=10, anchor='w')
+        lbl_alerta = ttk.Label(frame, text="⚠️ Productos con Stock Bajo:",
+                              font=('Arial', 10, 'bold'))
+        self.app.theme_manager.register(lbl_alerta, foreground='error')
+        lbl_alerta.pack(padx=10, pady=10, anchor='w')
         
         frame_tabla = ttk.Frame(frame)
         frame_tabla.pack(fill='both', expand=True, padx=10, pady=5)
@@ -217,73 +247,71 @@ class ReportesView(ttk.Frame):
         tree_stock.column('categoria', width=150)
         
         tree_stock.pack(side='left', fill='both', expand=True)
+        self.filas_stock = TreeviewConLlaves(tree_stock)
         scrollbar.config(command=tree_stock.yview)
         
-        # Cargar productos con stock bajo
-        productos_bajo = self.app.producto_controller.obtener_productos_bajo_stock()
-        for producto in productos_bajo:
-            tree_stock.insert('', 'end', values=(
+        self.app.theme_manager.register_tag(tree_stock, 'alerta', background='stock_low')
+        
+        self.cargar_estado_inventario()
+    
+    def cargar_estado_inventario(self):
+        """Carga el resumen del inventario y los productos con stock bajo"""
+        estado = self.punto_de_venta.estado_inventario()
+        productos_bajo = estado['bajo_stock']
+        
+        for lbl, valor in zip(self.lbls_inventario, (str(estado['total_productos']),
+                                                     f"${estado['valor']:,.2f}",
+                                                     str(len(productos_bajo)))):
+            lbl.config(text=valor)
+        
+        # Sólo las filas que cambiaron
+        self.filas_stock.sincronizar(
+            (producto.codigo_barras, (
                 producto.nombre,
                 f"{producto.stock} {producto.unidad}",
                 producto.categoria
-            ), tags=('alerta',))
-        
-        tree_stock.tag_configure('alerta', background='#FFCDD2')
+            ), ('alerta',))
+            for producto in productos_bajo)
     
     def cargar_reporte_ventas(self, periodo):
         """Carga el reporte de ventas según el período"""
-        hoy = datetime.now()
-        
-        if periodo == 'hoy':
-            fecha_inicio = hoy.strftime("%Y-%m-%d")
-            fecha_fin = fecha_inicio
-        elif periodo == 'semana':
-            fecha_inicio = (hoy - timedelta(days=7)).strftime("%Y-%m-%d")
-            fecha_fin = hoy.strftime("%Y-%m-%d")
-        elif periodo == 'mes':
-            fecha_inicio = (hoy - timedelta(days=30)).strftime("%Y-%m-%d")
-            fecha_fin = hoy.strftime("%Y-%m-%d")
-        
-        ventas = self.app.venta_controller.obtener_ventas_por_fecha(
-            fecha_inicio, fecha_fin)
-        
-        # Actualizar resumen
-        total_ventas = len(ventas)
-        total_dinero = sum(v.total for v in ventas)
-        promedio = total_dinero / total_ventas if total_ventas > 0 else 0
-        
-        self.lbl_total_ventas.config(text=str(total_ventas))
-        self.lbl_total_dinero.config(text=f"${total_dinero:,.2f}")
-        self.lbl_promedio_venta.config(text=f"${promedio:,.2f}")
-        
-        # Actualizar tabla
-        for item in self.tree_ventas.get_children():
-            self.tree_ventas.delete(item)
+        self.periodo_ventas = periodo
+        fecha_inicio, fecha_fin = rango_periodo(periodo)
+        
+        # Actualizar resumen (acumulados diarios, no recorre los tickets)
+        reporte = self.punto_de_venta.reporte(fecha_inicio, fecha_fin)
         
+        self.lbl_total_ventas.config(text=str(reporte['total_ventas']))
+        self.lbl_total_dinero.config(text=f"${reporte['total_dinero']:,.2f}")
+        self.lbl_promedio_venta.config(text=f"${reporte['promedio_venta']:,.2f}")
+        
+        ventas = self.punto_de_venta.ventas_del_periodo(fecha_inicio, fecha_fin)
+        
+        # Actualizar tabla (sólo las filas que cambiaron)
+        filas = []
         for venta in reversed(ventas):  # Más recientes primero
             fecha_hora = datetime.fromisoformat(venta.fecha).strftime("%d/%m/%Y %H:%M")
-            self.tree_ventas.insert('', 'end', values=(
+            filas.append((venta.folio, (
                 venta.folio,
                 fecha_hora,
                 venta.cajero,
-                len(venta.items),
+                venta.num_items,
                 f"${venta.total:.2f}",
                 venta.metodo_pago
-            ))
+            ), ()))
+        self.filas_ventas.sincronizar(filas)
     
-    def cargar_productos_mas_vendidos(self):
-        """Carga los productos más vendidos"""
-        productos_vendidos = self.app.venta_controller.obtener_productos_mas_vendidos(20)
-        
-        # Limpiar tabla
-        for item in self.tree_productos.get_children():
-            self.tree_productos.delete(item)
-        
-        # Cargar datos
-        for i, (codigo, datos) in enumerate(productos_vendidos, 1):
-            self.tree_productos.insert('', 'end', values=(
+    def cargar_productos_mas_vendidos(self, dias=None):
+        """Carga los productos más vendidos del período (días, None = todo)"""
+        self.dias_mas_vendidos = dias
+        productos_vendidos = self.punto_de_venta.mas_vendidos(20, dias=dias)
+        
+        # Cargar datos (sólo las filas que cambiaron)
+        self.filas_productos.sincronizar(
+            (codigo, (
                 i,
                 datos['nombre'],
                 f"{datos['cantidad']} unidades",
                 f"${datos['total']:,.2f}"
-            ))
+            ), ())
+            for i, (codigo, datos) in enumerate(productos_vendidos, 1))
@@ -2,9 +2,9 @@
 Vista de Ventas / Punto de Venta
 """
 import tkinter as tk
-from tkinter import ttk, messagebox
-from datetime import datetime
-from src.models.venta import Venta, ItemVenta
+from tkinter import ttk, messagebox, simpledialog
+from src.services.punto_de_venta import METODOS_PAGO
+from src.utils.treeview_diff import TreeviewConLlaves
 
 class VentasView(ttk.Frame):
     def __init__(self, parent, app, usuario):
@@ -13,7 +13,12 @@ class VentasView(ttk.Frame):
         self.usuario = usuario
         self.pack(fill='both', expand=True)
         
-        self.carrito = []
+        # Cobro, búsqueda y devoluciones viven en el servicio; aquí sólo se
+        # muestran sus resultados
+        self.punto_de_venta = self.app.punto_de_venta
+        self.carrito = self.punto_de_venta.nuevo_carrito()
+        # Versión del catálogo con la que se llenaron los resultados
+        self._version = self.app.producto_controller.version
         self.crear_interfaz()
     
     def crear_interfaz(self):
@@ -53,8 +58,9 @@ class VentasView(ttk.Frame):
                   command=self.buscar_producto).pack(side='left')
         
         # Lista de resultados
-        ttk.Label(frame_izq, text="Resultados:",
-                 font=('Arial', 10, 'bold')).pack(pady=5)
+        self.lbl_resultados = ttk.Label(frame_izq, text="Resultados:",
+                                        font=('Arial', 10, 'bold'))
+        self.lbl_resultados.pack(pady=5)
         
         # Frame para treeview y scrollbar
         frame_tree = ttk.Frame(frame_izq)
@@ -124,6 +130,8 @@ class VentasView(ttk.Frame):
         self.tree_carrito.column('subtotal', width=80)
         
         self.tree_carrito.pack(side='left', fill='both', expand=True)
+        # Filas por código de barras: sólo se redibujan las que cambian
+        self.filas_carrito = TreeviewConLlaves(self.tree_carrito)
         scrollbar_carrito.config(command=self.tree_carrito.yview)
         
         # Botón eliminar
@@ -143,7 +151,8 @@ class VentasView(ttk.Frame):
                                      font=('Arial', 11, 'bold'))
         self.lbl_subtotal.grid(row=0, column=1, sticky='e', pady=2)
         
-        ttk.Label(frame_totales, text="IVA (16%):",
+        # La tasa es la misma con la que se calculan los totales
+        ttk.Label(frame_totales, text=f"IVA ({self.punto_de_venta.tasa_iva * 100:g}%):",
                  font=('Arial', 11)).grid(row=1, column=0, sticky='w', pady=2)
         self.lbl_iva = ttk.Label(frame_totales, text="$0.00",
                                 font=('Arial', 11, 'bold'))
@@ -155,8 +164,8 @@ class VentasView(ttk.Frame):
         ttk.Label(frame_totales, text="TOTAL:",
                  font=('Arial', 14, 'bold')).grid(row=3, column=0, sticky='w', pady=2)
         self.lbl_total = ttk.Label(frame_totales, text="$0.00",
-                                  font=('Arial', 14, 'bold'),
-                                  foreground=self.app.color_primario)
+                                  font=('Arial', 14, 'bold'))
+        self.app.theme_manager.register(self.lbl_total, foreground='accent_primary')
         self.lbl_total.grid(row=3, column=1, sticky='e', pady=2)
         
         frame_totales.columnconfigure(1, weight=1)
@@ -165,7 +174,7 @@ class VentasView(ttk.Frame):
         ttk.Label(frame_der, text="Método de Pago:",
                  font=('Arial', 10)).pack(pady=(10, 5))
         self.combo_metodo_pago = ttk.Combobox(frame_der,
-                                             values=['Efectivo', 'Tarjeta', 'Transferencia'],
+                                             values=list(METODOS_PAGO),
                                              state='readonly',
                                              width=30)
         self.combo_metodo_pago.set('Efectivo')
@@ -175,6 +184,9 @@ class VentasView(ttk.Frame):
         ttk.Button(frame_der, text="💵 COBRAR",
                   style='Primary.TButton',
                   command=self.procesar_venta).pack(pady=15, fill='x', padx=20)
+        
+        ttk.Button(frame_der, text="↩️ Devolución",
+                  command=self.procesar_devolucion).pack(pady=5)
     
     def buscar_producto(self):
         """Busca productos"""
@@ -183,25 +195,49 @@ class VentasView(ttk.Frame):
         # Limpiar resultados
         for item in self.tree_productos.get_children():
             self.tree_productos.delete(item)
+        self.lbl_resultados.config(text="Resultados:")
         
         if not termino:
             return
         
-        # Buscar por código o nombre
-        producto = self.app.producto_controller.buscar_por_codigo(termino)
-        if producto:
-            resultados = [producto]
-        else:
-            resultados = self.app.producto_controller.buscar_por_nombre(termino)
+        # Por código o nombre; sin coincidencias, los más parecidos
+        resultados, son_sugerencias = self.punto_de_venta.buscar(termino)
+        if resultados and son_sugerencias:
+            self.lbl_resultados.config(text="¿Quisiste decir...?")
         
         # Mostrar resultados
         for producto in resultados:
-            self.tree_productos.insert('', 'end', values=(
-                producto.codigo_barras,
-                producto.nombre,
-                f"${producto.precio:.2f}",
-                producto.stock
-            ))
+            self.tree_productos.insert('', 'end', values=self.valores_resultado(producto))
+        self._version = self.app.producto_controller.version
+    
+    @staticmethod
+    def valores_resultado(producto):
+        """Valores de la fila de un producto en los resultados"""
+        return (
+            producto.codigo_barras,
+            producto.nombre,
+            f"${producto.precio:.2f}",
+            producto.stock
+        )
+    
+    def refresh(self):
+        """Al volver a mostrar la vista: actualiza en los resultados sólo
+        los productos que cambiaron mientras estaba oculta. El carrito se
+        conserva tal cual."""
+        controller = self.app.producto_controller
+        cambios = controller.cambios_desde(self._version)
+        self._version = controller.version
+        if cambios != {}:
+            for fila in self.tree_productos.get_children():
+                codigo = str(self.tree_productos.item(fila, 'values')[0])
+                if cambios is not None and codigo not in cambios:
+                    continue
+                producto = controller.buscar_por_codigo(codigo)
+                if producto is None:
+                    self.tree_productos.delete(fila)
+                else:
+                    self.tree_productos.item(fila, values=self.valores_resultado(producto))
+        self.entry_busqueda.focus()
     
     def agregar_al_carrito(self):
         """Agrega un producto al carrito"""
@@ -220,36 +256,17 @@ class VentasView(ttk.Frame):
             messagebox.showerror("Error", "Código de producto inválido")
             return
         
-        producto = self.app.producto_controller.buscar_por_codigo(codigo)
-        if not producto:
-            messagebox.showerror("Error", "Producto no encontrado")
-            return
-        
-        if producto.stock <= 0:
-            messagebox.showerror("Error", "Producto sin stock")
+        nuevo = codigo not in self.carrito
+        # Valida existencia y stock contra lo que ya está en el carrito
+        linea, error = self.punto_de_venta.agregar(self.carrito, codigo)
+        if error:
+            messagebox.showerror("Error", error)
             return
-        
-        # Verificar si ya está en el carrito
-        for i, item_carrito in enumerate(self.carrito):
-            if item_carrito['codigo'] == codigo:
-                if item_carrito['cantidad'] < producto.stock:
-                    self.carrito[i]['cantidad'] += 1
-                    self.actualizar_carrito()
-                else:
-                    messagebox.showwarning("Advertencia", "No hay más stock disponible")
-                return
-        
-        # Agregar nuevo item
-        self.carrito.append({
-            'codigo': producto.codigo_barras,
-            'nombre': producto.nombre,
-            'precio': producto.precio,
-            'cantidad': 1
-        })
-        
-        self.actualizar_carrito()
-        self.entry_busqueda.delete(0, tk.END)
-        self.entry_busqueda.focus()
+        self.mostrar_linea(linea)
+        self.actualizar_totales()
+        if nuevo:
+            self.entry_busqueda.delete(0, tk.END)
+            self.entry_busqueda.focus()
     
     def eliminar_del_carrito(self):
         """Elimina un producto del carrito"""
@@ -258,9 +275,10 @@ class VentasView(ttk.Frame):
             messagebox.showwarning("Advertencia", "Seleccione un producto del carrito")
             return
         
-        idx = self.tree_carrito.index(seleccion[0])
-        del self.carrito[idx]
-        self.actualizar_carrito()
+        codigo = seleccion[0]
+        self.carrito.quitar(codigo)
+        self.filas_carrito.quitar(codigo)
+        self.actualizar_totales()
     
     def limpiar_carrito(self):
         """Limpia todo el carrito"""
@@ -268,94 +286,80 @@ class VentasView(ttk.Frame):
             respuesta = messagebox.askyesno("Confirmar",
                                            "¿Desea limpiar todo el carrito?")
             if respuesta:
-                self.carrito = []
+                self.carrito.limpiar()
                 self.actualizar_carrito()
     
+    def mostrar_linea(self, linea):
+        """Actualiza sólo el renglón del carrito que cambió"""
+        self.filas_carrito.poner(linea.codigo_barras, (
+            linea.cantidad,
+            linea.nombre,
+            f"${linea.precio_unitario:.2f}",
+            f"${linea.subtotal:.2f}"
+        ))
+    
+    def actualizar_totales(self):
+        """Muestra los totales acumulados del carrito"""
+        self.lbl_subtotal.config(text=f"${self.carrito.subtotal:.2f}")
+        self.lbl_iva.config(text=f"${self.carrito.iva:.2f}")
+        self.lbl_total.config(text=f"${self.carrito.total:.2f}")
+    
     def actualizar_carrito(self):
-        """Actualiza la vista del carrito"""
-        # Limpiar tree
-        for item in self.tree_carrito.get_children():
-            self.tree_carrito.delete(item)
-        
-        # Calcular totales
-        subtotal = 0
-        
-        for item in self.carrito:
-            item_subtotal = item['precio'] * item['cantidad']
-            subtotal += item_subtotal
-            
-            self.tree_carrito.insert('', 'end', values=(
-                item['cantidad'],
-                item['nombre'],
-                f"${item['precio']:.2f}",
-                f"${item_subtotal:.2f}"
-            ))
-        
-        iva = subtotal * 0.16
-        total = subtotal + iva
-        
-        self.lbl_subtotal.config(text=f"${subtotal:.2f}")
-        self.lbl_iva.config(text=f"${iva:.2f}")
-        self.lbl_total.config(text=f"${total:.2f}")
+        """Actualiza la vista completa del carrito"""
+        self.filas_carrito.sincronizar(
+            (linea.codigo_barras, (
+                linea.cantidad,
+                linea.nombre,
+                f"${linea.precio_unitario:.2f}",
+                f"${linea.subtotal:.2f}"
+            ), ())
+            for linea in self.carrito)
+        self.actualizar_totales()
     
     def procesar_venta(self):
-        """Procesa la venta"""
+        """Cobra el carrito"""
         if not self.carrito:
             messagebox.showwarning("Advertencia", "El carrito está vacío")
             return
         
-        # Verificar stock disponible
-        for item in self.carrito:
-            producto = self.app.producto_controller.buscar_por_codigo(item['codigo'])
-            if producto.stock < item['cantidad']:
-                messagebox.showerror("Error",
-                                   f"Stock insuficiente para {producto.nombre}")
-                return
-        
-        # Calcular totales
-        subtotal = sum(item['precio'] * item['cantidad'] for item in self.carrito)
-        iva = subtotal * 0.16
-        total = subtotal + iva
-        
-        # Crear items de venta
-        items_venta = []
-        for item in self.carrito:
-            item_subtotal = item['precio'] * item['cantidad']
-            items_venta.append(ItemVenta(
-                codigo_barras=item['codigo'],
-                nombre=item['nombre'],
-                cantidad=item['cantidad'],
-                precio_unitario=item['precio'],
-                subtotal=item_subtotal
-            ))
-        
-        # Crear venta
-        folio = self.app.venta_controller.generar_folio()
-        venta = Venta(
-            folio=folio,
-            cajero=self.usuario.username,
-            items=items_venta,
-            subtotal=subtotal,
-            iva=iva,
-            total=total,
-            metodo_pago=self.combo_metodo_pago.get()
-        )
+        venta, error = self.punto_de_venta.cobrar(
+            self.carrito, self.usuario.username, self.combo_metodo_pago.get())
+        if error:
+            messagebox.showerror("Error", error)
+            return
         
-        # Registrar venta
-        if self.app.venta_controller.registrar_venta(venta):
-            # Actualizar stock
-            for item in self.carrito:
-                self.app.producto_controller.actualizar_stock(
-                    item['codigo'],
-                    -item['cantidad']
-                )
-            
-            messagebox.showinfo("Éxito",
-                              f"Venta registrada\nFolio: {folio}\nTotal: ${total:.2f}")
-            
-            # Limpiar carrito
-            self.carrito = []
-            self.actualizar_carrito()
-            self.entry_busqueda.focus()
-        else:
-            messagebox.showerror("Error", "No se pudo registrar la venta")
+        messagebox.showinfo("Éxito",
+                          f"Venta registrada\nFolio: {venta.folio}\nTotal: ${venta.total:.2f}")
+        # El servicio ya vació el carrito
+        self.actualizar_carrito()
+        self.entry_busqueda.focus()
+    
+    def procesar_devolucion(self):
+        """Devuelve lo que quede pendiente de un ticket"""
+        folio = simpledialog.askstring("Devolución", "Folio de la venta:", parent=self)
+        if not folio:
+            return
+        folio = folio.strip()
+        
+        pendientes, error = self.punto_de_venta.pendientes_de_devolver(folio)
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        if not pendientes:
+            messagebox.showinfo("Devolución", "Esa venta ya se devolvió completa")
+            return
+        
+        detalle = "\n".join(f"{cantidad} x {codigo}" for codigo, cantidad in pendientes.items())
+        if not messagebox.askyesno("Confirmar",
+                                   f"¿Devolver lo pendiente del folio {folio}?\n\n{detalle}"):
+            return
+        
+        devolucion, error = self.punto_de_venta.devolver(folio, self.usuario.username)
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        messagebox.showinfo("Éxito",
+                          f"Devolución registrada\nFolio: {devolucion.folio}\n"
+                          f"Reembolso: ${-devolucion.total:.2f}")
+        # Los resultados visibles muestran el stock repuesto
+        self.refresh()